@@ -0,0 +1,226 @@
+# -*- coding: utf-8 -*-
+
+##
+# @author Pr Magoules HPC Research Group, CentraleSupelec, France
+# @version 1.0 [Python 2.7]
+#
+
+# -- Standard modules
+import sys
+import os
+import time
+import struct
+import shutil
+import tempfile
+
+# -- Third-party modules
+import numpy
+
+# -- MRG modules
+sys.path.append("mod")
+from aviwriter import AviWriter
+
+# -- Constants
+
+# Error
+EXIT_SUCCESS = 0
+EXIT_FAILURE = 1
+
+# Program description
+PROG_NAME = "[AviWriterTestFile]"
+MIN_ARGC = 1
+HELP = """
+  BRIEF: Tests the AVI files of class AviWriter: frames and repeated frames
+         read back through the index, headers, split into several files (up
+         to one frame per file, repeated frames at the beginning of files).
+  ARGS:
+        [-h] # Displays this description.
+"""
+
+# Number of frames
+NUMB_FRAME = 500
+
+# Largest file size of the split tests (0: one frame per file)
+SPLIT_MAX_SIZE = [50000, 0]
+
+##
+# @brief Reads the frames of an AVI file through its index.
+# @param file_name = full name of the file (str)
+# @return (numb_frame, width, height, frame) = number of frames of the main
+#          and stream headers (must be equal), frame size, data of each frame
+#          (bytes, empty for a repeated frame); None if the file is not valid
+#
+def ReadAvi ( file_name ) :
+
+  p_file = open(file_name, "rb")
+  buf = p_file.read()
+  p_file.close()
+
+  # -- headers
+  if ((buf[0:4] != b"RIFF") or (buf[8:12] != b"AVI ")
+      or (struct.unpack("<I", buf[4:8])[0] != len(buf) - 8)
+      or (buf[212:216] != b"LIST") or (buf[220:224] != b"movi")) :
+    return None
+  avih = struct.unpack("<14I", buf[32:88])
+  strh = struct.unpack("<4s4sIHHIIIIIIIIhhhh", buf[108:164])
+  if ((strh[0] != b"vids") or (strh[1] != b"MJPG") or (avih[4] != strh[9])) :
+    return None
+
+  # -- frames, through the index
+  movi_end = 220 + struct.unpack("<I", buf[216:220])[0]
+  if ((buf[movi_end:movi_end + 4] != b"idx1")
+      or (struct.unpack("<I", buf[movi_end + 4:movi_end + 8])[0]
+          != 16 * avih[4])) :
+    return None
+  frame = []
+  for k in range(0, avih[4]) :
+    (ckid, flags, offset, size) = struct.unpack("<4s3I",
+                                  buf[movi_end + 8 + 16 * k:
+                                      movi_end + 24 + 16 * k])
+    offset += 220
+    if ((ckid != b"00dc") or (buf[offset:offset + 4] != b"00dc")
+        or (struct.unpack("<I", buf[offset + 4:offset + 8])[0] != size)
+        or ((flags == AviWriter.AVIIF_KEYFRAME) != (size > 0))) :
+      return None
+    frame.append(buf[offset + 8:offset + 8 + size])
+
+  return (avih[4], avih[8], avih[9], frame)
+
+# -- main ----------------------------------------------------------------------
+def main ( argv=[PROG_NAME] ) :
+
+  # ----------------------------------------------------------------------------
+  # -- INITIALIZATION
+  # ----------------------------------------------------------------------------
+
+  # -- Test result
+  test_success = True
+
+  # ----------------------------------------------------------------------------
+  # -- ARGUMENTS
+  # ----------------------------------------------------------------------------
+
+  # -- check minimum number of arguments
+  argc = len(argv)
+  if (argc < MIN_ARGC) :
+    print HELP
+    return EXIT_FAILURE
+
+  # -- print help (-h)
+  if ("-h" in argv[MIN_ARGC:]) :
+    print HELP
+    return EXIT_SUCCESS
+
+  # ----------------------------------------------------------------------------
+  # -- INPUT
+  # ----------------------------------------------------------------------------
+
+  # -- frames (random data of odd and even sizes), one third repeated
+  numpy.random.seed(0)
+  frame = [numpy.random.randint(0, 256, numpy.random.randint(100, 1000)
+                                ).astype(numpy.uint8).tostring()
+           for k in range(0, NUMB_FRAME)]
+  flag_repeat = (numpy.random.rand(NUMB_FRAME) < 1.0 / 3)
+  flag_repeat[0] = False
+  for k in range(1, NUMB_FRAME) :
+    if (flag_repeat[k]) :
+      frame[k] = frame[k - 1]
+
+  # ----------------------------------------------------------------------------
+  # -- PROCESS
+  # ----------------------------------------------------------------------------
+
+  # -- begin time measurement
+
+  # cpu time
+  cpu_btime = time.clock()
+
+  # wall-clock time
+  wclock_btime = time.time()
+
+  tmp_dir = tempfile.mkdtemp()
+
+  # -- errors: no video open, no previous frame
+  video = AviWriter()
+  video.WriteFrame(frame[0])
+  if (video.err_code != AviWriter.FAILURE) :
+    test_success = False
+  video.Open(os.path.join(tmp_dir, "error.avi"), 64, 48)
+  video.WriteFrame()
+  if (video.err_code != AviWriter.FAILURE) :
+    test_success = False
+  video.Close()
+
+  # -- one file, then split into several files
+  for max_size in [AviWriter.AVI_MAX_SIZE] + SPLIT_MAX_SIZE :
+    print PROG_NAME, "--- Writing", NUMB_FRAME, "frames, files of at most",\
+          max_size, "bytes"
+    video = AviWriter()
+    video.max_size = max_size
+    video.Open(os.path.join(tmp_dir, "video.avi"), 64, 48, 30)
+    for k in range(0, NUMB_FRAME) :
+      video.WriteFrame(None if (flag_repeat[k]) else frame[k])
+      if (video.err_code == AviWriter.FAILURE) :
+        print PROG_NAME, video.err_msg
+        return EXIT_FAILURE
+    video.Close()
+    if (video.err_code == AviWriter.FAILURE) :
+      print PROG_NAME, video.err_msg
+      return EXIT_FAILURE
+    if ((video.numb_frame != NUMB_FRAME)
+        or (video.numb_repeat != numpy.count_nonzero(flag_repeat))
+        or ((max_size in SPLIT_MAX_SIZE) and (len(video.part_file) < 2))
+        or ((max_size == 0) and (len(video.part_file) != NUMB_FRAME))) :
+      test_success = False
+
+    # -- read back: frames, repeated frames resolved
+    print PROG_NAME, "--- Reading", len(video.part_file), "files"
+    read_frame = []
+    for file_name in video.part_file :
+      avi = ReadAvi(file_name)
+      if ((avi is None) or ((len(avi[3]) > 1)
+                            and (os.path.getsize(file_name) > max_size))
+          or (avi[1:3] != (64, 48)) or (len(avi[3][0]) == 0)) :
+        test_success = False
+        continue
+      for buf in avi[3] :
+        read_frame.append(buf if (len(buf) > 0) else read_frame[-1])
+      os.remove(file_name)
+    if (read_frame != frame) :
+      test_success = False
+    print PROG_NAME, "*** {:d} frames, {:d} repeated".format(
+          video.numb_frame, video.numb_repeat)
+
+  shutil.rmtree(tmp_dir)
+
+  # -- end time measurement
+
+  # cpu time
+  cpu_etime = time.clock()
+
+  # wall-clock time
+  wclock_etime = time.time()
+
+  # ----------------------------------------------------------------------------
+  # -- OUTPUT
+  # ----------------------------------------------------------------------------
+
+  # -- print result
+  if (test_success) :
+    print PROG_NAME, "*** Result: SUCCESS"
+  else :
+    print PROG_NAME, "*** Result: FAILURE"
+
+  # -- print time measurement
+  print PROG_NAME, "*** CPU: {:.3f} sec.".format(cpu_etime - cpu_btime)
+  print PROG_NAME,\
+        "*** Wall-clock: {:.3f} sec.".format(wclock_etime - wclock_btime)
+
+
+  return EXIT_SUCCESS
+
+# END def main ( argc, argv ) :
+# ------------------------------------------------------------------------------
+
+if __name__ == "__main__" :
+  main(sys.argv)
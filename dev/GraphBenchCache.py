@@ -0,0 +1,179 @@
+# -*- coding: utf-8 -*-
+
+##
+# @author Pr Magoules HPC Research Group, CentraleSupelec, France
+# @version 1.0 [Python 2.7]
+#
+
+# -- Standard modules
+import sys
+import os
+import time
+import shutil
+import tempfile
+
+# -- Third-party modules
+import numpy
+
+# -- MRG modules
+sys.path.append("mod")
+from mesh import Mesh
+from graph import Graph
+from MeshBenchIO import WriteSyntheticMesh
+
+# -- Constants
+
+# Error
+EXIT_SUCCESS = 0
+EXIT_FAILURE = 1
+
+# Program description
+PROG_NAME = "[GraphBenchCache]"
+MIN_ARGC = 1
+HELP = """
+  BRIEF: Compares cold and warm (disk cache) runs of the sim.py graph
+         pipeline (line graph, edge coloring, sorted vert2edge, vert2vert)
+         on the VTK test meshes and on synthetic meshes of 10^3 to
+         10^max_exp cells.
+  ARGS:
+        [max_exp] # Largest mesh size exponent (default: 5).
+        [-h] # Displays this description.
+"""
+
+# VTK test meshes
+IM_FILE_NAME = ["../data/in/MRG/AP3D-H0750B-SS0-LGM12.vtk",
+                "../data/in/MRG/AP3D-H0750B-S0-LGM16.vtk"]
+
+##
+# @brief Runs the sim.py graph pipeline.
+# @param dom_io = mesh (Mesh)
+# @param cache_dir = disk cache directory (str)
+# @return dom = graph with vert2edge, vert2vert and vert2vert_edge (Graph),
+#          None on error
+#
+def RunPipeline ( dom_io, cache_dir ) :
+
+  dom = Graph(dom_io.numb_node, dom_io.numb_elem, dom_io.elem2node,
+              dom_io.p_elem2node)
+  dom.cache_dir = cache_dir
+  dom.Require("edge2edge")
+  if (dom.err_code == Graph.FAILURE) :
+    print PROG_NAME, dom.err_msg
+    return None
+
+  dom_line = Graph()
+  dom_line.cache_dir = cache_dir
+  dom_line.numb_vert = dom.numb_edge
+  dom_line.vert2vert = dom.edge2edge
+  dom_line.p_vert2vert = dom.p_edge2edge
+  dom_line.Require("vert_color")
+  if (dom_line.err_code == Graph.FAILURE) :
+    print PROG_NAME, dom_line.err_msg
+    return None
+
+  dom.edge_color = dom_line.vert_color
+  dom.Release("edge2edge")
+  dom.Require("vert2vert")
+  if (dom.err_code == Graph.FAILURE) :
+    print PROG_NAME, dom.err_msg
+    return None
+
+  return dom
+
+# -- main ----------------------------------------------------------------------
+def main ( argv=[PROG_NAME] ) :
+
+  # ----------------------------------------------------------------------------
+  # -- INITIALIZATION
+  # ----------------------------------------------------------------------------
+
+  # -- Mesh handler
+  dom_io = Mesh()
+
+  # -- Test result
+  test_success = True
+
+  # ----------------------------------------------------------------------------
+  # -- ARGUMENTS
+  # ----------------------------------------------------------------------------
+
+  # -- check minimum number of arguments
+  argc = len(argv)
+  if (argc < MIN_ARGC) :
+    print HELP
+    return EXIT_FAILURE
+
+  # -- print help (-h)
+  if ("-h" in argv[MIN_ARGC:]) :
+    print HELP
+    return EXIT_SUCCESS
+
+  # -- set largest mesh size exponent
+  max_exp = 5
+  if (argc > MIN_ARGC) :
+    max_exp = int(argv[MIN_ARGC])
+
+  # ----------------------------------------------------------------------------
+  # -- PROCESS
+  # ----------------------------------------------------------------------------
+
+  tmp_dir = tempfile.mkdtemp()
+  cache_dir = os.path.join(tmp_dir, "cache")
+  numpy.random.seed(0)
+
+  # -- test meshes, then synthetic meshes
+  im_file_name = list(IM_FILE_NAME)
+  for exp in range(3, max_exp + 1) :
+    im_file_name.append(os.path.join(tmp_dir, "bench" + str(exp) + ".vtk"))
+    WriteSyntheticMesh(im_file_name[-1], 10**exp)
+
+  for cur_file_name in im_file_name :
+
+    # -- read mesh
+    dom_io.ReadFromFileVtk(cur_file_name)
+    if (dom_io.err_code == Mesh.FAILURE) :
+      print PROG_NAME, dom_io.err_msg
+      continue
+    print PROG_NAME, "---", cur_file_name, "(" + str(dom_io.numb_elem),\
+          "cells)"
+
+    # -- cold and warm runs
+    wclock_time = []
+    dom = []
+    for run_name in ["cold", "warm"] :
+      wclock_btime = time.time()
+      dom.append(RunPipeline(dom_io, cache_dir))
+      wclock_time.append(time.time() - wclock_btime)
+      if (dom[-1] is None) :
+        return EXIT_FAILURE
+    print PROG_NAME, ("*** cold: {:8.3f} sec., warm: {:8.3f} sec."
+                      + " (speedup: {:.1f})").format(wclock_time[0],
+          wclock_time[1], wclock_time[0] / wclock_time[1])
+
+    # -- test
+    for name in ["vert2edge", "p_vert2edge", "vert2vert", "p_vert2vert",
+                 "vert2vert_edge"] :
+      if (not numpy.array_equal(getattr(dom[0], name),
+                                getattr(dom[1], name))) :
+        test_success = False
+
+  shutil.rmtree(tmp_dir)
+
+  # ----------------------------------------------------------------------------
+  # -- OUTPUT
+  # ----------------------------------------------------------------------------
+
+  # -- print result
+  if (test_success) :
+    print PROG_NAME, "*** Result: SUCCESS"
+  else :
+    print PROG_NAME, "*** Result: FAILURE"
+
+
+  return EXIT_SUCCESS
+
+# END def main ( argc, argv ) :
+# ------------------------------------------------------------------------------
+
+if __name__ == "__main__" :
+  main(sys.argv)
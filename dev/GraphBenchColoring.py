@@ -0,0 +1,237 @@
+# -*- coding: utf-8 -*-
+
+##
+# @author Pr Magoules HPC Research Group, CentraleSupelec, France
+# @version 1.0 [Python 2.7]
+#
+
+# -- Standard modules
+import sys
+import os
+import time
+import Queue
+
+# -- Third-party modules
+import numpy
+
+# -- MRG modules
+sys.path.append("mod")
+from mesh import Mesh
+from graph import Graph
+
+# -- Constants
+
+# Error
+EXIT_SUCCESS = 0
+EXIT_FAILURE = 1
+
+# Program description
+PROG_NAME = "[GraphBenchColoring]"
+MIN_ARGC = 1
+HELP = """
+  BRIEF: Compares Graph.ColorVertByWelshPowell with the former quadratic
+         implementation on the line graphs of the VTK test meshes and on
+         random graphs of 10^3 to 10^max_exp vertices.
+  ARGS:
+        [max_exp] # Largest graph size exponent (default: 6).
+        [max_exp_legacy] # Largest size exponent for the former
+                         # implementation (default: 4).
+        [-h] # Displays this description.
+"""
+
+# VTK test meshes
+IM_FILE_NAME = ["../data/in/MRG/AP3D-H0750B-SS0-LGM12.vtk",
+                "../data/in/MRG/AP3D-H0750B-S0-LGM16.vtk"]
+
+# Average degree of random graphs
+RANDOM_DEGREE = 8
+
+##
+# @brief Former implementation of Graph.ColorVertByWelshPowell (selection
+#        sort, then one pass over the uncolored vertices per color).
+# @param dom = graph with vert_degree, vert2vert and p_vert2vert (Graph)
+#
+def ColorVertByWelshPowellLegacy ( dom ) :
+
+  dom.numb_color = 0
+  dom.vert_color = -numpy.ones(dom.numb_vert, dtype=int)
+
+  # -- sort vertices by decreasing degree
+  indice_sorted = Queue.Queue(dom.numb_vert)
+  vert_sorted = numpy.zeros(dom.numb_vert)
+  for i in range(dom.numb_vert):
+    degree_max = 0
+    indice_deg_max = -1
+    for j in range(dom.numb_vert):
+      if vert_sorted[j] == 0:
+        if dom.vert_degree[j] > degree_max:
+          degree_max = dom.vert_degree[j]
+          indice_deg_max = j
+    indice_sorted.put(indice_deg_max)
+    vert_sorted[indice_deg_max] = 1
+
+  # -- color
+  while not (indice_sorted.empty()):
+    dom.vert_color[indice_sorted.get()] = dom.numb_color
+    numb_vert_uncolored = indice_sorted.qsize()
+    for i in range(numb_vert_uncolored):
+      vert = indice_sorted.get()
+      no_conflicts = True
+      j = 0
+      while ((j < dom.vert_degree[vert]) and (no_conflicts)):
+        if (dom.vert_color[dom.vert2vert[dom.p_vert2vert[vert] + j]]
+            == dom.numb_color):
+          no_conflicts = False
+        j += 1
+      if no_conflicts:
+        dom.vert_color[vert] = dom.numb_color
+      else:
+        indice_sorted.put(vert)
+    dom.numb_color += 1
+
+  return
+
+##
+# @brief Builds a random graph without isolated vertices.
+# @param numb_vert = number of vertices
+# @return dom = graph with vert_degree, vert2vert and p_vert2vert (Graph)
+#
+def BuildRandomGraph ( numb_vert ) :
+
+  # -- edges: a ring (no isolated vertex) plus random pairs
+  numb_edge = numb_vert * RANDOM_DEGREE // 2
+  edge2vert = numpy.random.randint(0, numb_vert, (numb_edge, 2))
+  edge2vert[0:numb_vert,0] = numpy.arange(numb_vert)
+  edge2vert[0:numb_vert,1] = (numpy.arange(numb_vert) + 1) % numb_vert
+  edge2vert = edge2vert[edge2vert[:,0] != edge2vert[:,1]]
+
+  dom = Graph(numb_vert, len(edge2vert), edge2vert.ravel(),
+              numpy.arange(0, 2 * len(edge2vert) + 1, 2))
+  dom.BuildVertDegree()
+  dom.BuildVert2Vert()
+
+  return dom
+
+##
+# @brief Builds the line graph of a mesh.
+# @param file_name = full name of the VTK file (str)
+# @return dom = line graph with vert_degree, vert2vert and p_vert2vert
+#          (Graph), None if the file cannot be read
+#
+def BuildMeshLineGraph ( file_name ) :
+
+  dom_io = Mesh()
+  dom_io.ReadFromFileVtk(file_name)
+  if (dom_io.err_code == Mesh.FAILURE) :
+    return None
+  dom_mesh = Graph(dom_io.numb_node, dom_io.numb_elem, dom_io.elem2node,
+                   dom_io.p_elem2node)
+  dom_mesh.BuildEdge2Edge()
+
+  dom = Graph()
+  dom.numb_vert = dom_mesh.numb_edge
+  dom.vert2vert = dom_mesh.edge2edge
+  dom.p_vert2vert = dom_mesh.p_edge2edge
+  dom.BuildVertDegree()
+
+  return dom
+
+##
+# @brief Colors a graph with both implementations.
+# @param name = graph description (str)
+# @param dom = graph with vert_degree, vert2vert and p_vert2vert (Graph)
+# @param run_legacy = whether to run the former implementation (bool)
+# @return whether both colorings are identical (True if not compared)
+#
+def CompareColoring ( name, dom, run_legacy ) :
+
+  # -- current implementation
+  wclock_btime = time.time()
+  dom.ColorVertByWelshPowell()
+  wclock_time = time.time() - wclock_btime
+  msg = ("*** {:s}: {:d} vertices, {:d} colors, current: {:8.3f} sec.").format(
+        name, dom.numb_vert, dom.numb_color, wclock_time)
+  if (not run_legacy) :
+    print PROG_NAME, msg
+    return True
+  vert_color = dom.vert_color
+
+  # -- former implementation
+  wclock_btime = time.time()
+  ColorVertByWelshPowellLegacy(dom)
+  wclock_time = time.time() - wclock_btime
+  print PROG_NAME, msg, "former: {:8.3f} sec.".format(wclock_time)
+
+  return numpy.array_equal(vert_color, dom.vert_color)
+
+# -- main ----------------------------------------------------------------------
+def main ( argv=[PROG_NAME] ) :
+
+  # ----------------------------------------------------------------------------
+  # -- INITIALIZATION
+  # ----------------------------------------------------------------------------
+
+  # -- Test result
+  test_success = True
+
+  # ----------------------------------------------------------------------------
+  # -- ARGUMENTS
+  # ----------------------------------------------------------------------------
+
+  # -- check minimum number of arguments
+  argc = len(argv)
+  if (argc < MIN_ARGC) :
+    print HELP
+    return EXIT_FAILURE
+
+  # -- print help (-h)
+  if ("-h" in argv[MIN_ARGC:]) :
+    print HELP
+    return EXIT_SUCCESS
+
+  # -- set largest graph size exponents
+  max_exp = 6
+  if (argc > MIN_ARGC) :
+    max_exp = int(argv[MIN_ARGC])
+  max_exp_legacy = 4
+  if (argc > MIN_ARGC + 1) :
+    max_exp_legacy = int(argv[MIN_ARGC + 1])
+
+  # ----------------------------------------------------------------------------
+  # -- PROCESS
+  # ----------------------------------------------------------------------------
+
+  # -- line graphs of the VTK test meshes
+  for im_file_name in IM_FILE_NAME :
+    dom = BuildMeshLineGraph(im_file_name)
+    if (dom is None) :
+      print PROG_NAME, "--- Skipping", im_file_name, "(cannot be read)"
+      continue
+    if (not CompareColoring(os.path.basename(im_file_name), dom, True)) :
+      test_success = False
+
+  # -- random graphs
+  numpy.random.seed(0)
+  for exp in range(3, max_exp + 1) :
+    dom = BuildRandomGraph(10**exp)
+    if (not CompareColoring("random", dom, exp <= max_exp_legacy)) :
+      test_success = False
+
+  # ----------------------------------------------------------------------------
+  # -- OUTPUT
+  # ----------------------------------------------------------------------------
+
+  # -- print result
+  if (test_success) :
+    print PROG_NAME, "*** Result: SUCCESS"
+  else :
+    print PROG_NAME, "*** Result: FAILURE"
+
+
+  return EXIT_SUCCESS
+
+# END def main ( argc, argv ) :
+# ------------------------------------------------------------------------------
+
+if __name__ == "__main__" :
+  main(sys.argv)
@@ -0,0 +1,180 @@
+# -*- coding: utf-8 -*-
+
+##
+# @author Pr Magoules HPC Research Group, CentraleSupelec, France
+# @version 1.0 [Python 2.7]
+#
+
+# -- Standard modules
+import sys
+import os
+import time
+import multiprocessing
+
+# -- Third-party modules
+import numpy
+
+# -- MRG modules
+sys.path.append("mod")
+from graph import Graph
+from GraphBenchColoring import IM_FILE_NAME
+from GraphBenchColoring import BuildRandomGraph
+from GraphBenchColoring import BuildMeshLineGraph
+
+# -- Constants
+
+# Error
+EXIT_SUCCESS = 0
+EXIT_FAILURE = 1
+
+# Program description
+PROG_NAME = "[GraphBenchColoringParallel]"
+MIN_ARGC = 1
+HELP = """
+  BRIEF: Compares Graph.ColorVertBySpeculation with the serial
+         Graph.ColorVertByWelshPowell (colors, rounds, speedup) on the line
+         graphs of the VTK test meshes and on random graphs of 10^4 to
+         10^max_exp vertices, without then with a large clique (low degree
+         vertices next to high colors), and checks that each coloring is
+         proper.
+  ARGS:
+        [max_exp] # Largest graph size exponent (default: 6).
+        [numb_proc] # Number of worker processes (default: number of cores).
+        [-h] # Displays this description.
+"""
+
+# Size of the clique added to random graphs
+CLIQUE_SIZE = 40
+
+##
+# @brief Builds a random graph with a clique on random vertices.
+# @param numb_vert = number of vertices
+# @return dom = graph with vert_degree, vert2vert and p_vert2vert (Graph)
+#
+def BuildCliqueGraph ( numb_vert ) :
+
+  # -- edges: random graph, plus every pair of the clique
+  dom = BuildRandomGraph(numb_vert)
+  clique = numpy.random.choice(numb_vert, CLIQUE_SIZE, replace=False)
+  (row, col) = numpy.triu_indices(CLIQUE_SIZE, 1)
+  edge2vert = numpy.concatenate([dom.edge2vert[0:2 * dom.numb_edge],
+                 numpy.column_stack([clique[row], clique[col]]).ravel()])
+
+  dom = Graph(numb_vert, len(edge2vert) // 2, edge2vert,
+              numpy.arange(0, len(edge2vert) + 1, 2))
+  dom.BuildVertDegree()
+  dom.BuildVert2Vert()
+
+  return dom
+
+##
+# @brief Colors a graph serially and in parallel.
+# @param name = graph description (str)
+# @param dom = graph with vert_degree, vert2vert and p_vert2vert (Graph)
+# @param numb_proc = number of worker processes
+# @return whether the parallel coloring is proper (bool)
+#
+def CompareColoring ( name, dom, numb_proc ) :
+
+  # -- serial engine
+  wclock_btime = time.time()
+  dom.ColorVertByWelshPowell()
+  serial_time = time.time() - wclock_btime
+  serial_numb_color = dom.numb_color
+
+  # -- parallel engine
+  wclock_btime = time.time()
+  dom.ColorVertBySpeculation(numb_proc)
+  parallel_time = time.time() - wclock_btime
+  if (dom.err_code == Graph.FAILURE) :
+    print PROG_NAME, dom.err_msg
+    return False
+
+  # -- check
+  dom.CheckVertColoring()
+  if (dom.err_code == Graph.FAILURE) :
+    print PROG_NAME, dom.err_msg
+
+  print PROG_NAME, ("*** {:s}: {:d} vertices, serial: {:d} colors"
+                    + " {:8.3f} sec., parallel: {:d} colors {:d} rounds"
+                    + " {:8.3f} sec., speedup: {:5.2f}").format(name,
+        dom.numb_vert, serial_numb_color, serial_time, dom.numb_color,
+        dom.numb_round, parallel_time, serial_time / parallel_time)
+
+  return (dom.err_code == Graph.SUCCESS)
+
+# -- main ----------------------------------------------------------------------
+def main ( argv=[PROG_NAME] ) :
+
+  # ----------------------------------------------------------------------------
+  # -- INITIALIZATION
+  # ----------------------------------------------------------------------------
+
+  # -- Test result
+  test_success = True
+
+  # ----------------------------------------------------------------------------
+  # -- ARGUMENTS
+  # ----------------------------------------------------------------------------
+
+  # -- check minimum number of arguments
+  argc = len(argv)
+  if (argc < MIN_ARGC) :
+    print HELP
+    return EXIT_FAILURE
+
+  # -- print help (-h)
+  if ("-h" in argv[MIN_ARGC:]) :
+    print HELP
+    return EXIT_SUCCESS
+
+  # -- set largest graph size exponent and number of processes
+  max_exp = 6
+  if (argc > MIN_ARGC) :
+    max_exp = int(argv[MIN_ARGC])
+  numb_proc = multiprocessing.cpu_count()
+  if (argc > MIN_ARGC + 1) :
+    numb_proc = int(argv[MIN_ARGC + 1])
+  print PROG_NAME, "---", numb_proc, "worker processes"
+
+  # ----------------------------------------------------------------------------
+  # -- PROCESS
+  # ----------------------------------------------------------------------------
+
+  # -- line graphs of the VTK test meshes
+  for im_file_name in IM_FILE_NAME :
+    dom = BuildMeshLineGraph(im_file_name)
+    if (dom is None) :
+      print PROG_NAME, "--- Skipping", im_file_name, "(cannot be read)"
+      continue
+    if (not CompareColoring(os.path.basename(im_file_name), dom, numb_proc)) :
+      test_success = False
+
+  # -- random graphs
+  numpy.random.seed(0)
+  for exp in range(4, max_exp + 1) :
+    dom = BuildRandomGraph(10**exp)
+    if (not CompareColoring("random", dom, numb_proc)) :
+      test_success = False
+    dom = BuildCliqueGraph(10**exp)
+    if (not CompareColoring("random+clique", dom, numb_proc)) :
+      test_success = False
+
+  # ----------------------------------------------------------------------------
+  # -- OUTPUT
+  # ----------------------------------------------------------------------------
+
+  # -- print result
+  if (test_success) :
+    print PROG_NAME, "*** Result: SUCCESS"
+  else :
+    print PROG_NAME, "*** Result: FAILURE"
+
+
+  return EXIT_SUCCESS
+
+# END def main ( argc, argv ) :
+# ------------------------------------------------------------------------------
+
+if __name__ == "__main__" :
+  main(sys.argv)
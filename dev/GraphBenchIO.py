@@ -0,0 +1,186 @@
+# -*- coding: utf-8 -*-
+
+##
+# @author Pr Magoules HPC Research Group, CentraleSupelec, France
+# @version 1.0 [Python 2.7]
+#
+
+# -- Standard modules
+import sys
+import os
+import time
+import shutil
+import tempfile
+import resource
+import subprocess
+
+# -- Third-party modules
+import numpy
+
+# -- MRG modules
+sys.path.append("mod")
+from graph import Graph
+
+# -- Constants
+
+# Error
+EXIT_SUCCESS = 0
+EXIT_FAILURE = 1
+
+# Program description
+PROG_NAME = "[GraphBenchIO]"
+MIN_ARGC = 1
+HELP = """
+  BRIEF: Compares DIMACS file readers of class Graph (time, peak memory) on
+         random graphs of 10^6 to 10^max_exp edges.
+  ARGS:
+        [max_exp] # Largest graph size exponent (default: 8).
+        [max_exp_line] # Largest size exponent for the line-based reader
+                       # (default: 7).
+        [-h] # Displays this description.
+        [-r file_name read_mode] # Reads one file (internal use).
+"""
+
+# Program file
+PROG_FILE = os.path.abspath(__file__)
+
+# Number of edges written at once
+WRITE_CHUNK = 10**6
+
+##
+# @brief Writes a random graph to a DIMACS edge problem ASCII file.
+# @param file_name = full name of the file (str)
+# @param numb_edge = number of edges
+#
+def WriteSyntheticGraph ( file_name, numb_edge ) :
+
+  numb_vert = max(2, numb_edge // 8)
+  p_file = open(file_name, "w")
+  p_file.write("c Synthetic graph\np edge {:d} {:d}\n".format(numb_vert,
+                                                             numb_edge))
+  for i in range(0, numb_edge, WRITE_CHUNK) :
+    edge2vert = numpy.random.randint(1, numb_vert + 1,
+                                     (min(WRITE_CHUNK, numb_edge - i), 2))
+    numpy.savetxt(p_file, edge2vert, fmt="e %d %d")
+  p_file.close()
+
+  return
+
+##
+# @brief Reads a DIMACS file in a fresh process.
+# @param file_name = full name of the file (str)
+# @param read_mode = Graph.ReadFromFileDimacs read mode (str)
+# @return (err_msg, wclock_time, peak_mem, numb_edge)
+# @remarks The peak memory is the growth of the peak resident set size during
+#          the reading, including the pages of the file mapped by the "MMAP"
+#          reader.
+#
+def ReadGraph ( file_name, read_mode ) :
+
+  buf = subprocess.check_output([sys.executable, PROG_FILE, "-r", file_name,
+                                 read_mode])
+  buf = buf.decode().split("\n")
+
+  return (buf[0], float(buf[1]), int(buf[2]), int(buf[3]))
+
+# -- main ----------------------------------------------------------------------
+def main ( argv=[PROG_NAME] ) :
+
+  # ----------------------------------------------------------------------------
+  # -- INITIALIZATION
+  # ----------------------------------------------------------------------------
+
+  # -- Test result
+  test_success = True
+
+  # ----------------------------------------------------------------------------
+  # -- ARGUMENTS
+  # ----------------------------------------------------------------------------
+
+  # -- check minimum number of arguments
+  argc = len(argv)
+  if (argc < MIN_ARGC) :
+    print HELP
+    return EXIT_FAILURE
+
+  # -- print help (-h)
+  if ("-h" in argv[MIN_ARGC:]) :
+    print HELP
+    return EXIT_SUCCESS
+
+  # -- read one file (-r file_name read_mode)
+  if ("-r" in argv[MIN_ARGC:]) :
+    dom = Graph()
+    base_mem = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    wclock_btime = time.time()
+    dom.ReadFromFileDimacs(argv[MIN_ARGC + 1], read_mode=argv[MIN_ARGC + 2])
+    wclock_etime = time.time()
+    peak_mem = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - base_mem
+    print dom.err_msg.replace("\n", " ")
+    print wclock_etime - wclock_btime
+    print peak_mem * 1024
+    print dom.numb_edge
+    return EXIT_SUCCESS
+
+  # -- set largest graph size exponents
+  max_exp = 8
+  if (argc > MIN_ARGC) :
+    max_exp = int(argv[MIN_ARGC])
+  max_exp_line = 7
+  if (argc > MIN_ARGC + 1) :
+    max_exp_line = int(argv[MIN_ARGC + 1])
+
+  # ----------------------------------------------------------------------------
+  # -- PROCESS
+  # ----------------------------------------------------------------------------
+
+  tmp_dir = tempfile.mkdtemp()
+  numpy.random.seed(0)
+
+  for exp in range(6, max_exp + 1) :
+
+    # -- write synthetic graph
+    numb_edge = 10**exp
+    ig_file_name = os.path.join(tmp_dir, "bench" + str(exp) + ".col")
+    print PROG_NAME, "--- Writing", numb_edge, "edges to", ig_file_name
+    WriteSyntheticGraph(ig_file_name, numb_edge)
+    file_size = os.path.getsize(ig_file_name) / 1e6
+
+    # -- run each reader in a fresh process (peak memory)
+    for read_mode in ["MMAP", "LINE"] :
+      if ((read_mode == "LINE") and (exp > max_exp_line)) :
+        continue
+      (err_msg, wclock_time, peak_mem, dom_numb_edge) = ReadGraph(
+                                                  ig_file_name, read_mode)
+      if (err_msg != "") :
+        print PROG_NAME, err_msg
+        return EXIT_FAILURE
+      if (dom_numb_edge != numb_edge) :
+        test_success = False
+      print PROG_NAME, ("*** {:4s}: {:8.2f} MB/s, {:8.3f} sec., peak"
+                        + " {:8.1f} MB = {:6.1f} bytes/edge").format(
+            read_mode, file_size / wclock_time, wclock_time, peak_mem / 1e6,
+            float(peak_mem) / numb_edge)
+
+    os.remove(ig_file_name)
+
+  shutil.rmtree(tmp_dir)
+
+  # ----------------------------------------------------------------------------
+  # -- OUTPUT
+  # ----------------------------------------------------------------------------
+
+  # -- print result
+  if (test_success) :
+    print PROG_NAME, "*** Result: SUCCESS"
+  else :
+    print PROG_NAME, "*** Result: FAILURE"
+
+
+  return EXIT_SUCCESS
+
+# END def main ( argc, argv ) :
+# ------------------------------------------------------------------------------
+
+if __name__ == "__main__" :
+  main(sys.argv)
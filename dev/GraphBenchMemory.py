@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+
+##
+# @author Pr Magoules HPC Research Group, CentraleSupelec, France
+# @version 1.0 [Python 2.7]
+#
+
+# -- Standard modules
+import sys
+import os
+import shutil
+import tempfile
+
+# -- Third-party modules
+import numpy
+
+# -- MRG modules
+sys.path.append("mod")
+from mesh import Mesh
+from graph import Graph
+from netsim import NetSim
+from indexdtype import GetArraySize
+from MeshBenchIO import WriteSyntheticMesh
+
+# -- Constants
+
+# Error
+EXIT_SUCCESS = 0
+EXIT_FAILURE = 1
+
+# Program description
+PROG_NAME = "[GraphBenchMemory]"
+MIN_ARGC = 1
+HELP = """
+  BRIEF: Reports the memory of the CSR arrays of Mesh, Graph and NetSim
+         along the sim.py pipeline, in bytes per vertex and per edge, with
+         the index dtype policy (after) and with int64 arrays (before), on
+         the VTK test meshes and on synthetic meshes of 10^3 to 10^max_exp
+         cells.
+  ARGS:
+        [max_exp] # Largest mesh size exponent (default: 5).
+        [-h] # Displays this description.
+"""
+
+# VTK test meshes
+IM_FILE_NAME = ["../data/in/MRG/AP3D-H0750B-SS0-LGM12.vtk",
+                "../data/in/MRG/AP3D-H0750B-S0-LGM16.vtk"]
+
+# -- main ----------------------------------------------------------------------
+def main ( argv=[PROG_NAME] ) :
+
+  # ----------------------------------------------------------------------------
+  # -- INITIALIZATION
+  # ----------------------------------------------------------------------------
+
+  # -- Mesh handler
+  dom_io = Mesh()
+
+  # ----------------------------------------------------------------------------
+  # -- ARGUMENTS
+  # ----------------------------------------------------------------------------
+
+  # -- check minimum number of arguments
+  argc = len(argv)
+  if (argc < MIN_ARGC) :
+    print HELP
+    return EXIT_FAILURE
+
+  # -- print help (-h)
+  if ("-h" in argv[MIN_ARGC:]) :
+    print HELP
+    return EXIT_SUCCESS
+
+  # -- set largest mesh size exponent
+  max_exp = 5
+  if (argc > MIN_ARGC) :
+    max_exp = int(argv[MIN_ARGC])
+
+  # ----------------------------------------------------------------------------
+  # -- PROCESS
+  # ----------------------------------------------------------------------------
+
+  tmp_dir = tempfile.mkdtemp()
+  numpy.random.seed(0)
+
+  # -- test meshes, then synthetic meshes
+  im_file_name = list(IM_FILE_NAME)
+  for exp in range(3, max_exp + 1) :
+    im_file_name.append(os.path.join(tmp_dir, "bench" + str(exp) + ".vtk"))
+    WriteSyntheticMesh(im_file_name[-1], 10**exp)
+
+  for cur_file_name in im_file_name :
+
+    # -- read mesh
+    dom_io.ReadFromFileVtk(cur_file_name)
+    if (dom_io.err_code == Mesh.FAILURE) :
+      print PROG_NAME, dom_io.err_msg
+      continue
+
+    # -- sim.py pipeline
+    dom = Graph(dom_io.numb_node, dom_io.numb_elem, dom_io.elem2node,
+                dom_io.p_elem2node)
+    dom.Require("edge2edge")
+    dom_line = Graph()
+    dom_line.numb_vert = dom.numb_edge
+    dom_line.vert2vert = dom.edge2edge
+    dom_line.p_vert2vert = dom.p_edge2edge
+    dom_line.Require("vert_color")
+    dom.edge_color = dom_line.vert_color
+    dom.Require("vert2vert")
+    dom.Require("vert_degree")
+    for cur_dom in [dom, dom_line] :
+      if (cur_dom.err_code == Graph.FAILURE) :
+        print PROG_NAME, cur_dom.err_msg
+        return EXIT_FAILURE
+    net = NetSim(dom.numb_vert, dom.numb_edge, dom.vert2vert_edge,
+                 dom.vert2vert, dom.p_vert2vert)
+
+    # -- report
+    print PROG_NAME, "---", cur_file_name, "(" + str(dom.numb_vert),\
+          "vertices,", dom.numb_edge, "edges)"
+    print PROG_NAME, "*** {:10s} {:>14s} {:>14s} {:>14s} {:>14s}".format(
+          "", "B/vert before", "B/vert after", "B/edge before",
+          "B/edge after")
+    for (name, array_list) in [
+          ("Mesh", [dom_io.elem2node, dom_io.p_elem2node]),
+          ("Graph", [dom.edge2edge, dom.p_edge2edge, dom.vert2edge,
+                     dom.p_vert2edge, dom.vert2vert, dom.p_vert2vert,
+                     dom.vert2vert_edge, dom.vert_degree]),
+          ("Line graph", [dom_line.vert_degree, dom_line.vert_color]),
+          ("NetSim", [net.node2link, net.node2node, net.p_node2node])] :
+      size_before = GetArraySize(array_list, numpy.int64)
+      size_after = GetArraySize(array_list)
+      print PROG_NAME, ("*** {:10s} {:14.1f} {:14.1f} {:14.1f}"
+                        + " {:14.1f}").format(name,
+            float(size_before) / max(dom.numb_vert, 1),
+            float(size_after) / max(dom.numb_vert, 1),
+            float(size_before) / max(dom.numb_edge, 1),
+            float(size_after) / max(dom.numb_edge, 1))
+
+  shutil.rmtree(tmp_dir)
+
+
+  return EXIT_SUCCESS
+
+# END def main ( argc, argv ) :
+# ------------------------------------------------------------------------------
+
+if __name__ == "__main__" :
+  main(sys.argv)
@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+
+##
+# @author Pr Magoules HPC Research Group, CentraleSupelec, France
+# @version 1.0 [Python 2.7]
+#
+
+# -- Standard modules
+import sys
+import time
+
+# -- Third-party modules
+import numpy
+
+# -- MRG modules
+sys.path.append("mod")
+from graph import Graph
+
+# -- Constants
+
+# Error
+EXIT_SUCCESS = 0
+EXIT_FAILURE = 1
+
+# Program description
+PROG_NAME = "[GraphBenchSortVert2Edge]"
+MIN_ARGC = 1
+HELP = """
+  BRIEF: Compares Graph.SortVert2EdgeByColor with the former per-vertex
+         implementation on random graphs of 10^5 to 10^max_exp incidences.
+  ARGS:
+        [max_exp] # Largest number of incidences exponent (default: 7).
+        [max_exp_legacy] # Largest exponent for the former implementation
+                         # (default: 7).
+        [-h] # Displays this description.
+"""
+
+# Average degree of random graphs
+RANDOM_DEGREE = 8
+
+##
+# @brief Former implementation of Graph.SortVert2EdgeByColor (one Python sort
+#        per vertex).
+# @param dom = graph with edge_color, vert2edge and p_vert2edge (Graph)
+#
+def SortVert2EdgeByColorLegacy ( dom ) :
+
+  for i in range(dom.numb_vert):
+    ind_start, ind_end = dom.p_vert2edge[i], dom.p_vert2edge[i+1]
+    dom.vert2edge[ind_start : ind_end] = sorted(dom.vert2edge[ind_start:ind_end],
+                                                key=lambda j: dom.edge_color[j])
+
+  return
+
+##
+# @brief Builds a random graph with random edge colors.
+# @param numb_entry = number of incidences (2 per edge)
+# @return dom = graph with edge_color, vert2edge and p_vert2edge (Graph)
+#
+def BuildRandomColoredGraph ( numb_entry ) :
+
+  numb_edge = numb_entry // 2
+  numb_vert = max(2, 2 * numb_edge // RANDOM_DEGREE)
+  edge2vert = numpy.random.randint(0, numb_vert, 2 * numb_edge)
+
+  dom = Graph(numb_vert, numb_edge, edge2vert,
+              numpy.arange(0, 2 * numb_edge + 1, 2))
+  dom.edge_color = numpy.random.randint(0, 2 * RANDOM_DEGREE, numb_edge)
+  dom.BuildVert2Edge()
+
+  return dom
+
+# -- main ----------------------------------------------------------------------
+def main ( argv=[PROG_NAME] ) :
+
+  # ----------------------------------------------------------------------------
+  # -- INITIALIZATION
+  # ----------------------------------------------------------------------------
+
+  # -- Test result
+  test_success = True
+
+  # ----------------------------------------------------------------------------
+  # -- ARGUMENTS
+  # ----------------------------------------------------------------------------
+
+  # -- check minimum number of arguments
+  argc = len(argv)
+  if (argc < MIN_ARGC) :
+    print HELP
+    return EXIT_FAILURE
+
+  # -- print help (-h)
+  if ("-h" in argv[MIN_ARGC:]) :
+    print HELP
+    return EXIT_SUCCESS
+
+  # -- set largest size exponents
+  max_exp = 7
+  if (argc > MIN_ARGC) :
+    max_exp = int(argv[MIN_ARGC])
+  max_exp_legacy = 7
+  if (argc > MIN_ARGC + 1) :
+    max_exp_legacy = int(argv[MIN_ARGC + 1])
+
+  # ----------------------------------------------------------------------------
+  # -- PROCESS
+  # ----------------------------------------------------------------------------
+
+  numpy.random.seed(0)
+
+  for exp in range(5, max_exp + 1) :
+
+    # -- build random graph
+    print PROG_NAME, "--- Building graph of 10^" + str(exp), "incidences"
+    dom = BuildRandomColoredGraph(10**exp)
+    if (dom.err_code == Graph.FAILURE) :
+      print PROG_NAME, dom.err_msg
+      return EXIT_FAILURE
+    vert2edge = dom.vert2edge.copy()
+
+    # -- segmented sort
+    wclock_btime = time.time()
+    dom.SortVert2EdgeByColor()
+    wclock_time = time.time() - wclock_btime
+    if (dom.err_code == Graph.FAILURE) :
+      print PROG_NAME, dom.err_msg
+      return EXIT_FAILURE
+    print PROG_NAME, "*** sorted : {:8.3f} sec.".format(wclock_time)
+
+    # -- former implementation
+    if (exp <= max_exp_legacy) :
+      vert2edge_sorted = dom.vert2edge
+      dom.vert2edge = vert2edge
+      wclock_btime = time.time()
+      SortVert2EdgeByColorLegacy(dom)
+      wclock_time_legacy = time.time() - wclock_btime
+      print PROG_NAME, "*** legacy : {:8.3f} sec. (speedup: {:.1f})".format(
+            wclock_time_legacy, wclock_time_legacy / wclock_time)
+
+      # -- test
+      if (not numpy.array_equal(dom.vert2edge, vert2edge_sorted)) :
+        test_success = False
+
+  # ----------------------------------------------------------------------------
+  # -- OUTPUT
+  # ----------------------------------------------------------------------------
+
+  # -- print result
+  if (test_success) :
+    print PROG_NAME, "*** Result: SUCCESS"
+  else :
+    print PROG_NAME, "*** Result: FAILURE"
+
+
+  return EXIT_SUCCESS
+
+# END def main ( argc, argv ) :
+# ------------------------------------------------------------------------------
+
+if __name__ == "__main__" :
+  main(sys.argv)
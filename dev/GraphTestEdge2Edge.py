@@ -115,8 +115,11 @@ def main ( argv=[PROG_NAME] ) :
     print PROG_NAME, dom.err_msg
     return EXIT_FAILURE
 
-  # -- test
+  # -- test (adjacent edges sorted by index in each row)
   print PROG_NAME, "--- Testing"
+  ref_row = numpy.repeat(numpy.arange(len(ref_p_e2e) - 1),
+                         numpy.diff(ref_p_e2e))
+  ref_e2e = ref_e2e[numpy.lexsort((ref_e2e, ref_row))]
   if ((not numpy.array_equal(dom.edge2edge, ref_e2e))
       or (not numpy.array_equal(dom.p_edge2edge, ref_p_e2e))) :
     test_success = False
@@ -0,0 +1,236 @@
+# -*- coding: utf-8 -*-
+
+##
+# @author Pr Magoules HPC Research Group, CentraleSupelec, France
+# @version 1.0 [Python 2.7]
+#
+
+# -- Standard modules
+import sys
+import time
+
+# -- Third-party modules
+import numpy
+
+# -- MRG modules
+sys.path.append("mod")
+from mesh import Mesh
+from graph import Graph
+
+# -- Constants
+
+# Error
+EXIT_SUCCESS = 0
+EXIT_FAILURE = 1
+
+# Program description
+PROG_NAME = "[GraphTestRequire]"
+MIN_ARGC = 1
+HELP = """
+  BRIEF: Tests lazy building, invalidation and release of the derived
+         structures of class Graph, and that a memory budget smaller than
+         the inputs of the coloring builds each of them once.
+  ARGS:
+        [-h] # Displays this description.
+"""
+
+##
+# @brief Counts the calls of the build methods of the derived structures.
+# @param dom = graph (Graph)
+# @return number of calls of each build method (dict, updated by the calls)
+#
+def CountBuild ( dom ) :
+
+  numb_build = {}
+  for (inputs, steps, attrs) in Graph.DERIVED.values() :
+    for (method, guard) in steps :
+      numb_build[method] = 0
+
+  # -- wrap each build method of dom
+  def Wrap ( method ) :
+    build = getattr(dom, method)
+    def CountedBuild ( *args, **kwargs ) :
+      numb_build[method] += 1
+      return build(*args, **kwargs)
+    setattr(dom, method, CountedBuild)
+  for method in numb_build :
+    Wrap(method)
+
+  return numb_build
+
+# -- main ----------------------------------------------------------------------
+def main ( argv=[PROG_NAME] ) :
+
+  # ----------------------------------------------------------------------------
+  # -- INITIALIZATION
+  # ----------------------------------------------------------------------------
+
+  # -- Graph I/O handler
+  dom_io = Mesh()
+
+  # -- Test result
+  test_success = True
+
+  # ----------------------------------------------------------------------------
+  # -- ARGUMENTS
+  # ----------------------------------------------------------------------------
+
+  # -- check minimum number of arguments
+  argc = len(argv)
+  if (argc < MIN_ARGC) :
+    print HELP
+    return EXIT_FAILURE
+
+  # -- set input graph file name (constant)
+  ig_file_name = "../data/in/MRG/AP3D-H0750B-SS0-LGM12.vtk"
+
+  # -- print help (-h)
+  if ("-h" in argv[MIN_ARGC:]) :
+    print HELP
+    return EXIT_SUCCESS
+
+  # ----------------------------------------------------------------------------
+  # -- INPUT
+  # ----------------------------------------------------------------------------
+
+  # -- read graph
+  print PROG_NAME, "--- Reading graph from", ig_file_name
+  dom_io.ReadFromFileVtk(ig_file_name)
+  if (dom_io.err_code == Mesh.FAILURE) :
+    print PROG_NAME, dom_io.err_msg
+    return EXIT_FAILURE
+
+  # -- build graph handler
+  dom = Graph(dom_io.numb_node,
+              dom_io.numb_elem,
+              dom_io.elem2node,
+              dom_io.p_elem2node)
+
+  # ----------------------------------------------------------------------------
+  # -- PROCESS
+  # ----------------------------------------------------------------------------
+
+  # -- begin time measurement
+
+  # cpu time
+  cpu_btime = time.clock()
+
+  # wall-clock time
+  wclock_btime = time.time()
+
+  # -- build coloring and its inputs
+  print PROG_NAME, "--- Requiring vert_color"
+  dom.Require("vert_color")
+  if (dom.err_code == Graph.FAILURE) :
+    print PROG_NAME, dom.err_msg
+    return EXIT_FAILURE
+  dom.CheckVertColoring()
+  if (dom.err_code == Graph.FAILURE) :
+    test_success = False
+  version = dict(dom.struct_version)
+
+  # -- nothing is built twice
+  print PROG_NAME, "--- Requiring vert_color again"
+  vert_color = dom.vert_color
+  dom.Require("vert_color")
+  if ((dom.vert_color is not vert_color) or (dom.struct_version != version)) :
+    test_success = False
+
+  # -- a released input is rebuilt, without invalidating vert_color
+  print PROG_NAME, "--- Releasing vert2edge"
+  dom.Release("vert2edge")
+  dom.Require("vert2edge")
+  dom.Require("vert_color")
+  if ((dom.vert_color is not vert_color) or (dom.struct_version != version)) :
+    test_success = False
+
+  # -- a new input invalidates the derived structures
+  print PROG_NAME, "--- Replacing edge2vert"
+  dom.edge2vert = dom.edge2vert.copy()
+  dom.Require("vert_color")
+  if ((dom.vert_color is vert_color)
+      or (dom.struct_version["vert2edge"] != version["vert2edge"] + 1)) :
+    test_success = False
+
+  # -- memory budget below the inputs of vert_color: each one built once
+  print PROG_NAME, "--- Requiring vert_color within a memory budget"
+  input_size = sum(dom.GetStructSize(name)
+                   for name in ("vert2edge", "vert2vert", "vert_degree"))
+  dom_budget = Graph(dom.numb_vert, dom.numb_edge, dom.edge2vert,
+                     dom.p_edge2vert)
+  dom_budget.mem_budget = dom.GetStructSize("vert2vert")
+  numb_build = CountBuild(dom_budget)
+  dom_budget.Require("vert_color")
+  if (dom_budget.err_code == Graph.FAILURE) :
+    print PROG_NAME, dom_budget.err_msg
+    test_success = False
+  if ((dom_budget.mem_budget >= input_size)
+      or (numb_build["BuildVert2Edge"] != 1)
+      or (numb_build["BuildVert2Vert"] != 1)
+      or (numb_build["BuildVertDegree"] != 1)
+      or (numb_build["ColorVertByWelshPowell"] != 1)
+      or (numb_build["SortVert2EdgeByColor"] != 0)) :
+    print PROG_NAME, "*** Builds:", numb_build
+    test_success = False
+
+  # released structures are not held, the others fit the budget
+  held = [name for name in dom_budget.struct_id
+          if (dom_budget.struct_id[name] is not None)]
+  for name in Graph.DERIVED :
+    if ((name not in held)
+        and (len(getattr(dom_budget, Graph.DERIVED[name][2][0])) != 0)) :
+      test_success = False
+  if (sum(dom_budget.GetStructSize(name) for name in held)
+      > dom_budget.mem_budget) :
+    test_success = False
+
+  # the coloring is proper, a released vert2vert is rebuilt by Require
+  numb_vert2vert = numb_build["BuildVert2Vert"]
+  if ("vert2vert" not in held) :
+    numb_vert2vert += 1
+  dom_budget.CheckVertColoring()
+  if ((dom_budget.err_code == Graph.FAILURE)
+      or (numb_build["BuildVert2Vert"] != numb_vert2vert)
+      or (dom_budget.struct_id["vert2vert"] is None)) :
+    print PROG_NAME, dom_budget.err_msg
+    test_success = False
+
+  # -- memory budget
+  print PROG_NAME, "--- Releasing to memory budget"
+  dom.mem_budget = 0
+  dom.Require("vert2vert")
+  held = [name for name in dom.struct_id if (dom.struct_id[name] is not None)]
+  if ((held != ["vert2vert"]) or (len(dom.vert2edge) != 0)) :
+    test_success = False
+
+  # -- end time measurement
+
+  # cpu time
+  cpu_etime = time.clock()
+
+  # wall-clock time
+  wclock_etime = time.time()
+
+  # ----------------------------------------------------------------------------
+  # -- OUTPUT
+  # ----------------------------------------------------------------------------
+
+  # -- print result
+  if (test_success) :
+    print PROG_NAME, "*** Result: SUCCESS"
+  else :
+    print PROG_NAME, "*** Result: FAILURE"
+
+  # -- print time measurement
+  print PROG_NAME, "*** CPU: {:.3f} sec.".format(cpu_etime - cpu_btime)
+  print PROG_NAME,\
+        "*** Wall-clock: {:.3f} sec.".format(wclock_etime - wclock_btime)
+
+
+  return EXIT_SUCCESS
+
+# END def main ( argc, argv ) :
+# ------------------------------------------------------------------------------
+
+if __name__ == "__main__" :
+  main(sys.argv)
@@ -0,0 +1,165 @@
+# -*- coding: utf-8 -*-
+
+##
+# @author Pr Magoules HPC Research Group, CentraleSupelec, France
+# @version 1.0 [Python 2.7]
+#
+
+# -- Standard modules
+import sys
+import os
+import time
+import shutil
+import tempfile
+
+# -- Third-party modules
+import numpy
+
+# -- MRG modules
+sys.path.append("mod")
+from mesh import Mesh
+
+# -- Constants
+
+# Error
+EXIT_SUCCESS = 0
+EXIT_FAILURE = 1
+
+# Program description
+PROG_NAME = "[MeshBenchIO]"
+MIN_ARGC = 1
+HELP = """
+  BRIEF: Measures VTK file reading throughput of class Mesh on synthetic
+         tetrahedral meshes of 10^4 to 10^max_exp cells.
+  ARGS:
+        [max_exp] # Largest mesh size exponent (default: 7).
+        [-h] # Displays this description.
+"""
+
+# Largest mesh read with the character-based reader
+MAX_NUMB_ELEM_CHAR = 10**5
+
+##
+# @brief Writes a synthetic tetrahedral mesh to a VTK ASCII file.
+# @param file_name = full name of the file (str)
+# @param numb_elem = number of cells
+#
+def WriteSyntheticMesh ( file_name, numb_elem ) :
+
+  numb_node = numb_elem // 5 + 4
+  node_coord = numpy.random.rand(numb_node, 3)
+  cell_list = numpy.empty((numb_elem, 5), dtype=int)
+  cell_list[:,0] = 4
+  cell_list[:,1:] = numpy.random.randint(0, numb_node, (numb_elem, 4))
+
+  p_file = open(file_name, "w")
+  p_file.write("# vtk DataFile Version " + Mesh.VTK_VERSION)
+  p_file.write("\nSynthetic mesh\nASCII\nDATASET UNSTRUCTURED_GRID")
+  p_file.write("\nPOINTS " + str(numb_node) + " double\n")
+  numpy.savetxt(p_file, node_coord, fmt="%.12g")
+  p_file.write("CELLS " + str(numb_elem) + " " + str(cell_list.size) + "\n")
+  numpy.savetxt(p_file, cell_list, fmt="%d")
+  p_file.write("CELL_TYPES " + str(numb_elem) + "\n")
+  numpy.savetxt(p_file, numpy.zeros((numb_elem, 1), dtype=int) + 10, fmt="%d")
+  p_file.close()
+
+  return
+
+# -- main ----------------------------------------------------------------------
+def main ( argv=[PROG_NAME] ) :
+
+  # ----------------------------------------------------------------------------
+  # -- INITIALIZATION
+  # ----------------------------------------------------------------------------
+
+  # -- Mesh handlers
+  dom_bulk = Mesh()
+  dom_char = Mesh()
+
+  # -- Test result
+  test_success = True
+
+  # ----------------------------------------------------------------------------
+  # -- ARGUMENTS
+  # ----------------------------------------------------------------------------
+
+  # -- check minimum number of arguments
+  argc = len(argv)
+  if (argc < MIN_ARGC) :
+    print HELP
+    return EXIT_FAILURE
+
+  # -- print help (-h)
+  if ("-h" in argv[MIN_ARGC:]) :
+    print HELP
+    return EXIT_SUCCESS
+
+  # -- set largest mesh size exponent
+  max_exp = 7
+  if (argc > MIN_ARGC) :
+    max_exp = int(argv[MIN_ARGC])
+
+  # ----------------------------------------------------------------------------
+  # -- PROCESS
+  # ----------------------------------------------------------------------------
+
+  tmp_dir = tempfile.mkdtemp()
+  numpy.random.seed(0)
+
+  for exp in range(4, max_exp + 1) :
+
+    # -- write synthetic mesh
+    numb_elem = 10**exp
+    im_file_name = os.path.join(tmp_dir, "bench" + str(exp) + ".vtk")
+    print PROG_NAME, "--- Writing", numb_elem, "cells to", im_file_name
+    WriteSyntheticMesh(im_file_name, numb_elem)
+    file_size = os.path.getsize(im_file_name) / 1e6
+
+    # -- bulk reader
+    wclock_btime = time.time()
+    dom_bulk.ReadFromFileVtk(im_file_name, read_mode="BULK")
+    wclock_etime = time.time()
+    if (dom_bulk.err_code == Mesh.FAILURE) :
+      print PROG_NAME, dom_bulk.err_msg
+      return EXIT_FAILURE
+    print PROG_NAME, "*** BULK: {:8.2f} MB in {:8.3f} sec. = {:8.2f} MB/s".format(
+          file_size, wclock_etime - wclock_btime,
+          file_size / (wclock_etime - wclock_btime))
+
+    # -- character-based reader
+    if (numb_elem <= MAX_NUMB_ELEM_CHAR) :
+      wclock_btime = time.time()
+      dom_char.ReadFromFileVtk(im_file_name, read_mode="CHAR")
+      wclock_etime = time.time()
+      print PROG_NAME, "*** CHAR: {:8.2f} MB in {:8.3f} sec. = {:8.2f} MB/s".format(
+            file_size, wclock_etime - wclock_btime,
+            file_size / (wclock_etime - wclock_btime))
+
+      # -- test
+      for name in ["node_coord", "elem2node", "p_elem2node", "elem_type"] :
+        if (not numpy.array_equal(getattr(dom_bulk, name),
+                                  getattr(dom_char, name))) :
+          test_success = False
+
+    os.remove(im_file_name)
+
+  shutil.rmtree(tmp_dir)
+
+  # ----------------------------------------------------------------------------
+  # -- OUTPUT
+  # ----------------------------------------------------------------------------
+
+  # -- print result
+  if (test_success) :
+    print PROG_NAME, "*** Result: SUCCESS"
+  else :
+    print PROG_NAME, "*** Result: FAILURE"
+
+
+  return EXIT_SUCCESS
+
+# END def main ( argc, argv ) :
+# ------------------------------------------------------------------------------
+
+if __name__ == "__main__" :
+  main(sys.argv)
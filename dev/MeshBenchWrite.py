@@ -0,0 +1,168 @@
+# -*- coding: utf-8 -*-
+
+##
+# @author Pr Magoules HPC Research Group, CentraleSupelec, France
+# @version 1.0 [Python 2.7]
+#
+
+# -- Standard modules
+import sys
+import os
+import time
+import shutil
+import tempfile
+
+# -- Third-party modules
+import numpy
+
+# -- MRG modules
+sys.path.append("mod")
+from mesh import Mesh
+
+# -- Constants
+
+# Error
+EXIT_SUCCESS = 0
+EXIT_FAILURE = 1
+
+# Program description
+PROG_NAME = "[MeshBenchWrite]"
+MIN_ARGC = 1
+HELP = """
+  BRIEF: Measures VTK ASCII file writing throughput of class Mesh on synthetic
+         tetrahedral meshes of 10^4 to 10^max_exp cells, with one point data
+         and one cell data field.
+         Rates are given in uncompressed MB/s.
+  ARGS:
+        [max_exp] # Largest mesh size exponent (default: 6).
+        [-h] # Displays this description.
+"""
+
+# Writer options (label, precision, compress)
+WRITE_OPTION = [("full", None, False), ("prec6", 6, False),
+                ("gzip", None, True)]
+
+##
+# @brief Builds a synthetic tetrahedral mesh.
+# @param numb_elem = number of cells
+# @return dom = mesh (Mesh)
+#
+def BuildSyntheticMesh ( numb_elem ) :
+
+  dom = Mesh()
+  dom.numb_node = numb_elem // 5 + 4
+  dom.node_coord = numpy.random.rand(dom.numb_node, 3)
+  dom.numb_elem = numb_elem
+  dom.elem2node = numpy.random.randint(0, dom.numb_node, 4 * numb_elem)
+  dom.p_elem2node = numpy.arange(0, 4 * numb_elem + 1, 4)
+  dom.elem_type = numpy.zeros(numb_elem, dtype=int) + 10
+  dom.AllocPointData(1)
+  dom.AddPointData("node_value", 1, numpy.random.rand(dom.numb_node, 1))
+  dom.AllocCellData(1)
+  dom.AddCellData("elem_value", 3, numpy.random.rand(numb_elem, 3))
+
+  return dom
+
+# -- main ----------------------------------------------------------------------
+def main ( argv=[PROG_NAME] ) :
+
+  # ----------------------------------------------------------------------------
+  # -- INITIALIZATION
+  # ----------------------------------------------------------------------------
+
+  # -- Mesh handler (read back)
+  dom_read = Mesh()
+
+  # -- Test result
+  test_success = True
+
+  # ----------------------------------------------------------------------------
+  # -- ARGUMENTS
+  # ----------------------------------------------------------------------------
+
+  # -- check minimum number of arguments
+  argc = len(argv)
+  if (argc < MIN_ARGC) :
+    print HELP
+    return EXIT_FAILURE
+
+  # -- print help (-h)
+  if ("-h" in argv[MIN_ARGC:]) :
+    print HELP
+    return EXIT_SUCCESS
+
+  # -- set largest mesh size exponent
+  max_exp = 6
+  if (argc > MIN_ARGC) :
+    max_exp = int(argv[MIN_ARGC])
+
+  # ----------------------------------------------------------------------------
+  # -- PROCESS
+  # ----------------------------------------------------------------------------
+
+  tmp_dir = tempfile.mkdtemp()
+  numpy.random.seed(0)
+
+  for exp in range(4, max_exp + 1) :
+
+    # -- build synthetic mesh
+    numb_elem = 10**exp
+    print PROG_NAME, "--- Writing", numb_elem, "cells to", tmp_dir
+    dom = BuildSyntheticMesh(numb_elem)
+
+    for (label, precision, compress) in WRITE_OPTION :
+
+      # -- write
+      om_file_name = os.path.join(tmp_dir, "bench" + str(exp) + label + ".vtk")
+      wclock_btime = time.time()
+      dom.WriteToFileVtk(om_file_name, precision=precision, compress=compress)
+      wclock_etime = time.time()
+      if (dom.err_code == Mesh.FAILURE) :
+        print PROG_NAME, dom.err_msg
+        return EXIT_FAILURE
+      file_size = os.path.getsize(om_file_name) / 1e6
+      if (not compress) :
+        data_size = file_size
+      print PROG_NAME, ("*** {:5s}: {:8.2f} MB in {:8.3f} sec. ="
+                        + " {:8.2f} MB/s").format(label, file_size,
+            wclock_etime - wclock_btime,
+            data_size / (wclock_etime - wclock_btime))
+
+      # -- test (full precision, compressed or not)
+      if (precision is None) :
+        dom_read.ReadAllFromFileVtk(om_file_name)
+        if (dom_read.err_code == Mesh.FAILURE) :
+          print PROG_NAME, dom_read.err_msg
+          return EXIT_FAILURE
+        for name in ["node_coord", "elem2node", "p_elem2node", "elem_type"] :
+          if (not numpy.array_equal(getattr(dom, name),
+                                    getattr(dom_read, name))) :
+            test_success = False
+        if ((not numpy.array_equal(dom_read.GetPointData("node_value"),
+                                   dom.pdata_val[0]))
+            or (not numpy.array_equal(dom_read.GetCellData("elem_value"),
+                                      dom.cdata_val[0]))) :
+          test_success = False
+
+      os.remove(om_file_name)
+
+  shutil.rmtree(tmp_dir)
+
+  # ----------------------------------------------------------------------------
+  # -- OUTPUT
+  # ----------------------------------------------------------------------------
+
+  # -- print result
+  if (test_success) :
+    print PROG_NAME, "*** Result: SUCCESS"
+  else :
+    print PROG_NAME, "*** Result: FAILURE"
+
+
+  return EXIT_SUCCESS
+
+# END def main ( argc, argv ) :
+# ------------------------------------------------------------------------------
+
+if __name__ == "__main__" :
+  main(sys.argv)
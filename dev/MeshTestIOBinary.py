@@ -0,0 +1,191 @@
+# -*- coding: utf-8 -*-
+
+##
+# @author Pr Magoules HPC Research Group, CentraleSupelec, France
+# @version 1.0 [Python 2.7]
+#
+
+# -- Standard modules
+import sys
+import os
+import time
+import tempfile
+
+# -- Third-party modules
+import numpy
+
+# -- MRG modules
+sys.path.append("mod")
+from mesh import Mesh
+
+# -- Constants
+
+# Error
+EXIT_SUCCESS = 0
+EXIT_FAILURE = 1
+
+# Program description
+PROG_NAME = "[MeshTestIOBinary]"
+MIN_ARGC = 1
+HELP = """
+  BRIEF: Tests VTK BINARY file I/O operations of class Mesh (round trip of
+         the ASCII test mesh), and gzip-compressed files (ASCII and BINARY
+         round trips, through every reader).
+  ARGS:
+        [-h] # Displays this description.
+"""
+
+# -- main ----------------------------------------------------------------------
+def main ( argv=[PROG_NAME] ) :
+
+  # ----------------------------------------------------------------------------
+  # -- INITIALIZATION
+  # ----------------------------------------------------------------------------
+
+  # -- Mesh handlers
+  dom = Mesh()
+  dom_bin = Mesh()
+
+  # -- Test result
+  test_success = True
+
+  # ----------------------------------------------------------------------------
+  # -- ARGUMENTS
+  # ----------------------------------------------------------------------------
+
+  # -- check minimum number of arguments
+  argc = len(argv)
+  if (argc < MIN_ARGC) :
+    print HELP
+    return EXIT_FAILURE
+
+  # -- set input mesh file name (constant)
+  im_file_name = "../data/in/MRG/AP3D-H0750B-S0-LGM16.vtk"
+
+  # -- set output mesh file name
+  (p_file, om_file_name) = tempfile.mkstemp(".vtk")
+  os.close(p_file)
+
+  # -- print help (-h)
+  if ("-h" in argv[MIN_ARGC:]) :
+    print HELP
+    return EXIT_SUCCESS
+
+  # ----------------------------------------------------------------------------
+  # -- INPUT
+  # ----------------------------------------------------------------------------
+
+  # -- read mesh
+  print PROG_NAME, "--- Reading mesh from", im_file_name
+  dom.ReadFromFileVtk(im_file_name)
+  if (dom.err_code == Mesh.FAILURE) :
+    print PROG_NAME, dom.err_msg
+    return EXIT_FAILURE
+
+  # -- add data fields
+  dom.AllocPointData(1)
+  dom.AddPointData("node_coord", 3, dom.node_coord)
+  dom.AllocCellData(1)
+  dom.AddCellData("elem_type", 1, dom.elem_type.reshape((dom.numb_elem, 1)))
+
+  # ----------------------------------------------------------------------------
+  # -- PROCESS
+  # ----------------------------------------------------------------------------
+
+  # -- begin time measurement
+
+  # cpu time
+  cpu_btime = time.clock()
+
+  # wall-clock time
+  wclock_btime = time.time()
+
+  # -- write and read back mesh
+  print PROG_NAME, "--- Writing and reading back", om_file_name
+  dom.WriteToFileVtk(om_file_name, file_type="BINARY")
+  if (dom.err_code == Mesh.FAILURE) :
+    print PROG_NAME, dom.err_msg
+    return EXIT_FAILURE
+  dom_bin.ReadFromFileVtk(om_file_name)
+  if (dom_bin.err_code == Mesh.FAILURE) :
+    print PROG_NAME, dom_bin.err_msg
+    return EXIT_FAILURE
+  point_data = dom_bin.ReadFieldFromFileVtk(om_file_name, "node_coord")
+  cell_data = dom_bin.ReadFieldFromFileVtk(om_file_name, "elem_type")
+
+  # -- test
+  print PROG_NAME, "--- Testing"
+  for name in ["node_coord", "elem2node", "p_elem2node", "elem_type"] :
+    if ((getattr(dom, name).dtype != getattr(dom_bin, name).dtype)
+        or (getattr(dom, name).tobytes() != getattr(dom_bin, name).tobytes())) :
+      test_success = False
+  if ((dom_bin.numb_node != 16)
+      or (dom_bin.numb_elem != 49)
+      or (point_data.tobytes() != dom.node_coord.tobytes())
+      or (not numpy.array_equal(cell_data[:,0], dom.elem_type))) :
+    test_success = False
+
+  # -- write and read back compressed mesh
+  for file_type in ["ASCII", "BINARY"] :
+    print PROG_NAME, "--- Writing and reading back compressed", file_type,\
+          om_file_name
+    dom.WriteToFileVtk(om_file_name, file_type=file_type, compress=True)
+    if (dom.err_code == Mesh.FAILURE) :
+      print PROG_NAME, dom.err_msg
+      return EXIT_FAILURE
+    for read_mode in ["BULK", "CHAR"] :
+      dom_gz = Mesh()
+      dom_gz.ReadFromFileVtk(om_file_name, read_mode)
+      if ((dom_gz.err_code == Mesh.FAILURE)
+          or (not numpy.allclose(dom_gz.node_coord, dom.node_coord))
+          or (not numpy.array_equal(dom_gz.elem2node, dom.elem2node))
+          or (not numpy.array_equal(dom_gz.elem_type, dom.elem_type))) :
+        test_success = False
+    dom_gz = Mesh()
+    dom_gz.ReadAllFromFileVtk(om_file_name)
+    if ((dom_gz.err_code == Mesh.FAILURE)
+        or (not numpy.allclose(dom_gz.GetPointData("node_coord"),
+                               dom.node_coord))) :
+      test_success = False
+    for read_mode in ["INDEX", "SCAN"] :
+      cell_data = dom_gz.ReadFieldFromFileVtk(om_file_name, "elem_type",
+                                              read_mode)
+      if ((dom_gz.err_code == Mesh.FAILURE)
+          or (not numpy.array_equal(cell_data[:,0], dom.elem_type))) :
+        test_success = False
+    if (os.path.isfile(om_file_name + Mesh.VTK_INDEX_EXT)) :
+      os.remove(om_file_name + Mesh.VTK_INDEX_EXT)
+
+  # -- end time measurement
+
+  # cpu time
+  cpu_etime = time.clock()
+
+  # wall-clock time
+  wclock_etime = time.time()
+
+  os.remove(om_file_name)
+
+  # ----------------------------------------------------------------------------
+  # -- OUTPUT
+  # ----------------------------------------------------------------------------
+
+  # -- print result
+  if (test_success) :
+    print PROG_NAME, "*** Result: SUCCESS"
+  else :
+    print PROG_NAME, "*** Result: FAILURE"
+
+  # -- print time measurement
+  print PROG_NAME, "*** CPU: {:.3f} sec.".format(cpu_etime - cpu_btime)
+  print PROG_NAME,\
+        "*** Wall-clock: {:.3f} sec.".format(wclock_etime - wclock_btime)
+
+
+  return EXIT_SUCCESS
+
+# END def main ( argc, argv ) :
+# ------------------------------------------------------------------------------
+
+if __name__ == "__main__" :
+  main(sys.argv)
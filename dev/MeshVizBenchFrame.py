@@ -0,0 +1,191 @@
+# -*- coding: utf-8 -*-
+
+##
+# @author Pr Magoules HPC Research Group, CentraleSupelec, France
+# @version 1.0 [Python 2.7]
+#
+
+# -- Standard modules
+import sys
+import os
+import time
+import shutil
+import tempfile
+
+# -- Third-party modules
+import numpy
+
+# -- MRG modules
+sys.path.append("mod")
+from mesh import Mesh
+from meshviz import MeshViz
+
+# -- Constants
+
+# Error
+EXIT_SUCCESS = 0
+EXIT_FAILURE = 1
+
+# Program description
+PROG_NAME = "[MeshVizBenchFrame]"
+MIN_ARGC = 1
+HELP = """
+  BRIEF: Measures the frame export throughput of class MeshViz (offscreen
+         rendering, JPEG screenshots written in the rendering thread, then by
+         writer threads, then to a video) on synthetic tetrahedral meshes of
+         10^3 to 10^max_exp cells.
+  ARGS:
+        [max_exp] # Largest mesh size exponent (default: 5).
+        [numb_frame] # Number of frames of each run (default: 50).
+        [-h] # Displays this description.
+"""
+
+# Number of writer threads of each run, 0 for none, -1 for a video
+WRITER_THREAD = [0, 1, 2, 4, -1]
+
+##
+# @brief Builds a synthetic tetrahedral mesh, with one point data and one cell
+#        data field.
+# @param numb_elem = number of cells
+# @return dom = mesh (Mesh)
+#
+def BuildFrameMesh ( numb_elem ) :
+
+  dom = Mesh()
+  dom.numb_node = numb_elem // 5 + 4
+  dom.node_coord = numpy.random.rand(dom.numb_node, 3)
+  dom.numb_elem = numb_elem
+  dom.elem2node = numpy.random.randint(0, dom.numb_node, 4 * numb_elem)
+  dom.p_elem2node = numpy.arange(0, 4 * numb_elem + 1, 4)
+  dom.elem_type = numpy.zeros(numb_elem, dtype=int) + 10
+  dom.AllocPointData(1)
+  dom.AddPointData("node_step", 1, numpy.zeros((dom.numb_node, 1)))
+  dom.AllocCellData(1)
+  dom.AddCellData("link_step", 1, numpy.zeros((numb_elem, 1)))
+
+  return dom
+
+# -- main ----------------------------------------------------------------------
+def main ( argv=[PROG_NAME] ) :
+
+  # ----------------------------------------------------------------------------
+  # -- INITIALIZATION
+  # ----------------------------------------------------------------------------
+
+  # -- Test result
+  test_success = True
+
+  # ----------------------------------------------------------------------------
+  # -- ARGUMENTS
+  # ----------------------------------------------------------------------------
+
+  # -- check minimum number of arguments
+  argc = len(argv)
+  if (argc < MIN_ARGC) :
+    print HELP
+    return EXIT_FAILURE
+
+  # -- print help (-h)
+  if ("-h" in argv[MIN_ARGC:]) :
+    print HELP
+    return EXIT_SUCCESS
+
+  # -- set largest mesh size exponent and number of frames
+  max_exp = 5
+  if (argc > MIN_ARGC) :
+    max_exp = int(argv[MIN_ARGC])
+  numb_frame = 50
+  if (argc > MIN_ARGC + 1) :
+    numb_frame = int(argv[MIN_ARGC + 1])
+
+  # ----------------------------------------------------------------------------
+  # -- PROCESS
+  # ----------------------------------------------------------------------------
+
+  tmp_dir = tempfile.mkdtemp()
+  numpy.random.seed(0)
+
+  for exp in range(3, max_exp + 1) :
+
+    # -- build mesh
+    numb_elem = 10**exp
+    print PROG_NAME, "--- Mesh of", numb_elem, "cells"
+    dom = BuildFrameMesh(numb_elem)
+
+    for numb_thread in WRITER_THREAD :
+
+      # -- build scene
+      viz = MeshViz(offscreen=True)
+      viz.ReadMeshFromMesh(dom)
+      viz.SelectCellData("link_step")
+      viz.SelectPointData("node_step")
+      viz.Config(win_size=(800, 600))
+      viz.BuildCellColorScale(0, numb_frame)
+      viz.BuildPointColorScale(0, numb_frame)
+      viz.BuildGlyph(0.01)
+
+      # -- render and export frames (values updated in place, as NetSim)
+      node_val = numpy.zeros(dom.numb_node, dtype=int)
+      elem_val = numpy.zeros(dom.numb_elem, dtype=int)
+      if (numb_thread > 0) :
+        viz.StartFrameWriter(numb_thread)
+      elif (numb_thread < 0) :
+        viz.StartVideo(os.path.join(tmp_dir, "frame.avi"))
+      wclock_btime = time.time()
+      for k in range(0, numb_frame) :
+        node_val[:] = k
+        elem_val[:] = k
+        viz.Render(node_val, elem_val)
+        if (numb_thread < 0) :
+          viz.WriteVideoFrame()
+        else :
+          viz.WriteScreenshotToFile(os.path.join(tmp_dir,
+                                                 "frame" + str(k) + ".jpg"))
+        if (viz.err_code == MeshViz.FAILURE) :
+          print PROG_NAME, viz.err_msg
+          return EXIT_FAILURE
+      viz.Close()
+      wclock_time = time.time() - wclock_btime
+      if (viz.err_code == MeshViz.FAILURE) :
+        print PROG_NAME, viz.err_msg
+        return EXIT_FAILURE
+
+      # -- test: every frame is written
+      if (numb_thread < 0) :
+        if ((viz.video.numb_frame != numb_frame)
+            or (len(os.listdir(tmp_dir)) != 1)) :
+          test_success = False
+      elif ((viz.numb_frame != numb_frame)
+            or (len(os.listdir(tmp_dir)) != numb_frame)) :
+        test_success = False
+      file_size = 0
+      for file_name in os.listdir(tmp_dir) :
+        file_size += os.path.getsize(os.path.join(tmp_dir, file_name))
+        os.remove(os.path.join(tmp_dir, file_name))
+
+      print PROG_NAME, ("*** {:s}: {:8.2f} frames/s, {:8.1f} kB/frame"
+                        ).format(("video" if (numb_thread < 0) else
+                                  str(numb_thread) + " writer threads"),
+                                 numb_frame / wclock_time,
+                                 file_size / 1e3 / numb_frame)
+
+  shutil.rmtree(tmp_dir)
+
+  # ----------------------------------------------------------------------------
+  # -- OUTPUT
+  # ----------------------------------------------------------------------------
+
+  # -- print result
+  if (test_success) :
+    print PROG_NAME, "*** Result: SUCCESS"
+  else :
+    print PROG_NAME, "*** Result: FAILURE"
+
+
+  return EXIT_SUCCESS
+
+# END def main ( argc, argv ) :
+# ------------------------------------------------------------------------------
+
+if __name__ == "__main__" :
+  main(sys.argv)
@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*-
+
+##
+# @author Pr Magoules HPC Research Group, CentraleSupelec, France
+# @version 1.0 [Python 2.7]
+#
+
+# -- Standard modules
+import sys
+import time
+
+# -- Third-party modules
+import numpy
+
+# -- MRG modules
+sys.path.append("mod")
+from graph import Graph
+from netsim import NetSim
+
+# -- Constants
+
+# Error
+EXIT_SUCCESS = 0
+EXIT_FAILURE = 1
+
+# Program description
+PROG_NAME = "[NetSimBenchEngine]"
+MIN_ARGC = 1
+HELP = """
+  BRIEF: Compares the "LOOP" and "VECTOR" engines of class NetSim (steps per
+         second, identical outputs at each step) on random networks of
+         10^2 to 10^max_exp nodes.
+  ARGS:
+        [max_exp] # Largest network size exponent (default: 5).
+        [numb_step] # Number of steps of each run (default: 200).
+        [-h] # Displays this description.
+"""
+
+# Average degree of random networks
+RANDOM_DEGREE = 6
+
+# Outputs compared at each step
+STEP_OUTPUT = ["node_step", "link_step", "node_iter", "node_conn",
+               "node_state", "numb_step"]
+
+##
+# @brief Builds a random network and its color-sorted communication schedule
+#        (as in sim.py).
+# @param numb_node = number of nodes
+# @return dom = graph with vert2vert, p_vert2vert and vert2vert_edge (Graph),
+#          None on error
+#
+def BuildRandomNetwork ( numb_node ) :
+
+  # -- links: a ring (no isolated node) plus random pairs
+  numb_link = numb_node * RANDOM_DEGREE // 2
+  edge2vert = numpy.random.randint(0, numb_node, (numb_link, 2))
+  edge2vert[0:numb_node,0] = numpy.arange(numb_node)
+  edge2vert[0:numb_node,1] = (numpy.arange(numb_node) + 1) % numb_node
+  edge2vert = edge2vert[edge2vert[:,0] != edge2vert[:,1]]
+  dom = Graph(numb_node, len(edge2vert), edge2vert.ravel(),
+              numpy.arange(0, 2 * len(edge2vert) + 1, 2))
+
+  # -- color links with the line graph, then sort
+  dom.Require("edge2edge")
+  dom_line = Graph()
+  dom_line.numb_vert = dom.numb_edge
+  dom_line.vert2vert = dom.edge2edge
+  dom_line.p_vert2vert = dom.p_edge2edge
+  dom_line.Require("vert_color")
+  dom.edge_color = dom_line.vert_color
+  dom.Release("edge2edge")
+  dom.Require("vert2vert")
+  if (dom.err_code == Graph.FAILURE) :
+    print PROG_NAME, dom.err_msg
+    return None
+
+  return dom
+
+# -- main ----------------------------------------------------------------------
+def main ( argv=[PROG_NAME] ) :
+
+  # ----------------------------------------------------------------------------
+  # -- INITIALIZATION
+  # ----------------------------------------------------------------------------
+
+  # -- Test result
+  test_success = True
+
+  # ----------------------------------------------------------------------------
+  # -- ARGUMENTS
+  # ----------------------------------------------------------------------------
+
+  # -- check minimum number of arguments
+  argc = len(argv)
+  if (argc < MIN_ARGC) :
+    print HELP
+    return EXIT_FAILURE
+
+  # -- print help (-h)
+  if ("-h" in argv[MIN_ARGC:]) :
+    print HELP
+    return EXIT_SUCCESS
+
+  # -- set largest network size exponent, number of steps
+  max_exp = 5
+  if (argc > MIN_ARGC) :
+    max_exp = int(argv[MIN_ARGC])
+  numb_step = 200
+  if (argc > MIN_ARGC + 1) :
+    numb_step = int(argv[MIN_ARGC + 1])
+
+  # ----------------------------------------------------------------------------
+  # -- PROCESS
+  # ----------------------------------------------------------------------------
+
+  numpy.random.seed(0)
+
+  for exp in range(2, max_exp + 1) :
+
+    # -- build random network
+    numb_node = 10**exp
+    print PROG_NAME, "--- Building network of", numb_node, "nodes"
+    dom = BuildRandomNetwork(numb_node)
+    if (dom is None) :
+      return EXIT_FAILURE
+    node_size = numpy.random.randint(1, 20, dom.numb_vert)
+    link_size = numpy.random.randint(1, 10, dom.numb_edge)
+    net = [NetSim(dom.numb_vert, dom.numb_edge, dom.vert2vert_edge,
+                  dom.vert2vert, dom.p_vert2vert, node_size, link_size,
+                  numb_iter=numb_step, engine=engine)
+           for engine in ["LOOP", "VECTOR"]]
+
+    # -- run both engines step by step
+    wclock_time = [0.0] * len(net)
+    for k in range(0, numb_step) :
+      for i in range(0, len(net)) :
+        wclock_btime = time.time()
+        net[i].Step()
+        wclock_time[i] += time.time() - wclock_btime
+        if (net[i].err_code == NetSim.FAILURE) :
+          print PROG_NAME, net[i].err_msg
+          return EXIT_FAILURE
+
+      # -- test
+      for name in STEP_OUTPUT :
+        if (not numpy.array_equal(getattr(net[0], name),
+                                  getattr(net[1], name))) :
+          test_success = False
+
+    print PROG_NAME, ("*** LOOP: {:10.1f} steps/s, VECTOR: {:10.1f} steps/s"
+                      + " (speedup: {:.1f})").format(
+          numb_step / wclock_time[0], numb_step / wclock_time[1],
+          wclock_time[0] / wclock_time[1])
+
+  # ----------------------------------------------------------------------------
+  # -- OUTPUT
+  # ----------------------------------------------------------------------------
+
+  # -- print result
+  if (test_success) :
+    print PROG_NAME, "*** Result: SUCCESS"
+  else :
+    print PROG_NAME, "*** Result: FAILURE"
+
+
+  return EXIT_SUCCESS
+
+# END def main ( argc, argv ) :
+# ------------------------------------------------------------------------------
+
+if __name__ == "__main__" :
+  main(sys.argv)
@@ -0,0 +1,161 @@
+# -*- coding: utf-8 -*-
+
+##
+# @author Pr Magoules HPC Research Group, CentraleSupelec, France
+# @version 1.0 [Python 2.7]
+#
+
+# -- Standard modules
+import sys
+import time
+
+# -- Third-party modules
+import numpy
+
+# -- MRG modules
+sys.path.append("mod")
+from netsim import NetSim
+from NetSimBenchEngine import BuildRandomNetwork, STEP_OUTPUT
+
+# -- Constants
+
+# Error
+EXIT_SUCCESS = 0
+EXIT_FAILURE = 1
+
+# Program description
+PROG_NAME = "[NetSimBenchEvent]"
+MIN_ARGC = 1
+HELP = """
+  BRIEF: Compares the "VECTOR" and "EVENT" engines of class NetSim (run time,
+         identical outputs) on random networks of 10^2 to 10^max_exp nodes,
+         with node and link sizes of 10 to 10^max_size_exp.
+  ARGS:
+        [max_exp] # Largest network size exponent (default: 4).
+        [max_size_exp] # Largest node size exponent (default: 4).
+        [-h] # Displays this description.
+"""
+
+# Number of iterations of each run
+NUMB_ITER = 2
+
+# Largest number of steps run with the "VECTOR" engine (the time of the whole
+# run is then extrapolated)
+MAX_NUMB_STEP_VECTOR = 2000
+
+##
+# @brief Builds a simulation of a network.
+# @param dom = network (Graph)
+# @param size = node and link size
+# @param engine = simulation engine (str)
+# @return simulation (NetSim)
+#
+def BuildSim ( dom, size, engine ) :
+
+  return NetSim(dom.numb_vert, dom.numb_edge, dom.vert2vert_edge,
+                dom.vert2vert, dom.p_vert2vert,
+                size + numpy.zeros(dom.numb_vert, dtype=int),
+                size // 2 + numpy.zeros(dom.numb_edge, dtype=int),
+                numb_iter=NUMB_ITER, engine=engine)
+
+# -- main ----------------------------------------------------------------------
+def main ( argv=[PROG_NAME] ) :
+
+  # ----------------------------------------------------------------------------
+  # -- INITIALIZATION
+  # ----------------------------------------------------------------------------
+
+  # -- Test result
+  test_success = True
+
+  # ----------------------------------------------------------------------------
+  # -- ARGUMENTS
+  # ----------------------------------------------------------------------------
+
+  # -- check minimum number of arguments
+  argc = len(argv)
+  if (argc < MIN_ARGC) :
+    print HELP
+    return EXIT_FAILURE
+
+  # -- print help (-h)
+  if ("-h" in argv[MIN_ARGC:]) :
+    print HELP
+    return EXIT_SUCCESS
+
+  # -- set largest network and node size exponents
+  max_exp = 4
+  if (argc > MIN_ARGC) :
+    max_exp = int(argv[MIN_ARGC])
+  max_size_exp = 4
+  if (argc > MIN_ARGC + 1) :
+    max_size_exp = int(argv[MIN_ARGC + 1])
+
+  # ----------------------------------------------------------------------------
+  # -- PROCESS
+  # ----------------------------------------------------------------------------
+
+  numpy.random.seed(0)
+
+  for exp in range(2, max_exp + 1) :
+
+    # -- build network
+    numb_node = 10**exp
+    print PROG_NAME, "--- Network of", numb_node, "nodes"
+    dom = BuildRandomNetwork(numb_node)
+    if (dom is None) :
+      return EXIT_FAILURE
+
+    for size_exp in range(1, max_size_exp + 1) :
+      size = 10**size_exp
+
+      # -- event engine, whole run
+      sim_event = BuildSim(dom, size, "EVENT")
+      wclock_btime = time.time()
+      sim_event.StepTo()
+      event_time = time.time() - wclock_btime
+      if (sim_event.err_code == NetSim.FAILURE) :
+        print PROG_NAME, sim_event.err_msg
+        return EXIT_FAILURE
+
+      # -- vector engine, first steps
+      glob_step = sim_event.glob_step
+      sim_vector = BuildSim(dom, size, "VECTOR")
+      numb_step = min(glob_step, MAX_NUMB_STEP_VECTOR)
+      wclock_btime = time.time()
+      sim_vector.StepTo(numb_step)
+      vector_time = (time.time() - wclock_btime) * glob_step / numb_step
+
+      # -- test: same outputs at the last step of the vector engine
+      if (numb_step < glob_step) :
+        sim_event = BuildSim(dom, size, "EVENT")
+        sim_event.StepTo(numb_step)
+      for name in STEP_OUTPUT + ["glob_iter", "flag_end"] :
+        if (not numpy.array_equal(getattr(sim_vector, name),
+                                  getattr(sim_event, name))) :
+          test_success = False
+
+      print PROG_NAME, ("*** size {:6d}: {:8d} steps, VECTOR {:10.3f} sec."
+                        + "{:s}, EVENT {:8.3f} sec. = x{:.1f}").format(
+            size, glob_step, vector_time,
+            "" if (numb_step == glob_step) else " (extrapolated)",
+            event_time, vector_time / event_time)
+
+  # ----------------------------------------------------------------------------
+  # -- OUTPUT
+  # ----------------------------------------------------------------------------
+
+  # -- print result
+  if (test_success) :
+    print PROG_NAME, "*** Result: SUCCESS"
+  else :
+    print PROG_NAME, "*** Result: FAILURE"
+
+
+  return EXIT_SUCCESS
+
+# END def main ( argc, argv ) :
+# ------------------------------------------------------------------------------
+
+if __name__ == "__main__" :
+  main(sys.argv)
@@ -0,0 +1,175 @@
+# -*- coding: utf-8 -*-
+
+##
+# @author Pr Magoules HPC Research Group, CentraleSupelec, France
+# @version 1.0 [Python 2.7]
+#
+
+# -- Standard modules
+import sys
+import os
+import time
+import shutil
+import tempfile
+import multiprocessing
+
+# -- Third-party modules
+import numpy
+
+# -- MRG modules
+sys.path.append("mod")
+from netsim import NetSim
+from netsweep import NetSweep
+from NetSimBenchEngine import BuildRandomNetwork
+
+# -- Constants
+
+# Error
+EXIT_SUCCESS = 0
+EXIT_FAILURE = 1
+
+# Program description
+PROG_NAME = "[NetSimBenchSweep]"
+MIN_ARGC = 1
+HELP = """
+  BRIEF: Measures the speedup of class NetSweep with 1 to max_proc worker
+         processes, on a sweep of 16 scenarios of a random network of
+         numb_node nodes (same results as one NetSim per scenario).
+  ARGS:
+        [numb_node] # Network size (default: 10000).
+        [max_proc] # Largest number of worker processes (default: number of
+                   # cores).
+        [-h] # Displays this description.
+"""
+
+# Scenarios: numbers of iterations, node and link size factors
+SWEEP_ITER = [1, 2]
+SWEEP_NODE_SCALE = [0.5, 1.0, 2.0, 4.0]
+SWEEP_LINK_SCALE = [0.5, 2.0]
+
+# -- main ----------------------------------------------------------------------
+def main ( argv=[PROG_NAME] ) :
+
+  # ----------------------------------------------------------------------------
+  # -- INITIALIZATION
+  # ----------------------------------------------------------------------------
+
+  # -- Test result
+  test_success = True
+
+  # ----------------------------------------------------------------------------
+  # -- ARGUMENTS
+  # ----------------------------------------------------------------------------
+
+  # -- check minimum number of arguments
+  argc = len(argv)
+  if (argc < MIN_ARGC) :
+    print HELP
+    return EXIT_FAILURE
+
+  # -- print help (-h)
+  if ("-h" in argv[MIN_ARGC:]) :
+    print HELP
+    return EXIT_SUCCESS
+
+  # -- set network size and largest number of processes
+  numb_node = 10000
+  if (argc > MIN_ARGC) :
+    numb_node = int(argv[MIN_ARGC])
+  max_proc = multiprocessing.cpu_count()
+  if (argc > MIN_ARGC + 1) :
+    max_proc = int(argv[MIN_ARGC + 1])
+
+  # ----------------------------------------------------------------------------
+  # -- INPUT
+  # ----------------------------------------------------------------------------
+
+  # -- build network once
+  numpy.random.seed(0)
+  print PROG_NAME, "--- Building a random network of", numb_node, "nodes"
+  dom = BuildRandomNetwork(numb_node)
+  if (dom is None) :
+    return EXIT_FAILURE
+  node_size = numpy.random.randint(1, 200, dom.numb_vert)
+  link_size = numpy.random.randint(1, 100, dom.numb_edge)
+
+  # -- sweep
+  sweep = NetSweep(dom.numb_vert, dom.numb_edge, dom.vert2vert_edge,
+                   dom.vert2vert, dom.p_vert2vert, node_size, link_size)
+  for numb_iter in SWEEP_ITER :
+    for node_scale in SWEEP_NODE_SCALE :
+      for link_scale in SWEEP_LINK_SCALE :
+        sweep.AddScenario(numb_iter, node_scale, link_scale)
+        if (sweep.err_code == NetSweep.FAILURE) :
+          print PROG_NAME, sweep.err_msg
+          return EXIT_FAILURE
+
+  # ----------------------------------------------------------------------------
+  # -- PROCESS
+  # ----------------------------------------------------------------------------
+
+  # -- one process, then more
+  result = None
+  numb_proc = 1
+  while (numb_proc <= max_proc) :
+    wclock_btime = time.time()
+    sweep.Run(numb_proc)
+    wclock_time = time.time() - wclock_btime
+    if (sweep.err_code == NetSweep.FAILURE) :
+      print PROG_NAME, sweep.err_msg
+      return EXIT_FAILURE
+    if (result is None) :
+      result = sweep.result.copy()
+      base_time = wclock_time
+    print PROG_NAME, ("*** {:3d} processes: {:8.3f} sec. (speedup: {:.2f},"
+                      + " efficiency: {:.2f})").format(numb_proc, wclock_time,
+          base_time / wclock_time, base_time / wclock_time / numb_proc)
+
+    # -- test: same results with any number of processes
+    for name in ["numb_tick", "flag_end", "numb_step"] :
+      if (not numpy.array_equal(sweep.result[name], result[name])) :
+        test_success = False
+    numb_proc *= 2
+
+  # -- test: same results as one NetSim per scenario
+  for (k, (numb_iter, node_scale, link_scale)) in enumerate(sweep.scenario) :
+    sim = NetSim(dom.numb_vert, dom.numb_edge, dom.vert2vert_edge,
+                 dom.vert2vert, dom.p_vert2vert,
+                 numpy.maximum(1, numpy.rint(node_scale * node_size)).astype(int),
+                 numpy.maximum(1, numpy.rint(link_scale * link_size)).astype(int),
+                 numb_iter=numb_iter, engine="EVENT")
+    sim.StepTo()
+    if ((sim.glob_step != result[k]["numb_tick"])
+        or (not numpy.array_equal(sim.numb_step,
+                                  result[k]["numb_step"][0:numb_iter]))) :
+      test_success = False
+
+  # -- results table
+  tmp_dir = tempfile.mkdtemp()
+  sweep.WriteResult(os.path.join(tmp_dir, "sweep.csv"))
+  if (sweep.err_code == NetSweep.FAILURE) :
+    print PROG_NAME, sweep.err_msg
+    return EXIT_FAILURE
+  p_file = open(os.path.join(tmp_dir, "sweep.csv"))
+  print p_file.read()
+  p_file.close()
+  shutil.rmtree(tmp_dir)
+
+  # ----------------------------------------------------------------------------
+  # -- OUTPUT
+  # ----------------------------------------------------------------------------
+
+  # -- print result
+  if (test_success) :
+    print PROG_NAME, "*** Result: SUCCESS"
+  else :
+    print PROG_NAME, "*** Result: FAILURE"
+
+
+  return EXIT_SUCCESS
+
+# END def main ( argc, argv ) :
+# ------------------------------------------------------------------------------
+
+if __name__ == "__main__" :
+  main(sys.argv)
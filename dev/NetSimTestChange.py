@@ -0,0 +1,168 @@
+# -*- coding: utf-8 -*-
+
+##
+# @author Pr Magoules HPC Research Group, CentraleSupelec, France
+# @version 1.0 [Python 2.7]
+#
+
+# -- Standard modules
+import sys
+import time
+
+# -- Third-party modules
+import numpy
+
+# -- MRG modules
+sys.path.append("mod")
+from netsim import NetSim
+from NetSimBenchEngine import BuildRandomNetwork
+
+# -- Constants
+
+# Error
+EXIT_SUCCESS = 0
+EXIT_FAILURE = 1
+
+# Program description
+PROG_NAME = "[NetSimTestChange]"
+MIN_ARGC = 1
+HELP = """
+  BRIEF: Tests the change sets of class NetSim (GetChange) on a random
+         network, with each engine, one step or several steps between two
+         calls: the changes applied to a copy of the output give the output.
+  ARGS:
+        [-h] # Displays this description.
+"""
+
+# Network size
+NUMB_NODE = 200
+
+# Number of iterations
+NUMB_ITER = 3
+
+# Largest number of steps between two calls
+MAX_JUMP = 5
+
+# -- main ----------------------------------------------------------------------
+def main ( argv=[PROG_NAME] ) :
+
+  # ----------------------------------------------------------------------------
+  # -- INITIALIZATION
+  # ----------------------------------------------------------------------------
+
+  # -- Test result
+  test_success = True
+
+  # ----------------------------------------------------------------------------
+  # -- ARGUMENTS
+  # ----------------------------------------------------------------------------
+
+  # -- check minimum number of arguments
+  argc = len(argv)
+  if (argc < MIN_ARGC) :
+    print HELP
+    return EXIT_FAILURE
+
+  # -- print help (-h)
+  if ("-h" in argv[MIN_ARGC:]) :
+    print HELP
+    return EXIT_SUCCESS
+
+  # ----------------------------------------------------------------------------
+  # -- INPUT
+  # ----------------------------------------------------------------------------
+
+  # -- build network
+  numpy.random.seed(0)
+  print PROG_NAME, "--- Building a random network of", NUMB_NODE, "nodes"
+  dom = BuildRandomNetwork(NUMB_NODE)
+  if (dom is None) :
+    return EXIT_FAILURE
+  node_size = numpy.random.randint(1, 20, dom.numb_vert)
+  link_size = numpy.random.randint(1, 10, dom.numb_edge)
+
+  # ----------------------------------------------------------------------------
+  # -- PROCESS
+  # ----------------------------------------------------------------------------
+
+  # -- begin time measurement
+
+  # cpu time
+  cpu_btime = time.clock()
+
+  # wall-clock time
+  wclock_btime = time.time()
+
+  # -- run each engine, one step then several steps between two calls
+  for engine in NetSim.ENGINE :
+    for max_jump in [1, MAX_JUMP] :
+      print PROG_NAME, "--- Running engine", engine, "up to", max_jump,\
+            "steps between two calls"
+      sim = NetSim(dom.numb_vert, dom.numb_edge, dom.vert2vert_edge,
+                   dom.vert2vert, dom.p_vert2vert, node_size, link_size,
+                   numb_iter=NUMB_ITER, engine=engine)
+
+      # first call: everything
+      (node, link) = sim.GetChange()
+      if ((len(node) != dom.numb_vert) or (len(link) != dom.numb_edge)) :
+        test_success = False
+      node_step = sim.node_step.copy()
+      link_step = sim.link_step.copy()
+
+      numb_change = 0
+      while (not sim.flag_end) :
+        prev_node_step = sim.node_step.copy()
+        prev_link_step = sim.link_step.copy()
+        sim.StepTo(sim.glob_step + numpy.random.randint(1, max_jump + 1))
+        if (sim.err_code == NetSim.FAILURE) :
+          print PROG_NAME, sim.err_msg
+          return EXIT_FAILURE
+
+        # exactly the changed entries, which give the output
+        (node, link) = sim.GetChange()
+        numb_change += len(node) + len(link)
+        if ((not numpy.array_equal(node, numpy.flatnonzero(
+                                   sim.node_step != prev_node_step)))
+            or (not numpy.array_equal(link, numpy.flatnonzero(
+                                      sim.link_step != prev_link_step)))) :
+          test_success = False
+        node_step[node] = sim.node_step[node]
+        link_step[link] = sim.link_step[link]
+        if ((not numpy.array_equal(node_step, sim.node_step))
+            or (not numpy.array_equal(link_step, sim.link_step))) :
+          test_success = False
+
+      print PROG_NAME, "*** {:d} steps, {:.1f} changes per step".format(
+            sim.glob_step, float(numb_change) / max(sim.glob_step, 1))
+
+  # -- end time measurement
+
+  # cpu time
+  cpu_etime = time.clock()
+
+  # wall-clock time
+  wclock_etime = time.time()
+
+  # ----------------------------------------------------------------------------
+  # -- OUTPUT
+  # ----------------------------------------------------------------------------
+
+  # -- print result
+  if (test_success) :
+    print PROG_NAME, "*** Result: SUCCESS"
+  else :
+    print PROG_NAME, "*** Result: FAILURE"
+
+  # -- print time measurement
+  print PROG_NAME, "*** CPU: {:.3f} sec.".format(cpu_etime - cpu_btime)
+  print PROG_NAME,\
+        "*** Wall-clock: {:.3f} sec.".format(wclock_etime - wclock_btime)
+
+
+  return EXIT_SUCCESS
+
+# END def main ( argc, argv ) :
+# ------------------------------------------------------------------------------
+
+if __name__ == "__main__" :
+  main(sys.argv)
@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*-
+
+##
+# @author Pr Magoules HPC Research Group, CentraleSupelec, France
+# @version 1.0 [Python 2.7]
+#
+
+# -- Standard modules
+import sys
+import os
+import time
+import shutil
+import tempfile
+
+# -- Third-party modules
+import numpy
+
+# -- MRG modules
+sys.path.append("mod")
+from netsim import NetSim
+from NetSimBenchEngine import BuildRandomNetwork
+
+# -- Constants
+
+# Error
+EXIT_SUCCESS = 0
+EXIT_FAILURE = 1
+
+# Program description
+PROG_NAME = "[NetSimTestCheckpoint]"
+MIN_ARGC = 1
+HELP = """
+  BRIEF: Tests the checkpoints of class NetSim on a random network: a run
+         stopped then restarted from its last checkpoint, with each pair of
+         engines, ends exactly as a run without stop.
+  ARGS:
+        [-h] # Displays this description.
+"""
+
+# Network size
+NUMB_NODE = 150
+
+# Number of iterations
+NUMB_ITER = 3
+
+# Number of steps between two checkpoints
+CKPT_STEP = 37
+
+# Number of steps before the stop
+STOP_STEP = 200
+
+# -- main ----------------------------------------------------------------------
+def main ( argv=[PROG_NAME] ) :
+
+  # ----------------------------------------------------------------------------
+  # -- INITIALIZATION
+  # ----------------------------------------------------------------------------
+
+  # -- Test result
+  test_success = True
+
+  # ----------------------------------------------------------------------------
+  # -- ARGUMENTS
+  # ----------------------------------------------------------------------------
+
+  # -- check minimum number of arguments
+  argc = len(argv)
+  if (argc < MIN_ARGC) :
+    print HELP
+    return EXIT_FAILURE
+
+  # -- print help (-h)
+  if ("-h" in argv[MIN_ARGC:]) :
+    print HELP
+    return EXIT_SUCCESS
+
+  # ----------------------------------------------------------------------------
+  # -- INPUT
+  # ----------------------------------------------------------------------------
+
+  # -- build network
+  numpy.random.seed(0)
+  print PROG_NAME, "--- Building a random network of", NUMB_NODE, "nodes"
+  dom = BuildRandomNetwork(NUMB_NODE)
+  if (dom is None) :
+    return EXIT_FAILURE
+  node_size = numpy.random.randint(1, 30, dom.numb_vert)
+  link_size = numpy.random.randint(1, 10, dom.numb_edge)
+  sim_list = [NetSim(dom.numb_vert, dom.numb_edge, dom.vert2vert_edge,
+                     dom.vert2vert, dom.p_vert2vert, node_size, link_size,
+                     numb_iter=NUMB_ITER, engine=engine,
+                     log_event=NetSim.LOG_EVENT)
+              for engine in NetSim.ENGINE * 3]
+
+  # ----------------------------------------------------------------------------
+  # -- PROCESS
+  # ----------------------------------------------------------------------------
+
+  # -- begin time measurement
+
+  # cpu time
+  cpu_btime = time.clock()
+
+  # wall-clock time
+  wclock_btime = time.time()
+
+  # -- run without stop
+  print PROG_NAME, "--- Running without stop"
+  sim_ref = sim_list[0]
+  sim_ref.StepTo()
+
+  # -- stop with an engine, restart with another one
+  tmp_dir = tempfile.mkdtemp()
+  for stop_engine in NetSim.ENGINE :
+    print PROG_NAME, "--- Stopping engine", stop_engine, "at step", STOP_STEP
+    sim = sim_list[NetSim.ENGINE.index(stop_engine) + len(NetSim.ENGINE)]
+    sim.ckpt_file = os.path.join(tmp_dir, stop_engine.lower() + ".npz")
+    sim.ckpt_step = CKPT_STEP
+    sim.StepTo(STOP_STEP)
+    sim.WaitCheckpoint()
+    if (sim.err_code == NetSim.FAILURE) :
+      print PROG_NAME, sim.err_msg
+      return EXIT_FAILURE
+
+    for sim in sim_list[2 * len(NetSim.ENGINE):] :
+      print PROG_NAME, "--- Restarting with engine", sim.engine
+      sim.ReadCheckpoint(os.path.join(tmp_dir, stop_engine.lower() + ".npz"))
+      if (sim.err_code == NetSim.FAILURE) :
+        print PROG_NAME, sim.err_msg
+        return EXIT_FAILURE
+      if (sim.glob_step != (STOP_STEP // CKPT_STEP) * CKPT_STEP) :
+        test_success = False
+      sim.StepTo()
+
+      # -- test
+      for name in NetSim.CKPT_STATE :
+        if (not numpy.array_equal(getattr(sim, name), getattr(sim_ref, name))) :
+          test_success = False
+      if (not numpy.array_equal(sim.GetLog(), sim_ref.GetLog())) :
+        test_success = False
+  shutil.rmtree(tmp_dir)
+
+  # -- end time measurement
+
+  # cpu time
+  cpu_etime = time.clock()
+
+  # wall-clock time
+  wclock_etime = time.time()
+
+  # ----------------------------------------------------------------------------
+  # -- OUTPUT
+  # ----------------------------------------------------------------------------
+
+  # -- print result
+  if (test_success) :
+    print PROG_NAME, "*** Result: SUCCESS"
+  else :
+    print PROG_NAME, "*** Result: FAILURE"
+
+  # -- print time measurement
+  print PROG_NAME, "*** CPU: {:.3f} sec.".format(cpu_etime - cpu_btime)
+  print PROG_NAME,\
+        "*** Wall-clock: {:.3f} sec.".format(wclock_etime - wclock_btime)
+
+
+  return EXIT_SUCCESS
+
+# END def main ( argc, argv ) :
+# ------------------------------------------------------------------------------
+
+if __name__ == "__main__" :
+  main(sys.argv)
@@ -0,0 +1,194 @@
+# -*- coding: utf-8 -*-
+
+##
+# @author Pr Magoules HPC Research Group, CentraleSupelec, France
+# @version 1.0 [Python 2.7]
+#
+
+# -- Standard modules
+import sys
+import os
+import time
+import shutil
+import tempfile
+
+# -- Third-party modules
+import numpy
+
+# -- MRG modules
+sys.path.append("mod")
+from netsim import NetSim
+from NetSimBenchEngine import BuildRandomNetwork
+
+# -- Constants
+
+# Error
+EXIT_SUCCESS = 0
+EXIT_FAILURE = 1
+
+# Program description
+PROG_NAME = "[NetSimTestLog]"
+MIN_ARGC = 1
+HELP = """
+  BRIEF: Tests the event log of class NetSim on a random network: same log
+         with each engine, filtering by event type, trace files.
+  ARGS:
+        [-h] # Displays this description.
+"""
+
+# Network size
+NUMB_NODE = 200
+
+# Number of iterations
+NUMB_ITER = 3
+
+# -- main ----------------------------------------------------------------------
+def main ( argv=[PROG_NAME] ) :
+
+  # ----------------------------------------------------------------------------
+  # -- INITIALIZATION
+  # ----------------------------------------------------------------------------
+
+  # -- Test result
+  test_success = True
+
+  # ----------------------------------------------------------------------------
+  # -- ARGUMENTS
+  # ----------------------------------------------------------------------------
+
+  # -- check minimum number of arguments
+  argc = len(argv)
+  if (argc < MIN_ARGC) :
+    print HELP
+    return EXIT_FAILURE
+
+  # -- print help (-h)
+  if ("-h" in argv[MIN_ARGC:]) :
+    print HELP
+    return EXIT_SUCCESS
+
+  # ----------------------------------------------------------------------------
+  # -- INPUT
+  # ----------------------------------------------------------------------------
+
+  # -- build network
+  numpy.random.seed(0)
+  print PROG_NAME, "--- Building a random network of", NUMB_NODE, "nodes"
+  dom = BuildRandomNetwork(NUMB_NODE)
+  if (dom is None) :
+    return EXIT_FAILURE
+  node_size = numpy.random.randint(1, 20, dom.numb_vert)
+  link_size = numpy.random.randint(1, 10, dom.numb_edge)
+
+  # ----------------------------------------------------------------------------
+  # -- PROCESS
+  # ----------------------------------------------------------------------------
+
+  # -- begin time measurement
+
+  # cpu time
+  cpu_btime = time.clock()
+
+  # wall-clock time
+  wclock_btime = time.time()
+
+  # -- run each engine
+  log = {}
+  for engine in NetSim.ENGINE :
+    print PROG_NAME, "--- Running engine", engine
+    sim = NetSim(dom.numb_vert, dom.numb_edge, dom.vert2vert_edge,
+                 dom.vert2vert, dom.p_vert2vert, node_size, link_size,
+                 numb_iter=NUMB_ITER, engine=engine,
+                 log_event=NetSim.LOG_EVENT)
+    sim.StepTo()
+    if (sim.err_code == NetSim.FAILURE) :
+      print PROG_NAME, sim.err_msg
+      return EXIT_FAILURE
+    log[engine] = sim.GetLog()
+
+  # -- same log with each engine
+  for engine in NetSim.ENGINE :
+    if (not numpy.array_equal(log[engine], log["LOOP"])) :
+      test_success = False
+
+  # -- one connection per link and iteration, one end of iteration per node
+  numb_event = numpy.bincount(log["LOOP"]["event"],
+                              minlength=len(NetSim.LOG_EVENT))
+  if ((numb_event[NetSim.LOG_CONNECT] != NUMB_ITER * len(dom.vert2vert))
+      or (numb_event[NetSim.LOG_ITER] != NUMB_ITER * dom.numb_vert)) :
+    test_success = False
+
+  # -- filtering by event type, log turned off
+  print PROG_NAME, "--- Logging connections only"
+  sim = NetSim(dom.numb_vert, dom.numb_edge, dom.vert2vert_edge,
+               dom.vert2vert, dom.p_vert2vert, node_size, link_size,
+               numb_iter=NUMB_ITER, log_event=[NetSim.LOG_CONNECT])
+  sim.StepTo()
+  connect_log = log["LOOP"][log["LOOP"]["event"] == NetSim.LOG_CONNECT]
+  if ((not numpy.array_equal(sim.GetLog(), connect_log))
+      or (not numpy.array_equal(sim.GetLog([NetSim.LOG_CONNECT]),
+                                connect_log))) :
+    test_success = False
+  sim = NetSim(dom.numb_vert, dom.numb_edge, dom.vert2vert_edge,
+               dom.vert2vert, dom.p_vert2vert, node_size, link_size,
+               numb_iter=NUMB_ITER)
+  sim.StepTo()
+  if ((len(sim.GetLog()) != 0) or (len(sim.log) != 0)) :
+    test_success = False
+
+  # -- trace files
+  print PROG_NAME, "--- Writing trace files"
+  tmp_dir = tempfile.mkdtemp()
+  sim.log = log["LOOP"]
+  sim.numb_log = len(log["LOOP"])
+  for file_format in NetSim.LOG_FORMAT :
+    file_name = os.path.join(tmp_dir, "trace." + file_format.lower())
+    sim.WriteLog(file_name, file_format)
+    if (sim.err_code == NetSim.FAILURE) :
+      print PROG_NAME, sim.err_msg
+      return EXIT_FAILURE
+  if (not numpy.array_equal(numpy.load(os.path.join(tmp_dir, "trace.bin")),
+                            log["LOOP"])) :
+    test_success = False
+  p_file = open(os.path.join(tmp_dir, "trace.csv"))
+  line = p_file.read().split("\n")
+  p_file.close()
+  record = log["LOOP"][-1]
+  if ((len(line) != len(log["LOOP"]) + 2)
+      or (line[-2] != "{:d},{:d},{:d},{:d},{:s}".format(record["step"],
+          record["iter"], record["node"], record["neighb"],
+          NetSim.LOG_NAME[record["event"]]))) :
+    test_success = False
+  shutil.rmtree(tmp_dir)
+
+  # -- end time measurement
+
+  # cpu time
+  cpu_etime = time.clock()
+
+  # wall-clock time
+  wclock_etime = time.time()
+
+  # ----------------------------------------------------------------------------
+  # -- OUTPUT
+  # ----------------------------------------------------------------------------
+
+  # -- print result
+  if (test_success) :
+    print PROG_NAME, "*** Result: SUCCESS"
+  else :
+    print PROG_NAME, "*** Result: FAILURE"
+
+  # -- print time measurement
+  print PROG_NAME, "*** CPU: {:.3f} sec.".format(cpu_etime - cpu_btime)
+  print PROG_NAME,\
+        "*** Wall-clock: {:.3f} sec.".format(wclock_etime - wclock_btime)
+
+
+  return EXIT_SUCCESS
+
+# END def main ( argc, argv ) :
+# ------------------------------------------------------------------------------
+
+if __name__ == "__main__" :
+  main(sys.argv)
@@ -0,0 +1,397 @@
+# -*- coding: utf-8 -*-
+
+##
+# @author Pr Magoules HPC Research Group, CentraleSupelec, France
+# @date 2026-10-17, 2026-10-17
+# @version 1.0
+#
+# @class AviWriter
+#
+
+# -- Standard modules
+import os
+import struct
+
+##
+# @brief Writes JPEG frames to Motion-JPEG AVI files, without any external
+#        dependency.
+#
+class AviWriter ( object ) :
+
+  # ----------------------------------------------------------------------------
+  # -- CLASS ATTRIBUTES
+  # ----------------------------------------------------------------------------
+
+  # Error status
+  SUCCESS = 0
+  FAILURE = 1
+
+  # Largest size of an AVI file (AVI 1.0: 32-bit sizes, 1 GiB for the
+  # players); a video is split into several files beyond
+  AVI_MAX_SIZE = 1 << 30
+
+  # Size of the headers, up to the first frame
+  HEADER_SIZE = 224
+
+  # Index flag of a frame with data (not a repeat of the previous frame)
+  AVIIF_KEYFRAME = 0x10
+
+  # Class description
+  CLASS_NAME = "AviWriter"
+  CLASS_AUTHOR = "Pr Magoules HPC Research Group, CentraleSupelec, France"
+  METHODS = """
+  __init__ ( self )
+
+  Open (
+        self,
+        file_name,
+        width,
+        height,
+        frame_rate = 25.0 )
+  WriteFrame (
+        self,
+        jpg_buf = None )
+  Close ( self )
+
+  OpenPart ( self )
+  ClosePart ( self )
+  BuildHeader (
+        self,
+        numb_frame,
+        movi_size )
+  """
+
+  # ----------------------------------------------------------------------------
+  # -- INITIALIZATION
+  # ----------------------------------------------------------------------------
+
+  def __init__ ( self ) :
+
+    # -- Video
+    self.file_name = ""
+    self.width = 0
+    self.height = 0
+    self.frame_rate = 25.0
+
+    # Largest size of a file (see AVI_MAX_SIZE)
+    self.max_size = AviWriter.AVI_MAX_SIZE
+
+    # -- Current file: handle, number, name, index (offset, size, flags of
+    # each frame), size of the frames, last frame data
+    self.p_file = None
+    self.part = 0
+    self.part_name = ""
+    self.frame_index = []
+    self.movi_size = 0
+    self.last_buf = b""
+
+    # -- Output: files written, number of frames (repeats included), number
+    # of repeated frames
+    self.part_file = []
+    self.numb_frame = 0
+    self.numb_repeat = 0
+
+    # -- Error handling
+
+    # Last error code
+    self.err_code = AviWriter.SUCCESS
+
+    # Last error message
+    self.err_msg = ""
+
+  # END def __init__ ( self ) :
+  # ----------------------------------------------------------------------------
+
+  # ----------------------------------------------------------------------------
+  # -- FILE I/O
+  # ----------------------------------------------------------------------------
+
+  ##
+  # @brief Opens a video.
+  # @param file_name = full name of the file (str)
+  # @param width = frame width (pixels)
+  # @param height = frame height (pixels)
+  # @param frame_rate = frames per second
+  #             [default: 25.0]
+  # @remarks Beyond max_size, the video goes on in file_name with a part
+  #          number before the extension (video.1.avi, video.2.avi, ...).
+  #
+  def Open (
+        self,
+        file_name,
+        width,
+        height,
+        frame_rate = 25.0 ) :
+
+    # -- init
+
+    # error handling
+    self.err_code = AviWriter.SUCCESS
+    self.err_msg = ""
+    err_header = "*** [" + AviWriter.CLASS_NAME + ".Open]"
+
+    # -- check video
+    if (self.p_file is not None) :
+      self.err_code = AviWriter.FAILURE
+      self.err_msg = err_header + " Error: " + self.file_name + " is open"
+      return
+    if ((width <= 0) or (height <= 0) or (frame_rate <= 0)) :
+      self.err_code = AviWriter.FAILURE
+      self.err_msg = (err_header + " Error: invalid frame size or rate "
+                      + str((width, height, frame_rate)))
+      return
+
+    # -- open first file
+    self.file_name = file_name
+    (self.width, self.height) = (int(width), int(height))
+    self.frame_rate = float(frame_rate)
+    self.part = 0
+    self.last_buf = b""
+    self.part_file = []
+    self.numb_frame = 0
+    self.numb_repeat = 0
+    self.OpenPart()
+    if (self.err_code == AviWriter.FAILURE) :
+      self.err_msg = err_header + "\n" + self.err_msg
+      return
+
+    return
+
+  # END def Open (
+#        self,
+#        file_name,
+#        width,
+#        height,
+#        frame_rate = 25.0 ) :
+  # ----------------------------------------------------------------------------
+
+  ##
+  # @brief Appends a frame to the video.
+  # @param jpg_buf = JPEG image of the frame (bytes), None to repeat the
+  #             previous frame
+  #             [default: None]
+  # @remarks A repeated frame is an empty chunk, which the players display
+  #          as the previous frame: it costs 24 bytes. At the beginning of a
+  #          file, it is written in full (and still counted as repeated).
+  #
+  def WriteFrame (
+        self,
+        jpg_buf = None ) :
+
+    # -- init
+
+    # error handling
+    self.err_code = AviWriter.SUCCESS
+    self.err_msg = ""
+    err_header = "*** [" + AviWriter.CLASS_NAME + ".WriteFrame]"
+
+    # -- check video
+    if (self.p_file is None) :
+      self.err_code = AviWriter.FAILURE
+      self.err_msg = err_header + " Error: no video open"
+      return
+    if ((jpg_buf is None) and (len(self.last_buf) == 0)) :
+      self.err_code = AviWriter.FAILURE
+      self.err_msg = err_header + " Error: no previous frame to repeat"
+      return
+
+    # -- next file when full (chunk, index entry)
+    buf_size = (0 if (jpg_buf is None) else len(jpg_buf))
+    file_size = (AviWriter.HEADER_SIZE + self.movi_size + 8
+                 + 16 * len(self.frame_index))
+    if ((len(self.frame_index) > 0)
+        and (file_size + 8 + buf_size + (buf_size & 1) + 16
+             > self.max_size)) :
+      self.ClosePart()
+      if (self.err_code == AviWriter.SUCCESS) :
+        self.part += 1
+        self.OpenPart()
+      if (self.err_code == AviWriter.FAILURE) :
+        self.err_msg = err_header + "\n" + self.err_msg
+        return
+
+    # -- first frame of a file: no previous frame, repeat in full
+    flag_repeat = (jpg_buf is None)
+    if (flag_repeat and (len(self.frame_index) == 0)) :
+      jpg_buf = self.last_buf
+
+    # -- write chunk
+    if (jpg_buf is None) :
+      chunk = b"00dc" + struct.pack("<I", 0)
+      frame_index = (self.movi_size + 4, 0, 0)
+    else :
+      chunk = (b"00dc" + struct.pack("<I", len(jpg_buf)) + jpg_buf
+               + b"\0" * (len(jpg_buf) & 1))
+      frame_index = (self.movi_size + 4, len(jpg_buf),
+                     AviWriter.AVIIF_KEYFRAME)
+    try :
+      self.p_file.write(chunk)
+    except (IOError, OSError) :
+      self.err_code = AviWriter.FAILURE
+      self.err_msg = (err_header + " Error: cannot write to "
+                      + self.part_name)
+      return
+    self.frame_index.append(frame_index)
+    self.movi_size += len(chunk)
+    self.numb_frame += 1
+    if (flag_repeat) :
+      self.numb_repeat += 1
+    else :
+      self.last_buf = jpg_buf
+
+    return
+
+  # END def WriteFrame (
+#        self,
+#        jpg_buf = None ) :
+  # ----------------------------------------------------------------------------
+
+  ##
+  # @brief Closes the video.
+  #
+  def Close ( self ) :
+
+    # -- init
+
+    # error handling
+    self.err_code = AviWriter.SUCCESS
+    self.err_msg = ""
+    err_header = "*** [" + AviWriter.CLASS_NAME + ".Close]"
+
+    # -- close current file
+    if (self.p_file is not None) :
+      self.ClosePart()
+      if (self.err_code == AviWriter.FAILURE) :
+        self.err_msg = err_header + "\n" + self.err_msg
+        return
+
+    return
+
+  # END def Close ( self ) :
+  # ----------------------------------------------------------------------------
+
+  ##
+  # @brief Opens the file of the current part of the video, with blank
+  #        headers (see ClosePart).
+  #
+  def OpenPart ( self ) :
+
+    # -- init
+
+    # error handling
+    self.err_code = AviWriter.SUCCESS
+    self.err_msg = ""
+    err_header = "*** [" + AviWriter.CLASS_NAME + ".OpenPart]"
+
+    # -- file name
+    self.part_name = self.file_name
+    if (self.part > 0) :
+      (root, ext) = os.path.splitext(self.file_name)
+      self.part_name = root + "." + str(self.part) + ext
+
+    # -- open file
+    try :
+      self.p_file = open(self.part_name, "wb")
+      self.p_file.write(self.BuildHeader(0, 0))
+    except (IOError, OSError) :
+      self.p_file = None
+      self.err_code = AviWriter.FAILURE
+      self.err_msg = err_header + " Error: cannot open " + self.part_name
+      return
+    self.frame_index = []
+    self.movi_size = 0
+
+    return
+
+  # END def OpenPart ( self ) :
+  # ----------------------------------------------------------------------------
+
+  ##
+  # @brief Writes the index of the current file and its final headers, then
+  #        closes it.
+  #
+  def ClosePart ( self ) :
+
+    # -- init
+
+    # error handling
+    self.err_code = AviWriter.SUCCESS
+    self.err_msg = ""
+    err_header = "*** [" + AviWriter.CLASS_NAME + ".ClosePart]"
+
+    # -- index
+    idx_buf = b"".join([b"00dc" + struct.pack("<3I", flags, offset, size)
+                        for (offset, size, flags) in self.frame_index])
+
+    # -- write index, headers
+    try :
+      self.p_file.write(b"idx1" + struct.pack("<I", len(idx_buf)) + idx_buf)
+      self.p_file.seek(0)
+      self.p_file.write(self.BuildHeader(len(self.frame_index),
+                                         self.movi_size))
+    except (IOError, OSError) :
+      self.err_code = AviWriter.FAILURE
+      self.err_msg = err_header + " Error: cannot write to " + self.part_name
+    finally :
+      try :
+        self.p_file.close()
+      except (IOError, OSError) :
+        self.err_code = AviWriter.FAILURE
+        self.err_msg = err_header + " Error: cannot write to " + self.part_name
+    self.p_file = None
+    self.part_file.append(self.part_name)
+
+    return
+
+  # END def ClosePart ( self ) :
+  # ----------------------------------------------------------------------------
+
+  ##
+  # @brief Builds the headers of a file (RIFF, AVI main header, stream
+  #        header and format, start of the frame list).
+  # @param numb_frame = number of frames of the file
+  # @param movi_size = size of the frames (chunks)
+  # @return headers (bytes of size HEADER_SIZE)
+  #
+  def BuildHeader (
+        self,
+        numb_frame,
+        movi_size ) :
+
+    # frame rate (rate / scale), largest frame
+    scale = 1000
+    rate = int(round(self.frame_rate * scale))
+    max_buf = max([size for (offset, size, flags) in self.frame_index]
+                  + [0])
+
+    # main header
+    avih = struct.pack("<14I", int(round(1e6 / self.frame_rate)),
+                       int(max_buf * self.frame_rate), 0, 0x10, numb_frame,
+                       0, 1, max_buf, self.width, self.height, 0, 0, 0, 0)
+
+    # stream header and format (Motion-JPEG, 24 bits)
+    strh = struct.pack("<4s4sIHHIIIIIIIIhhhh", b"vids", b"MJPG", 0, 0, 0, 0,
+                       scale, rate, 0, numb_frame, max_buf, 0xFFFFFFFF, 0,
+                       0, 0, self.width, self.height)
+    strf = struct.pack("<IiiHH4sIiiII", 40, self.width, self.height, 1, 24,
+                       b"MJPG", 3 * self.width * self.height, 0, 0, 0, 0)
+    strl = (b"strl" + b"strh" + struct.pack("<I", len(strh)) + strh
+            + b"strf" + struct.pack("<I", len(strf)) + strf)
+    hdrl = (b"hdrl" + b"avih" + struct.pack("<I", len(avih)) + avih
+            + b"LIST" + struct.pack("<I", len(strl)) + strl)
+
+    # file
+    riff_size = (AviWriter.HEADER_SIZE - 8 + movi_size + 8
+                 + 16 * numb_frame)
+    return (b"RIFF" + struct.pack("<I", riff_size) + b"AVI "
+            + b"LIST" + struct.pack("<I", len(hdrl)) + hdrl
+            + b"LIST" + struct.pack("<I", 4 + movi_size) + b"movi")
+
+  # END def BuildHeader (
+#        self,
+#        numb_frame,
+#        movi_size ) :
+  # ----------------------------------------------------------------------------
+
+# END class AviWriter ( object ) :
+# ------------------------------------------------------------------------------
@@ -12,10 +12,19 @@
 # @class Graph
 #
 
+# -- Standard modules
+import os
+import mmap
+import glob
+import ctypes
+import hashlib
+import multiprocessing
+
 # -- Third-party modules
 import numpy
-import scipy.sparse
-import Queue
+
+# -- MRG modules
+from indexdtype import IndexDtype, AsIndex
 
 ##
 # @brief A set of graph algorithms and basic operations.
@@ -24,6 +33,7 @@ import Queue
 # - File Input (DIMACS)
 # - Line graph
 # - Coloring (Welsh-Powell)
+# - Lazy derived structures (Require)
 #
 class Graph ( object ) :
 
@@ -49,21 +59,118 @@ class Graph ( object ) :
   ReadFromFileDimacs (
         self,
         file_name,
-        file_type = "ASCII" )
+        file_type = "ASCII",
+        read_mode = "MMAP" )
   ReadFromFileDimacsAscii (
         self,
         file_name )
+  ReadFromFileDimacsAsciiMmap (
+        self,
+        file_name,
+        chunk_size = MMAP_CHUNK_SIZE )
 
-  BuildEdge2Edge ( self )
+  BuildEdge2Edge (
+        self,
+        chunk_size = LINE_GRAPH_CHUNK_SIZE )
 
-  BuildVertDegree ( self )
+  BuildVertDegree (
+        self,
+        edge_weight = None )
   ColorVertByWelshPowell ( self )
-
+  ColorVertBySpeculation (
+        self,
+        numb_proc = None )
+  CheckVertColoring ( self )
+
+  TransposeCsr (
+        numb_row,
+        numb_col,
+        row2col,
+        p_row2col )
   BuildVert2Edge ( self )
   SortVert2EdgeByColor ( self )
   BuildVert2Vert ( self )
+
+  Require (
+        self,
+        name )
+  RequireInputs (
+        self,
+        name )
+  UnpinInputs (
+        self,
+        name )
+  Pin (
+        self,
+        name )
+  Unpin (
+        self,
+        name )
+  IsAvailable (
+        self,
+        name )
+  IsUpToDate (
+        self,
+        name )
+  Touch (
+        self,
+        name )
+  Release (
+        self,
+        name )
+  ReleaseToBudget ( self )
+  GetStructStamp (
+        self,
+        name )
+  GetStructSize (
+        self,
+        name )
+
+  GetStructHash (
+        self,
+        name )
+  LoadStructFromCache (
+        self,
+        name )
+  SaveStructToCache (
+        self,
+        name )
+  ReleaseCacheToSize ( self )
   """
 
+  # File I/O
+  MMAP_CHUNK_SIZE = 1 << 18
+
+  # Line graph
+  LINE_GRAPH_CHUNK_SIZE = 1 << 20
+
+  # Parallel coloring: fewer vertices per process are colored serially
+  SPECULATION_MIN_SIZE = 1 << 10
+
+  # Derived structures: name -> (inputs, build steps, attributes)
+  # A build step (method, input) is skipped when its input is empty.
+  DERIVED = {
+    "edge2edge" : (("edge2vert",),
+                   (("BuildEdge2Edge", None),),
+                   ("edge2edge", "p_edge2edge")),
+    "vert2edge" : (("edge2vert", "edge_color"),
+                   (("BuildVert2Edge", None),
+                    ("SortVert2EdgeByColor", "edge_color")),
+                   ("vert2edge", "p_vert2edge")),
+    "vert2vert" : (("vert2edge",),
+                   (("BuildVert2Vert", None),),
+                   ("vert2vert", "p_vert2vert", "vert2vert_edge")),
+    "vert_degree" : (("vert2vert",),
+                     (("BuildVertDegree", None),),
+                     ("vert_degree",)),
+    "vert_color" : (("vert2vert", "vert_degree"),
+                    (("ColorVertByWelshPowell", None),),
+                    ("vert_color", "numb_color"))}
+
+  # Disk cache: format version (part of each key), default size cap in bytes
+  CACHE_VERSION = 1
+  CACHE_SIZE_MAX = 1 << 32
+
   # ----------------------------------------------------------------------------
   # -- INITIALIZATION
   # ----------------------------------------------------------------------------
@@ -108,9 +215,15 @@ class Graph ( object ) :
     self.vert2vert = numpy.array([])
     self.p_vert2vert = numpy.array([0])
 
+    # Edge of each entry of vert2vert
+    self.vert2vert_edge = numpy.array([])
+
     # Number of colors
     self.numb_color = 0
 
+    # Number of rounds of the parallel coloring
+    self.numb_round = 0
+
     # Color of each vertex
     self.vert_color = numpy.array([])
 
@@ -123,6 +236,34 @@ class Graph ( object ) :
     self.vert2edge = numpy.array([])
     self.p_vert2edge = numpy.array([0])
 
+    # -- Derived structures
+
+    # Memory budget of the derived structures in bytes (None: no budget)
+    self.mem_budget = None
+
+    # Version of each structure, changed by each new build or Touch
+    self.struct_version = {}
+
+    # Stamps of the inputs of each derived structure at its last build
+    self.struct_input = {}
+
+    # Identity of each derived structure built by Require (None if released)
+    self.struct_id = {}
+
+    # Last access of each derived structure (LRU), number of pins of the
+    # structures being built and of their inputs (never released)
+    self.struct_clock = 0
+    self.struct_access = {}
+    self.struct_pinned = {}
+
+    # Disk cache directory of the derived structures (None: no cache), size
+    # cap in bytes
+    self.cache_dir = None
+    self.cache_size_max = Graph.CACHE_SIZE_MAX
+
+    # Content hash of each input: name -> (data, version, hash)
+    self.struct_hash = {}
+
     # -- Error handling
 
     # Last error code
@@ -148,11 +289,16 @@ class Graph ( object ) :
   # @param file_name = full name of the file (str)
   # @param file_type = numerical data format ("ASCII", "BINARY")
   #             [default: "ASCII"]
+  # @param read_mode = parsing strategy for ASCII files ("MMAP", "LINE")
+  #             [default: "MMAP"]
+  # @remarks "MMAP" parses the memory-mapped file by vectorized chunks,
+  #          "LINE" parses the file line by line.
   #
   def ReadFromFileDimacs (
         self,
         file_name,
-        file_type = "ASCII" ) :
+        file_type = "ASCII",
+        read_mode = "MMAP" ) :
 
     # -- init
 
@@ -162,12 +308,18 @@ class Graph ( object ) :
     err_header = "*** [" + Graph.CLASS_NAME + ".ReadFromFileDimacs]"
 
     # -- read dataset
-    if (file_type == "ASCII") :
+    if ((file_type == "ASCII") and (read_mode == "LINE")) :
 
       self.ReadFromFileDimacsAscii(file_name)
       if (self.err_code == Graph.FAILURE) :
         self.err_msg = err_header + "\n" + self.err_msg
 
+    elif (file_type == "ASCII") :
+
+      self.ReadFromFileDimacsAsciiMmap(file_name)
+      if (self.err_code == Graph.FAILURE) :
+        self.err_msg = err_header + "\n" + self.err_msg
+
     else :
       self.err_code = Graph.FAILURE
       self.err_msg = err_header + " Error: " + file_type + " file not supported"
@@ -178,7 +330,8 @@ class Graph ( object ) :
   # END def ReadFromFileDimacs (
 #        self,
 #        file_name,
-#        file_type = "ASCII" ) :
+#        file_type = "ASCII",
+#        read_mode = "MMAP" ) :
   # ----------------------------------------------------------------------------
 
   ##
@@ -263,8 +416,8 @@ class Graph ( object ) :
     # -- convert to numpy.ndarray
     # [DONE] 2 ligne
 
-    self.edge2vert = numpy.array(self.edge2vert)
-    self.p_edge2vert = numpy.array(self.p_edge2vert)    
+    self.edge2vert = AsIndex(self.edge2vert, self.numb_vert)
+    self.p_edge2vert = AsIndex(self.p_edge2vert, len(self.edge2vert))
     
     
     # -- update number of edges
@@ -281,23 +434,171 @@ class Graph ( object ) :
 #        file_name ) :
   # ----------------------------------------------------------------------------
 
+  ##
+  # @brief Reads graph dataset from a DIMACS edge problem ASCII file, parsing
+  #        the memory-mapped file by vectorized chunks.
+  # @param file_name = full name of the file (str)
+  # @param chunk_size = number of bytes parsed at once
+  #             [default: Graph.MMAP_CHUNK_SIZE]
+  # @remarks edge2vert (int32) is allocated once from the problem line, so
+  #          the peak memory is the size of edge2vert plus about 12 times
+  #          chunk_size bytes of parsing buffers.
+  #
+  def ReadFromFileDimacsAsciiMmap (
+        self,
+        file_name,
+        chunk_size = MMAP_CHUNK_SIZE ) :
+
+    # -- init
+
+    # error handling
+    self.err_code = Graph.SUCCESS
+    self.err_msg = ""
+    err_header = "*** [" + Graph.CLASS_NAME + ".ReadFromFileDimacsAsciiMmap]"
+
+    # output
+    self.numb_vert = 0
+    self.numb_edge = 0
+    self.edge2vert = numpy.array([])
+    self.p_edge2vert = numpy.array([0])
+
+    # -- open file
+    try :
+      p_file = open(file_name, "rb")
+      file_size = os.fstat(p_file.fileno()).st_size
+      p_map = mmap.mmap(p_file.fileno(), 0, access=mmap.ACCESS_READ)
+    except :
+      self.err_code = Graph.FAILURE
+      self.err_msg = err_header + " Error: cannot open " + file_name
+      return
+
+    # -- read problem line (p edge numb_vert numb_edge)
+    buf = p_map.readline()
+    while ((buf != b"") and (buf[:1] != b"p")) :
+      buf = p_map.readline()
+    buf = buf.split()
+    if (len(buf) < 4) :
+      p_map.close()
+      p_file.close()
+      self.err_code = Graph.FAILURE
+      self.err_msg = err_header + " Error: problem line not found"
+      return
+    self.numb_vert = int(buf[2])
+    numb_edge = int(buf[3])
+
+    # -- read edge descriptor lines (e vert1 vert2) by chunks
+    self.edge2vert = numpy.empty(2 * numb_edge, dtype=numpy.int32)
+    file_data = numpy.frombuffer(p_map, dtype=numpy.uint8)
+    numb_val = 0
+    chunk_begin = p_map.tell()
+    while (chunk_begin < file_size) :
+
+      # end chunk on a line break
+      chunk_end = min(chunk_begin + chunk_size, file_size)
+      if (chunk_end < file_size) :
+        buf = p_map.rfind(b"\n", chunk_begin, chunk_end)
+        if (buf < 0) :
+          buf = p_map.find(b"\n", chunk_end)
+        if (buf >= 0) :
+          chunk_end = buf + 1
+        else :
+          chunk_end = file_size
+      chunk = file_data[chunk_begin:chunk_end]
+      chunk_begin = chunk_end
+
+      # find digits of edge lines only
+      is_digit = (chunk >= ord("0")) & (chunk <= ord("9"))
+      line_begin = numpy.flatnonzero(chunk == ord("\n")) + 1
+      line_begin = numpy.concatenate(([0], line_begin[:-1]
+                                      if (chunk[-1] == ord("\n"))
+                                      else line_begin))
+      is_edge_line = (chunk[line_begin] == ord("e"))
+      if (not numpy.all(is_edge_line)) :
+        line_size = numpy.diff(numpy.append(line_begin, len(chunk)))
+        is_digit &= numpy.repeat(is_edge_line, line_size)
+
+      # find numbers
+      buf = numpy.zeros(len(chunk) + 1, dtype=numpy.int8)
+      buf[1:] = is_digit
+      buf = numpy.diff(numpy.append(buf, numpy.int8(0)))
+      numb_begin = numpy.flatnonzero(buf == 1)
+      numb_size = numpy.flatnonzero(buf == -1) - numb_begin
+      del is_digit, buf
+
+      # convert digits to values, one digit rank at a time
+      val = numpy.zeros(len(numb_begin), dtype=numpy.int64)
+      for k in range(numb_size.max() if (len(numb_size) > 0) else 0) :
+        buf = numpy.flatnonzero(numb_size > k)
+        val[buf] = 10 * val[buf] + (chunk[numb_begin[buf] + k] - ord("0"))
+
+      # store values ("-1" to start indexing at 0)
+      if (numb_val + len(val) > len(self.edge2vert)) :
+        buf = numpy.empty(max(2 * len(self.edge2vert), numb_val + len(val)),
+                          dtype=numpy.int32)
+        buf[:numb_val] = self.edge2vert[:numb_val]
+        self.edge2vert = buf
+      self.edge2vert[numb_val:numb_val + len(val)] = val - 1
+      numb_val += len(val)
+
+    # -- close file
+    del file_data, chunk
+    p_map.close()
+    p_file.close()
+
+    # -- check edge descriptors
+    if (numb_val % 2 != 0) :
+      self.numb_vert = 0
+      self.edge2vert = numpy.array([])
+      self.err_code = Graph.FAILURE
+      self.err_msg = err_header + " Error: odd number of edge vertices"
+      return
+
+    # -- update number of edges
+    self.numb_edge = numb_val // 2
+    if (numb_val < len(self.edge2vert)) :
+      self.edge2vert = self.edge2vert[:numb_val].copy()
+
+    # -- build edge indices (two vertices per edge)
+    self.p_edge2vert = numpy.arange(0, numb_val + 1, 2,
+                                    dtype=IndexDtype(numb_val))
+
+    return
+
+  # END def ReadFromFileDimacsAsciiMmap (
+#        self,
+#        file_name,
+#        chunk_size = MMAP_CHUNK_SIZE ) :
+  # ----------------------------------------------------------------------------
+
   # ----------------------------------------------------------------------------
   # -- LINE GRAPH
   # ----------------------------------------------------------------------------
 
   ##
   # @brief Builds edge2edge and p_edge2edge.
+  # @param chunk_size = maximum number of (edge, edge) candidate pairs
+  #             processed at once
+  #             [default: LINE_GRAPH_CHUNK_SIZE]
+  # @remarks Edges may have any number of vertices (hyperedges). The adjacent
+  #          edges of each edge are gathered from the incident edges of its
+  #          vertices (vertex buckets), then sorted and de-duplicated, by
+  #          blocks of consecutive edges of at most chunk_size candidate
+  #          pairs. Apart from the output, the memory used is O(numb_edge +
+  #          chunk_size). edge2edge is stored as int32 (int64 beyond 2^31
+  #          edges), sorted by increasing index in each row. edge2edge grows
+  #          in place, by reallocation.
   #
-  def BuildEdge2Edge ( self ) :
+  def BuildEdge2Edge (
+        self,
+        chunk_size = LINE_GRAPH_CHUNK_SIZE ) :
 
     # -- init
 
     # error handling
-    # [DONE] 3 lignes
     self.err_code = Graph.SUCCESS
     self.err_msg = ""
     err_header = "*** [" + Graph.CLASS_NAME + ".BuildEdge2Edge]"
-    
+
     # output
     self.edge2edge = numpy.array([])
     self.p_edge2edge = numpy.array([0])
@@ -307,42 +608,83 @@ class Graph ( object ) :
       self.err_code = Graph.FAILURE
       self.err_msg = err_header + " Error: edge2vert is required"
       return
-    
-    # -- build transpose of incidence matrix
-    # [DONE] Environ 2 lignes
-    # (voir les fonctions numpy.ones et scipy.sparse.csr_matrix)
-    incidence_matrix_T = scipy.sparse.csr_matrix((numpy.ones(self.numb_edge*2),
-                                                 self.edge2vert, 
-                                                 self.p_edge2vert))
-    
-                                    
-    # numpy.ones generates "1" for incidence matrix, two for each edges
-                                                 
-    
-    
-    # -- compute incidence matrix
-    # [DONE] 1 ligne
-    incidence_matrix = incidence_matrix_T.transpose()
-    
-    # -- build identity matrix
-    # [DONE] 1 ligne
-    # (voir liste des fonctions de scipy.sparse)
-    identity_matrix = scipy.sparse.identity(self.numb_edge)
-
-    # -- compute line graph adjacency matrix
-    # [DONE] 1 ligne
-    edge_incidence_matrix = (incidence_matrix_T.dot(incidence_matrix) - 
-                            2 * identity_matrix)
 
-    # -- extract edge2edge and p_edge2edge
-    # [DONE] 2 lignes
-    self.edge2edge = edge_incidence_matrix.indices
-    self.p_edge2edge = edge_incidence_matrix.indptr
-    
+    # -- index data type
+    edge_dtype = IndexDtype(self.numb_edge)
+
+    # -- build incident edges of each vertex, by increasing index (buckets)
+    p_edge2vert = numpy.asarray(self.p_edge2vert[0:self.numb_edge + 1],
+                                dtype=numpy.int64)
+    edge2vert = self.edge2vert[0:p_edge2vert[self.numb_edge]]
+    entry2edge = numpy.repeat(numpy.arange(self.numb_edge, dtype=edge_dtype),
+                              numpy.diff(p_edge2vert))
+    bucket = entry2edge[numpy.argsort(edge2vert, kind="mergesort")]
+    bucket_size = numpy.bincount(edge2vert, minlength=self.numb_vert)
+    p_bucket = numpy.zeros(len(bucket_size) + 1, dtype=numpy.int64)
+    numpy.cumsum(bucket_size, out=p_bucket[1:])
+
+    # -- number of candidate pairs up to each edge (with duplicates)
+    entry_size = bucket_size[edge2vert]
+    p_pair = numpy.zeros(len(edge2vert) + 1, dtype=numpy.int64)
+    numpy.cumsum(entry_size, out=p_pair[1:])
+    p_pair = p_pair[p_edge2vert]
+
+    # -- build by blocks of edges
+    self.p_edge2edge = numpy.zeros(self.numb_edge + 1, dtype=numpy.int64)
+    self.edge2edge = numpy.zeros(0, dtype=edge_dtype)
+    numb_entry = 0
+    first_edge = 0
+    while (first_edge < self.numb_edge) :
+
+      # last edge of the block (excluded)
+      last_edge = numpy.searchsorted(p_pair, p_pair[first_edge] + chunk_size,
+                                     "right") - 1
+      last_edge = min(max(last_edge, first_edge + 1), self.numb_edge)
+
+      # candidate pairs: buckets of the vertices of each edge
+      (first_entry, last_entry) = p_edge2vert[[first_edge, last_edge]]
+      pair_size = entry_size[first_entry:last_entry]
+      pair_start = numpy.repeat(p_bucket[edge2vert[first_entry:last_entry]]
+                                - (p_pair[first_edge]
+                                   + numpy.cumsum(pair_size) - pair_size),
+                                pair_size)
+      pair_start += numpy.arange(p_pair[first_edge], p_pair[last_edge])
+      pair_key = numpy.repeat(entry2edge[first_entry:last_entry].astype(
+                                numpy.int64) - first_edge, pair_size)
+      pair_key *= self.numb_edge
+      pair_key += bucket[pair_start]
+      pair_start = None
+
+      # sort and de-duplicate pairs, remove self-loops
+      pair_key = numpy.unique(pair_key)
+      pair_edge = pair_key // self.numb_edge
+      pair_key -= pair_edge * self.numb_edge
+      is_adj = (pair_key != pair_edge + first_edge)
+      pair_key = pair_key[is_adj]
+
+      # append adjacent edges
+      numpy.cumsum(numpy.bincount(pair_edge[is_adj],
+                                  minlength=last_edge - first_edge),
+                   out=self.p_edge2edge[first_edge + 1:last_edge + 1])
+      self.p_edge2edge[first_edge + 1:last_edge + 1] += numb_entry
+      if (numb_entry + len(pair_key) > len(self.edge2edge)) :
+        self.edge2edge.resize(max(numb_entry + len(pair_key),
+                                  len(self.edge2edge) * 5 // 4),
+                              refcheck=False)
+      self.edge2edge[numb_entry:numb_entry + len(pair_key)] = pair_key
+      numb_entry += len(pair_key)
+
+      first_edge = last_edge
+
+    # -- trim
+    self.edge2edge.resize(numb_entry, refcheck=False)
+    self.p_edge2edge = AsIndex(self.p_edge2edge, numb_entry)
 
     return
 
-  # END def BuildEdge2Edge ( self ) :
+  # END def BuildEdge2Edge (
+#        self,
+#        chunk_size = LINE_GRAPH_CHUNK_SIZE ) :
   # ----------------------------------------------------------------------------
 
   # ----------------------------------------------------------------------------
@@ -351,159 +693,358 @@ class Graph ( object ) :
 
   ##
   # @brief Builds vert_degree.
+  # @param edge_weight = weight of each edge, e.g. NetSim link_size
+  #             (1D numpy.ndarray) [default: None]
+  # @remarks Without weights, the degree is taken from p_vert2vert or
+  #          p_vert2edge (numpy.diff), or counted from edge2vert
+  #          (numpy.bincount). With weights, it is the sum of the weights of
+  #          the incident edges, from vert2edge or edge2vert.
   #
-  def BuildVertDegree ( self ) :
+  def BuildVertDegree (
+        self,
+        edge_weight = None ) :
 
     # -- init
-    self.vert_degree = numpy.zeros(self.numb_vert, dtype=numpy.int)
-    # [DONE]
-    err_header = ""
+
+    # error handling
+    self.err_code = Graph.SUCCESS
+    self.err_msg = ""
+    err_header = "*** [" + Graph.CLASS_NAME + ".BuildVertDegree]"
+
+    # output
+    self.vert_degree = numpy.zeros(self.numb_vert, dtype=numpy.int32)
+
     # -- check dependencies
     if ((len(self.edge2vert) == 0)
         and (len(self.vert2edge) == 0)
-        and (len(self.vert2vert) == 0)) :
+        and ((len(self.vert2vert) == 0) or (edge_weight is not None))) :
       self.err_code = Graph.FAILURE
       self.err_msg = err_header + " Error: either edge2vert or vert2edge"
-      self.err_msg += " or vert2vert is required"
+      if (edge_weight is None) :
+        self.err_msg += " or vert2vert"
+      self.err_msg += " is required"
       return
 
     # -- build vert_degree
 
     # either build from vert2vert
-    if (len(self.vert2vert) != 0) :
-        
-      # [DONE] Environ 3 lignes
-        for i in range(self.numb_vert):
-            self.vert_degree[i] = (self.p_vert2vert[i+1] - self.p_vert2vert[i])
-            
+    if ((len(self.vert2vert) != 0) and (edge_weight is None)) :
+      self.vert_degree = AsIndex(numpy.diff(
+                           self.p_vert2vert[0:self.numb_vert + 1]),
+                           len(self.vert2vert))
+
     # or build from vert2edge
     elif (len(self.vert2edge) != 0) :
-        
-      # [DONE] Environ 3 lignes
-        for i in range(self.numb_vert):
-            self.vert_degree[i] = (self.p_vert2edge[i+1] - self.p_vert2edge[i])
-            
+      vert_size = numpy.diff(self.p_vert2edge[0:self.numb_vert + 1])
+      if (edge_weight is None) :
+        self.vert_degree = AsIndex(vert_size, len(self.vert2edge))
+      else :
+        self.vert_degree = numpy.bincount(
+                             numpy.repeat(numpy.arange(self.numb_vert),
+                                          vert_size),
+                             weights=edge_weight[
+                               self.vert2edge[0:self.p_vert2edge[-1]]],
+                             minlength=self.numb_vert)
+
     # or build from edge2vert
     else :
-    
-      # [DONE] Environ 3 lignes
-        for x in self.edge2vert:
-            self.vert_degree[x] += 1
-            
-    
+      edge2vert = self.edge2vert[0:self.p_edge2vert[self.numb_edge]]
+      if (edge_weight is None) :
+        self.vert_degree = AsIndex(numpy.bincount(edge2vert,
+                                     minlength=self.numb_vert), len(edge2vert))
+      else :
+        self.vert_degree = numpy.bincount(edge2vert,
+                             weights=numpy.repeat(edge_weight[0:self.numb_edge],
+                               numpy.diff(self.p_edge2vert[0:self.numb_edge + 1])),
+                             minlength=self.numb_vert)
+
     return
 
-  # END def BuildVertDegree ( self ) :
+  # END def BuildVertDegree (
+#        self,
+#        edge_weight = None ) :
   # ----------------------------------------------------------------------------
 
   ##
   # @brief Constructs a proper vertex coloring using Welsh-Powell algorithm.
+  # @remarks Vertices are visited by decreasing degree, ties by increasing
+  #          index, and each one gets the smallest color not used by its
+  #          already colored neighbors. This first-fit greedy coloring is the
+  #          one built color after color by Welsh-Powell algorithm. With
+  #          per-vertex forbidden-color marks, the cost is
+  #          O(numb_vert log(numb_vert) + numb_edge).
   #
   def ColorVertByWelshPowell ( self ) :
 
-    # [DONE]
-
     # -- init
 
     # error handling
     self.err_code = Graph.SUCCESS
     self.err_msg = ""
     err_header = "*** [" + Graph.CLASS_NAME + ".ColorVertByWelshPowell]"
-    
-    #output
+
+    # output
     self.numb_color = 0
-    self.vert_color = -numpy.ones(self.numb_vert, dtype=numpy.int)
+    self.vert_color = -numpy.ones(self.numb_vert,
+                                  dtype=IndexDtype(self.numb_vert))
     # can't use zeros because '0' is a color, '-1' means colorless
-    
-    # -- check dependencies
-    if (len(self.vert_degree) == 0) :
-        self.BuildVertDegree()
-      
-    if (len(self.vert2vert) == 0) :
-        self.BuildVert2Vert()
-    
-    
-    # -- sort dec vertex by degree 
-    # build an list of the indice of the sorted vertex
-    # we're using a queue data-type for convenience
-    
-    indice_sorted = Queue.Queue(self.numb_vert)
-    vert_sorted = numpy.zeros(self.numb_vert)
-    for i in range(self.numb_vert):
-        degree_max = 0
-        indice_deg_max = -1
-        for j in range(self.numb_vert):
-            if vert_sorted[j] == 0:
-                if self.vert_degree[j] > degree_max:
-                    degree_max = self.vert_degree[j]
-                    indice_deg_max = j
-        indice_sorted.put(indice_deg_max)
-        vert_sorted[indice_deg_max] = 1
-
-
-    # not the best sorting algorithm in term of efficiency, but works anyway
-        
-    # -- coloring
-    while not (indice_sorted.empty()): #run until all vertex colored
-            
-        # color the highest vertex
-        self.vert_color[indice_sorted.get()] = self.numb_color
-    
-        numb_vert_uncolored = indice_sorted.qsize()
-        # color other vertex if there is no conflicts, by highest degree
-        for i in range(numb_vert_uncolored):
-            
-            # extracting the vertex
-            vert = indice_sorted.get()
-            
-            # checking conflicts
-            no_conflicts = True
-            j = 0
-            while ((j < self.vert_degree[vert]) and (no_conflicts)):
-                # for all neigbour vertex, check if they have the same color
-                
-                if (self.vert_color[self.vert2vert[self.p_vert2vert[vert] + j]]
-                      == self.numb_color  ):
-                        
-                        no_conflicts = False
-                j+= 1
-            
-            
-            if no_conflicts:
-                # color the vertex
-                self.vert_color[vert] = self.numb_color
-                
-            
-            else:
-                # put back the vertex in the queue, which stay sorted
-                indice_sorted.put(vert)
-            
-                
-
-        # select a new color (also works as a counter)
-    
-        self.numb_color += 1  
-    
+
+    # -- check dependencies (missing ones are built by Require)
+    if ((len(self.vert_degree) == 0) or (len(self.vert2vert) == 0)) :
+      self.RequireInputs("vert_color")
+      if (self.err_code == Graph.FAILURE) :
+        self.err_msg = err_header + "\n" + self.err_msg
+        return
+      self.UnpinInputs("vert_color")
+
+    # -- sort vertices by decreasing degree (stable)
+    vert_order = numpy.argsort(-self.vert_degree[0:self.numb_vert],
+                               kind="mergesort")
+
+    # -- color vertices
+    # forbidden[c] == vert iff color c is used by a neighbor of vert, the
+    # last mark receives the colorless neighbors
+    p_vert2vert = self.p_vert2vert
+    vert_size = numpy.diff(p_vert2vert[0:self.numb_vert + 1])
+    forbidden = -numpy.ones(vert_size.max() + 2 if (self.numb_vert > 0) else 1,
+                            dtype=int)
+    for vert in vert_order :
+      numb_adj = vert_size[vert]
+      forbidden[self.vert_color[self.vert2vert[p_vert2vert[vert]:
+                                               p_vert2vert[vert + 1]]]] = vert
+      self.vert_color[vert] = numpy.argmin(forbidden[0:numb_adj + 1] == vert)
+
+    self.numb_color = self.vert_color.max() + 1 if (self.numb_vert > 0) else 0
 
     return
 
   # END def ColorVertByWelshPowell ( self ) :
   # ----------------------------------------------------------------------------
 
+  ##
+  # @brief Constructs a proper vertex coloring in parallel by speculation
+  #        (Gebremedhin-Manne).
+  # @param numb_proc = number of worker processes
+  #             [default: None, i.e. number of cores]
+  # @remarks In each round, the vertices to color are dealt to the workers
+  #          in decreasing degree order, and each worker colors its share
+  #          first-fit, reading the colors written meanwhile by the others.
+  #          Adjacent vertices colored alike are then detected, and the one
+  #          with the larger index is colored again in the next round, until
+  #          no conflict remains. vert2vert, p_vert2vert and vert_color are
+  #          shared by the workers through shared memory (one copy of
+  #          vert2vert and p_vert2vert). The number of rounds is stored in
+  #          numb_round.
+  #
+  def ColorVertBySpeculation (
+        self,
+        numb_proc = None ) :
+
+    # -- init
+
+    # error handling
+    self.err_code = Graph.SUCCESS
+    self.err_msg = ""
+    err_header = "*** [" + Graph.CLASS_NAME + ".ColorVertBySpeculation]"
+
+    # output
+    self.numb_color = 0
+    self.numb_round = 0
+    self.vert_color = -numpy.ones(self.numb_vert,
+                                  dtype=IndexDtype(self.numb_vert))
+
+    # -- check dependencies (missing ones are built by Require)
+    if ((len(self.vert_degree) == 0) or (len(self.vert2vert) == 0)) :
+      self.RequireInputs("vert_color")
+      if (self.err_code == Graph.FAILURE) :
+        self.err_msg = err_header + "\n" + self.err_msg
+        return
+      self.UnpinInputs("vert_color")
+    if (self.numb_vert == 0) :
+      return
+    if (numb_proc is None) :
+      numb_proc = multiprocessing.cpu_count()
+
+    # -- share arrays
+    p_vert2vert = self.p_vert2vert[0:self.numb_vert + 1]
+    vert2vert = self.vert2vert[0:p_vert2vert[self.numb_vert]]
+    shared = []
+    for (array, dtype) in [(vert2vert, vert2vert.dtype),
+                           (p_vert2vert, p_vert2vert.dtype),
+                           (None, IndexDtype(self.numb_vert)),
+                           (None, IndexDtype(self.numb_vert))] :
+      array_size = self.numb_vert if (array is None) else len(array)
+      raw_array = multiprocessing.RawArray(
+            ctypes.c_int32 if (numpy.dtype(dtype).itemsize == 4)
+            else ctypes.c_int64, max(array_size, 1))
+      if (array is not None) :
+        numpy.frombuffer(raw_array, dtype=dtype)[0:array_size] = array
+      shared.append((raw_array, numpy.dtype(dtype).str, array_size))
+    # forbidden-color marks of each worker: colors are at most the largest
+    # degree, plus the mark of the colorless neighbors
+    shared.append(int((p_vert2vert[1:] - p_vert2vert[:-1]).max()) + 2)
+    InitColorWorker(*shared)
+    vert_color = color_worker_data["vert_color"]
+    vert_todo = color_worker_data["vert_todo"]
+    vert_color[:] = -1
+
+    # -- vertices to color, by decreasing degree (stable)
+    numb_todo = self.numb_vert
+    vert_todo[:] = numpy.argsort(-self.vert_degree[0:self.numb_vert],
+                                 kind="mergesort")
+
+    # -- color by rounds
+    pool = multiprocessing.Pool(numb_proc, InitColorWorker, shared)
+    while (numb_todo > 0) :
+      self.numb_round += 1
+
+      # color speculatively (in this process if few vertices are left)
+      vert_color[vert_todo[0:numb_todo]] = -1
+      if (numb_todo < Graph.SPECULATION_MIN_SIZE * numb_proc) :
+        ColorVertWorker((0, 1, numb_todo))
+      else :
+        pool.map(ColorVertWorker, [(k, numb_proc, numb_todo)
+                                   for k in range(numb_proc)])
+
+      # detect conflicts, the vertex of larger index loses
+      todo = vert_todo[0:numb_todo]
+      todo_size = p_vert2vert[todo + 1] - p_vert2vert[todo]
+      row = numpy.repeat(todo, todo_size)
+      adj = vert2vert[numpy.repeat(p_vert2vert[todo] - numpy.cumsum(todo_size)
+                                   + todo_size, todo_size)
+                      + numpy.arange(len(row))]
+      is_conflict = (vert_color[row] == vert_color[adj]) & (row > adj)
+      conflict = numpy.unique(row[is_conflict])
+
+      # keep degree order among the vertices to color again
+      conflict = todo[numpy.in1d(todo, conflict)]
+      numb_todo = len(conflict)
+      vert_todo[0:numb_todo] = conflict
+
+    pool.close()
+    pool.join()
+
+    # -- get colors
+    self.vert_color[:] = vert_color
+    self.numb_color = self.vert_color.max() + 1
+
+    return
+
+  # END def ColorVertBySpeculation (
+#        self,
+#        numb_proc = None ) :
+  # ----------------------------------------------------------------------------
+
+  ##
+  # @brief Checks that vert_color is a proper coloring, i.e. every vertex is
+  #        colored and no two adjacent vertices share a color.
+  # @remarks err_code is set to FAILURE if the coloring is not proper.
+  #
+  def CheckVertColoring ( self ) :
+
+    # -- init
+
+    # error handling
+    self.err_code = Graph.SUCCESS
+    self.err_msg = ""
+    err_header = "*** [" + Graph.CLASS_NAME + ".CheckVertColoring]"
+
+    # -- check dependencies (missing ones are built by Require, without
+    # releasing vert_color)
+    if (len(self.vert2vert) == 0) :
+      self.Pin("vert_color")
+      self.Require("vert2vert")
+      self.Unpin("vert_color")
+      if (self.err_code == Graph.FAILURE) :
+        self.err_msg = err_header + "\n" + self.err_msg
+        return
+    if (len(self.vert_color) != self.numb_vert) :
+      self.err_code = Graph.FAILURE
+      self.err_msg = err_header + " Error: vert_color is required"
+      return
+
+    # -- check colors
+    numb_colorless = numpy.count_nonzero(self.vert_color < 0)
+    row = numpy.repeat(numpy.arange(self.numb_vert),
+                       numpy.diff(self.p_vert2vert[0:self.numb_vert + 1]))
+    adj = self.vert2vert[0:len(row)]
+    numb_conflict = numpy.count_nonzero(
+                      (self.vert_color[row] == self.vert_color[adj])
+                      & (row != adj))
+    if ((numb_colorless > 0) or (numb_conflict > 0)) :
+      self.err_code = Graph.FAILURE
+      self.err_msg = err_header + " Error: " + str(numb_colorless)
+      self.err_msg += " colorless vertices, " + str(numb_conflict // 2)
+      self.err_msg += " conflicting edges"
+
+    return
+
+  # END def CheckVertColoring ( self ) :
+  # ----------------------------------------------------------------------------
+
   # ----------------------------------------------------------------------------
   # -- ORDERING
   # ----------------------------------------------------------------------------
 
+  ##
+  # @brief Transposes a CSR relation, e.g. edge2vert into vert2edge or
+  #        elem2node into node2elem.
+  # @param numb_row = number of rows
+  # @param numb_col = number of columns
+  # @param row2col = columns of each row (CSR storage)
+  # @param p_row2col = index of each row in row2col (CSR storage)
+  # @return (col2row, p_col2row) = rows of each column (CSR storage), sorted
+  # @remarks Integer only: p_col2row is counted with numpy.bincount, each
+  #          entry is packed in a 64-bit key (col * numb_row + row), the keys
+  #          are sorted in place and reduced to rows in place. Only two
+  #          arrays are kept: col2row and p_col2row, of index dtype (see
+  #          indexdtype). The peak memory, on top of the input, is 12 bytes
+  #          per entry (key and row of each entry) while the keys are built
+  #          and while they are converted to int32 rows.
+  #
+  @staticmethod
+  def TransposeCsr (
+        numb_row,
+        numb_col,
+        row2col,
+        p_row2col ) :
+
+    row2col = row2col[0:p_row2col[numb_row]]
+
+    # -- count the entries of each column
+    p_col2row = numpy.zeros(numb_col + 1, dtype=IndexDtype(len(row2col)))
+    numpy.cumsum(numpy.bincount(row2col, minlength=numb_col),
+                 out=p_col2row[1:])
+
+    # -- pack (col, row) of each entry
+    col2row = numpy.multiply(row2col, numb_row, dtype=numpy.int64)
+    row_dtype = numpy.int64
+    if (numb_row <= numpy.iinfo(numpy.int32).max) :
+      row_dtype = numpy.int32
+    col2row += numpy.repeat(numpy.arange(numb_row, dtype=row_dtype),
+                            numpy.diff(p_row2col[0:numb_row + 1]))
+
+    # -- sort by column, then by row, and unpack rows
+    col2row.sort()
+    numpy.remainder(col2row, max(numb_row, 1), out=col2row)
+
+    return (AsIndex(col2row, numb_row), p_col2row)
+
+  # END def TransposeCsr (
+#        numb_row,
+#        numb_col,
+#        row2col,
+#        p_row2col ) :
+  # ----------------------------------------------------------------------------
+
   ##
   # @brief Builds vert2edge and p_vert2edge.
   #
   def BuildVert2Edge ( self ) :
 
-    
     # -- init
 
     # error handling
-    # [DONE] 3 lignes
     self.err_code = Graph.SUCCESS
     self.err_msg = ""
     err_header = "*** [" + Graph.CLASS_NAME + ".BuildVert2Edge]"
@@ -517,25 +1058,11 @@ class Graph ( object ) :
       self.err_code = Graph.FAILURE
       self.err_msg = err_header + " Error: edge2vert is required"
       return
-    
-    # -- build transpose of incidence matrix
-    
-    incidence_matrix_T = scipy.sparse.csr_matrix((numpy.ones(self.numb_edge*2),
-                                                 self.edge2vert, 
-                                                 self.p_edge2vert))
-    
-    # numpy.ones generates "1" for incidence matrix, two for each edges
-                                                 
-    incidence_matrix = scipy.sparse.csr_matrix(incidence_matrix_T.transpose())
-    
-    
-    # -- extract vert2vert and p_vert2vert
 
-    self.vert2edge = incidence_matrix.indices
-    self.p_vert2edge = incidence_matrix.indptr
-    
-    
-    
+    # -- build vert2edge and p_vert2edge (transpose of edge2vert)
+    (self.vert2edge, self.p_vert2edge) = Graph.TransposeCsr(self.numb_edge,
+                                           self.numb_vert, self.edge2vert,
+                                           self.p_edge2vert)
 
     return
 
@@ -545,10 +1072,12 @@ class Graph ( object ) :
   ##
   # @brief Sorts list of incident edges of each vertex (vert2edge), according
   #        to edge color.
+  # @remarks All the lists are sorted at once by a stable sort on the
+  #          (vertex, edge color) key, the edges of same color of a vertex
+  #          keep their order. vert2edge is updated in place.
   #
   def SortVert2EdgeByColor ( self ) :
-      
-    # [DONE]
+
     # -- init
 
     # error handling
@@ -564,18 +1093,29 @@ class Graph ( object ) :
       return
     
     
-    if len(self.vert2edge) == 0:
-        self.BuildVert2Edge()
-        
+    if (len(self.vert2edge) == 0) :
+      self.BuildVert2Edge()
+      if (self.err_code == Graph.FAILURE) :
+        return
+
     # -- sorting
-    
-    # choose a vertex
-    for i in range(self.numb_vert):
-        ind_start, ind_end = self.p_vert2edge[i], self.p_vert2edge[i+1]
-        # sort his edges, using edge_color as key
-        self.vert2edge[ind_start : ind_end] = sorted(self.vert2edge[ind_start:ind_end],
-                                                    key=lambda j: self.edge_color[j])
-        
+
+    # key of each entry of vert2edge: vertex * numb_color + edge color
+    # (same order as numpy.lexsort on (edge color, vertex), a single 64-bit
+    # key sorts faster)
+    vert2edge = self.vert2edge[0:self.p_vert2edge[self.numb_vert]]
+    if (len(vert2edge) == 0) :
+      return
+    entry_color = self.edge_color[vert2edge]
+    entry_key = numpy.repeat(numpy.arange(self.numb_vert, dtype=numpy.int64),
+                             numpy.diff(self.p_vert2edge[0:self.numb_vert + 1]))
+    entry_key *= int(entry_color.max()) + 1
+    entry_key += entry_color
+
+    # stable sort (the lists are already grouped by vertex)
+    perm = numpy.argsort(entry_key, kind="mergesort")
+    del entry_key, entry_color
+    vert2edge[:] = vert2edge[perm]
 
     return
 
@@ -583,70 +1123,666 @@ class Graph ( object ) :
   # ----------------------------------------------------------------------------
 
   ##
-  # @brief Builds vert2vert and p_vert2vert
+  # @brief Builds vert2vert and p_vert2vert, and vert2vert_edge.
+  # @remarks vert2vert is built by walking vert2edge: each incident edge of a
+  #          vertex gives its other vertices, in the order of vert2edge (e.g.
+  #          by edge color after SortVert2EdgeByColor). vert2vert_edge holds
+  #          the edge of each entry of vert2vert (NetSim node2link). A vertex
+  #          linked by several edges is listed once per edge.
   #
   def BuildVert2Vert ( self ) :
 
-    # [DONE]
     # -- init
-    
+
     # error handling
     self.err_code = Graph.SUCCESS
     self.err_msg = ""
     err_header = "*** [" + Graph.CLASS_NAME + ".BuildVert2Vert]"
-    
+
     # output
     self.vert2vert = numpy.array([])
     self.p_vert2vert = numpy.array([0])
+    self.vert2vert_edge = numpy.array([])
 
     # -- check dependencies
-    
-     
-    if (len(self.vert_degree) == 0) :
-        self.BuildVertDegree()
-    
-    # use vert2edge instead of edge2vert in case it has been sorted    
-    
-    if len(self.vert2edge) == 0:
-        print('BuildVert2Edge')
-        self.BuildVert2Edge()
-    
-    
-    incidence_matrix = scipy.sparse.csr_matrix((numpy.ones(self.numb_edge*2),
-                                                 self.vert2edge, 
-                                                 self.p_vert2edge))
-    
-    # numpy.ones generates "1" for incidence matrix, two for each edges
-    
-    # -- build incidence matrix
-    incidence_matrix_T = incidence_matrix.transpose()
-    
-    # -- build diagonal vertex degree matrix
-    
-    row = list(range(self.numb_vert))
-    col = row
-    
-    vert_degree_diag_matrix = scipy.sparse.csr_matrix((self.vert_degree, (row,col)))
+    if (len(self.edge2vert) == 0) :
+      self.err_code = Graph.FAILURE
+      self.err_msg = err_header + " Error: edge2vert is required"
+      return
+    if (len(self.vert2edge) == 0) :
+      self.BuildVert2Edge()
+      if (self.err_code == Graph.FAILURE) :
+        self.err_msg = err_header + "\n" + self.err_msg
+        return
+
+    # -- list the vertices of each incident edge of each vertex
+
+    # incident edge and vertex of each entry of vert2edge
+    entry2edge = self.vert2edge[0:self.p_vert2edge[self.numb_vert]]
+    entry2vert = numpy.repeat(numpy.arange(self.numb_vert),
+                   numpy.diff(self.p_vert2edge[0:self.numb_vert + 1]))
+
+    # vertices of the incident edge of each entry
+    entry_size = numpy.diff(self.p_edge2vert[0:self.numb_edge + 1])[entry2edge]
+    p_entry = numpy.zeros(len(entry2edge) + 1, dtype=numpy.intp)
+    numpy.cumsum(entry_size, out=p_entry[1:])
+    cand2vert = numpy.arange(p_entry[-1])
+    cand2vert -= numpy.repeat(p_entry[0:-1] - self.p_edge2vert[entry2edge],
+                              entry_size)
+    cand2vert = self.edge2vert[cand2vert]
+
+    # -- drop the vertex itself
+    cand_vert = numpy.repeat(entry2vert, entry_size)
+    flag_keep = (cand2vert != cand_vert)
+
+    # -- build vert2vert, p_vert2vert and vert2vert_edge
+    self.vert2vert = cand2vert[flag_keep]
+    self.vert2vert_edge = numpy.repeat(entry2edge, entry_size)[flag_keep]
+    self.p_vert2vert = numpy.zeros(self.numb_vert + 1,
+                                   dtype=IndexDtype(len(self.vert2vert)))
+    numpy.cumsum(numpy.bincount(cand_vert[flag_keep],
+                                minlength=self.numb_vert),
+                 out=self.p_vert2vert[1:])
 
-        
-    
+    return
 
-    # -- compute vertex graph adjacency matrix
-    vert_incidence_matrix = (incidence_matrix.dot(incidence_matrix_T) - 
-                            vert_degree_diag_matrix)
-                            
-    
-    # -- extract vert2vert and p_vert2vert
-    self.vert2vert = vert_incidence_matrix.indices
-    self.p_vert2vert = vert_incidence_matrix.indptr
-    
+  # END def BuildVert2Vert ( self ) :
+  # ----------------------------------------------------------------------------
 
-                                                 
+  # ----------------------------------------------------------------------------
+  # -- DERIVED STRUCTURES
+  # ----------------------------------------------------------------------------
+
+  ##
+  # @brief Builds a derived structure (see DERIVED) and its inputs, unless it
+  #        is available and up to date.
+  # @param name = name of the derived structure, e.g. "vert2vert" (str)
+  # @remarks A structure is rebuilt when an input was replaced or touched
+  #          (see Touch) since its last build. A structure set by hand is used
+  #          as is. The least recently used structures are released when the
+  #          memory budget (mem_budget) is exceeded, but neither the
+  #          structure nor its inputs while it is built. If cache_dir is set,
+  #          the structure is loaded from the disk cache when possible, and
+  #          saved there after its build.
+  #
+  def Require (
+        self,
+        name ) :
+
+    # -- init
+
+    # error handling
+    self.err_code = Graph.SUCCESS
+    self.err_msg = ""
+    err_header = "*** [" + Graph.CLASS_NAME + ".Require]"
+
+    # -- check name
+    if (name not in Graph.DERIVED) :
+      self.err_code = Graph.FAILURE
+      self.err_msg = err_header + " Error: unknown derived structure " + name
+      return
+    (inputs, steps, attrs) = Graph.DERIVED[name]
+
+    # -- mark access
+    self.struct_clock += 1
+    self.struct_access[name] = self.struct_clock
+    self.Pin(name)
+    if (self.IsAvailable(name)) :
+      self.ReleaseToBudget()
+      self.Unpin(name)
+      return
+
+    # -- build inputs, pinned until the structure is built
+    self.RequireInputs(name)
+    if (self.err_code == Graph.FAILURE) :
+      self.Unpin(name)
+      self.err_msg = err_header + "\n" + self.err_msg
+      return
+
+    # -- build structure, unless it is in the disk cache
+    self.Release(name)
+    self.struct_id[name] = None
+    if (not self.LoadStructFromCache(name)) :
+      for (method, guard) in steps :
+        if ((guard is not None) and (len(getattr(self, guard)) == 0)) :
+          continue
+        getattr(self, method)()
+        if (self.err_code == Graph.FAILURE) :
+          self.UnpinInputs(name)
+          self.Unpin(name)
+          self.err_msg = err_header + "\n" + self.err_msg
+          return
+      self.SaveStructToCache(name)
+
+    # -- record inputs, keep the version if they did not change (release)
+    input_stamp = dict((input_name, self.GetStructStamp(input_name))
+                       for input_name in inputs)
+    if (self.struct_input.get(name) != input_stamp) :
+      self.struct_version[name] = self.struct_version.get(name, 0) + 1
+    self.struct_input[name] = input_stamp
+    self.struct_id[name] = id(getattr(self, attrs[0]))
+
+    # -- fit memory budget
+    self.UnpinInputs(name)
+    self.ReleaseToBudget()
+    self.Unpin(name)
 
     return
 
-  # END def BuildVert2Vert ( self ) :
+  # END def Require (
+#        self,
+#        name ) :
+  # ----------------------------------------------------------------------------
+
+  ##
+  # @brief Builds the derived inputs of a structure (see Require), and pins
+  #        them until UnpinInputs.
+  # @param name = name of the structure, e.g. "vert_color" (str)
+  # @remarks On failure, no input is left pinned.
+  #
+  def RequireInputs (
+        self,
+        name ) :
+
+    # -- init
+
+    # error handling
+    self.err_code = Graph.SUCCESS
+    self.err_msg = ""
+    err_header = "*** [" + Graph.CLASS_NAME + ".RequireInputs]"
+
+    # -- build and pin each input
+    pinned = []
+    for input_name in Graph.DERIVED[name][0] :
+      if (input_name in Graph.DERIVED) :
+        self.Require(input_name)
+        if (self.err_code == Graph.FAILURE) :
+          for pinned_name in pinned :
+            self.Unpin(pinned_name)
+          self.err_msg = err_header + "\n" + self.err_msg
+          return
+        self.Pin(input_name)
+        pinned.append(input_name)
+
+    return
+
+  # END def RequireInputs (
+#        self,
+#        name ) :
+  # ----------------------------------------------------------------------------
+
+  ##
+  # @brief Unpins the derived inputs of a structure (see RequireInputs).
+  # @param name = name of the structure, e.g. "vert_color" (str)
+  #
+  def UnpinInputs (
+        self,
+        name ) :
+
+    for input_name in Graph.DERIVED[name][0] :
+      if (input_name in Graph.DERIVED) :
+        self.Unpin(input_name)
+
+    return
+
+  # END def UnpinInputs (
+#        self,
+#        name ) :
+  # ----------------------------------------------------------------------------
+
+  ##
+  # @brief Pins a derived structure: it is not released by ReleaseToBudget
+  #        until it is unpinned as many times (see Unpin).
+  # @param name = name of the derived structure (str)
+  #
+  def Pin (
+        self,
+        name ) :
+
+    self.struct_pinned[name] = self.struct_pinned.get(name, 0) + 1
+
+    return
+
+  # END def Pin (
+#        self,
+#        name ) :
+  # ----------------------------------------------------------------------------
+
+  ##
+  # @brief Unpins a derived structure (see Pin).
+  # @param name = name of the derived structure (str)
+  #
+  def Unpin (
+        self,
+        name ) :
+
+    if (self.struct_pinned.get(name, 0) > 1) :
+      self.struct_pinned[name] -= 1
+    else :
+      self.struct_pinned.pop(name, None)
+
+    return
+
+  # END def Unpin (
+#        self,
+#        name ) :
+  # ----------------------------------------------------------------------------
+
+  ##
+  # @brief Tells if a structure is available and up to date.
+  # @param name = name of the structure, e.g. "vert2vert" or "edge2vert" (str)
+  # @return True if available, False otherwise
+  #
+  def IsAvailable (
+        self,
+        name ) :
+
+    # -- input or structure set by hand
+    if (name not in Graph.DERIVED) :
+      return (len(getattr(self, name)) != 0)
+    data = getattr(self, Graph.DERIVED[name][2][0])
+    if (name not in self.struct_id) :
+      return (len(data) != 0)
+
+    # -- released structure
+    if (self.struct_id[name] is None) :
+      return False
+
+    # -- structure replaced by hand: no longer managed
+    if (self.struct_id[name] != id(data)) :
+      del self.struct_id[name]
+      del self.struct_input[name]
+      self.struct_version[name] = self.struct_version.get(name, 0) + 1
+      return (len(data) != 0)
+
+    return self.IsUpToDate(name)
+
+  # END def IsAvailable (
+#        self,
+#        name ) :
+  # ----------------------------------------------------------------------------
+
+  ##
+  # @brief Tells if the inputs of a derived structure, and recursively theirs,
+  #        are unchanged since its last build.
+  # @param name = name of the derived structure (str)
+  # @return True if up to date, False otherwise
+  #
+  def IsUpToDate (
+        self,
+        name ) :
+
+    if (name not in self.struct_input) :
+      return True
+    for (input_name, stamp) in self.struct_input[name].items() :
+      if (self.GetStructStamp(input_name) != stamp) :
+        return False
+      if ((input_name in Graph.DERIVED)
+          and (not self.IsUpToDate(input_name))) :
+        return False
+
+    return True
+
+  # END def IsUpToDate (
+#        self,
+#        name ) :
+  # ----------------------------------------------------------------------------
+
+  ##
+  # @brief Marks a structure as modified in place, e.g. edge2vert, so that the
+  #        structures derived from it are rebuilt.
+  # @param name = name of the structure (str)
+  #
+  def Touch (
+        self,
+        name ) :
+
+    self.struct_version[name] = self.struct_version.get(name, 0) + 1
+
+    return
+
+  # END def Touch (
+#        self,
+#        name ) :
+  # ----------------------------------------------------------------------------
+
+  ##
+  # @brief Frees a derived structure, it is rebuilt by the next Require.
+  # @param name = name of the derived structure (str)
+  #
+  def Release (
+        self,
+        name ) :
+
+    for attr in Graph.DERIVED[name][2] :
+      if (attr.startswith("numb_")) :
+        setattr(self, attr, 0)
+      elif (attr.startswith("p_")) :
+        setattr(self, attr, numpy.array([0]))
+      else :
+        setattr(self, attr, numpy.array([]))
+    if (name in self.struct_id) :
+      self.struct_id[name] = None
+
+    return
+
+  # END def Release (
+#        self,
+#        name ) :
+  # ----------------------------------------------------------------------------
+
+  ##
+  # @brief Releases the least recently used derived structures until their
+  #        size fits the memory budget (mem_budget).
+  # @remarks Only the structures built by Require are released, not the
+  #          pinned ones (being built, or inputs of one being built).
+  #
+  def ReleaseToBudget ( self ) :
+
+    if (self.mem_budget is None) :
+      return
+
+    held = [name for name in self.struct_id
+            if (self.struct_id[name] is not None)]
+    size = sum(self.GetStructSize(name) for name in held)
+    held.sort(key=lambda name: self.struct_access.get(name, 0))
+    for name in held :
+      if (size <= self.mem_budget) :
+        break
+      if (name in self.struct_pinned) :
+        continue
+      size -= self.GetStructSize(name)
+      self.Release(name)
+
+    return
+
+  # END def ReleaseToBudget ( self ) :
+  # ----------------------------------------------------------------------------
+
+  ##
+  # @brief Returns the stamp of a structure: its version if built by Require,
+  #        its identity, length and version otherwise.
+  # @param name = name of the structure (str)
+  # @return stamp (tuple)
+  #
+  def GetStructStamp (
+        self,
+        name ) :
+
+    version = self.struct_version.get(name, 0)
+    if ((name in Graph.DERIVED) and (name in self.struct_id)) :
+      return (version,)
+    data = getattr(self, name)
+
+    return (id(data), len(data), version)
+
+  # END def GetStructStamp (
+#        self,
+#        name ) :
+  # ----------------------------------------------------------------------------
+
+  ##
+  # @brief Returns the memory size of a derived structure.
+  # @param name = name of the derived structure (str)
+  # @return size in bytes
+  #
+  def GetStructSize (
+        self,
+        name ) :
+
+    size = 0
+    for attr in Graph.DERIVED[name][2] :
+      data = getattr(self, attr)
+      if (isinstance(data, numpy.ndarray)) :
+        size += data.nbytes
+
+    return size
+
+  # END def GetStructSize (
+#        self,
+#        name ) :
+  # ----------------------------------------------------------------------------
+
+  # ----------------------------------------------------------------------------
+  # -- DISK CACHE
+  # ----------------------------------------------------------------------------
+
+  ##
+  # @brief Returns the content hash of a structure.
+  # @param name = name of the structure, e.g. "vert2vert" or "edge2vert" (str)
+  # @return hash (hexadecimal str)
+  # @remarks The hash of a derived structure built by Require is computed from
+  #          the hashes of its inputs, the one of an input or of a structure
+  #          set by hand from its content (once per array and version).
+  #
+  def GetStructHash (
+        self,
+        name ) :
+
+    key = hashlib.sha1()
+    key.update((name + " " + str(Graph.CACHE_VERSION) + " "
+                + str(self.numb_vert) + " " + str(self.numb_edge)).encode())
+
+    # -- derived structure: hash of the inputs
+    if ((name in Graph.DERIVED) and (name in self.struct_id)) :
+      for input_name in Graph.DERIVED[name][0] :
+        key.update(self.GetStructHash(input_name).encode())
+      return key.hexdigest()
+
+    # -- input or structure set by hand: hash of the content
+    if (name in Graph.DERIVED) :
+      data = tuple(getattr(self, attr) for attr in Graph.DERIVED[name][2])
+    else :
+      data = (getattr(self, name),)
+      if (name == "edge2vert") :
+        data += (self.p_edge2vert,)
+    version = self.struct_version.get(name, 0)
+    memo = self.struct_hash.get(name)
+    if ((memo is not None) and (len(memo[0]) == len(data))
+        and all(memo_data is cur_data
+                for (memo_data, cur_data) in zip(memo[0], data))
+        and (memo[1] == version)) :
+      return memo[2]
+    for cur_data in data :
+      cur_data = numpy.ascontiguousarray(cur_data)
+      key.update((cur_data.dtype.str + str(cur_data.shape)).encode())
+      key.update(cur_data.data)
+    self.struct_hash[name] = (data, version, key.hexdigest())
+
+    return self.struct_hash[name][2]
+
+  # END def GetStructHash (
+#        self,
+#        name ) :
+  # ----------------------------------------------------------------------------
+
+  ##
+  # @brief Loads a derived structure from the disk cache (cache_dir).
+  # @param name = name of the derived structure (str)
+  # @return True if loaded, False otherwise
+  # @remarks The arrays are memory-mapped copy-on-write (mmap_mode="c"): they
+  #          are read on demand and can be modified without changing the
+  #          cache.
+  #
+  def LoadStructFromCache (
+        self,
+        name ) :
+
+    if (self.cache_dir is None) :
+      return False
+
+    # -- check all the files of the structure
+    key = self.GetStructHash(name)
+    attrs = Graph.DERIVED[name][2]
+    file_name = [os.path.join(self.cache_dir, key + "_" + attr + ".npy")
+                 for attr in attrs]
+    if (not all(os.path.isfile(cur_name) for cur_name in file_name)) :
+      return False
+
+    # -- map arrays
+    try :
+      data = [numpy.load(cur_name, mmap_mode="c") for cur_name in file_name]
+    except (IOError, ValueError) :
+      return False
+    for (attr, cur_data, cur_name) in zip(attrs, data, file_name) :
+      if (attr.startswith("numb_")) :
+        cur_data = int(cur_data)
+      setattr(self, attr, cur_data)
+      os.utime(cur_name, None)
+
+    return True
+
+  # END def LoadStructFromCache (
+#        self,
+#        name ) :
+  # ----------------------------------------------------------------------------
+
+  ##
+  # @brief Saves a derived structure to the disk cache (cache_dir), as
+  #        uncompressed .npy files, then fits the cache to its size cap.
+  # @param name = name of the derived structure (str)
+  # @remarks Each file is written under a temporary name, then renamed, so
+  #          that an interrupted run never leaves a partial file. Errors are
+  #          ignored: the cache is only an accelerator.
+  #
+  def SaveStructToCache (
+        self,
+        name ) :
+
+    if (self.cache_dir is None) :
+      return
+
+    # -- write files
+    key = self.GetStructHash(name)
+    try :
+      if (not os.path.isdir(self.cache_dir)) :
+        os.makedirs(self.cache_dir)
+      for attr in Graph.DERIVED[name][2] :
+        file_name = os.path.join(self.cache_dir, key + "_" + attr + ".npy")
+        tmp_file_name = file_name + "." + str(os.getpid()) + ".tmp"
+        p_file = open(tmp_file_name, "wb")
+        numpy.save(p_file, numpy.asarray(getattr(self, attr)))
+        p_file.close()
+        os.rename(tmp_file_name, file_name)
+    except (IOError, OSError) :
+      return
+
+    # -- fit size cap
+    self.ReleaseCacheToSize()
+
+    return
+
+  # END def SaveStructToCache (
+#        self,
+#        name ) :
+  # ----------------------------------------------------------------------------
+
+  ##
+  # @brief Removes the least recently used structures from the disk cache
+  #        until its size fits the size cap (cache_size_max).
+  # @remarks The files of a structure are removed together. Loading a
+  #          structure updates the modification time of its files.
+  #
+  def ReleaseCacheToSize ( self ) :
+
+    # -- size and last use of each cached structure
+    entry = {}
+    for file_name in glob.glob(os.path.join(self.cache_dir, "*_*.npy")) :
+      try :
+        stat = os.stat(file_name)
+      except OSError :
+        continue
+      key = os.path.basename(file_name).split("_", 1)[0]
+      (size, mtime, file_list) = entry.get(key, (0, 0, []))
+      entry[key] = (size + stat.st_size, max(mtime, stat.st_mtime),
+                    file_list + [file_name])
+
+    # -- remove the least recently used structures
+    size = sum(cur_entry[0] for cur_entry in entry.values())
+    for key in sorted(entry, key=lambda key: entry[key][1]) :
+      if (size <= self.cache_size_max) :
+        break
+      for file_name in entry[key][2] :
+        try :
+          os.remove(file_name)
+        except OSError :
+          pass
+      size -= entry[key][0]
+
+    return
+
+  # END def ReleaseCacheToSize ( self ) :
   # ----------------------------------------------------------------------------
 
 # END class Graph ( object ) :
+# ------------------------------------------------------------------------------
+# ------------------------------------------------------------------------------
+# -- PARALLEL COLORING WORKERS
+# ------------------------------------------------------------------------------
+
+# Shared arrays and forbidden-color marks of the current worker process (see
+# InitColorWorker)
+color_worker_data = {}
+
+##
+# @brief Maps the shared arrays of Graph.ColorVertBySpeculation in the
+#        current process, and allocates its forbidden-color marks.
+# @param vert2vert = (multiprocessing.RawArray, dtype str, size)
+# @param p_vert2vert = idem
+# @param vert_color = idem
+# @param vert_todo = idem, vertices to color in the current round
+# @param numb_mark = number of forbidden-color marks, i.e. largest vertex
+#             degree + 2
+#
+def InitColorWorker (
+      vert2vert,
+      p_vert2vert,
+      vert_color,
+      vert_todo,
+      numb_mark ) :
+
+  for (name, (raw_array, dtype, array_size)) in [("vert2vert", vert2vert),
+        ("p_vert2vert", p_vert2vert), ("vert_color", vert_color),
+        ("vert_todo", vert_todo)] :
+    color_worker_data[name] = numpy.frombuffer(raw_array,
+                                  dtype=numpy.dtype(dtype))[0:array_size]
+  color_worker_data["forbidden"] = -numpy.ones(numb_mark, dtype=int)
+
+  return
+
+# END def InitColorWorker (
+#      vert2vert,
+#      p_vert2vert,
+#      vert_color,
+#      vert_todo,
+#      numb_mark ) :
+# ------------------------------------------------------------------------------
+
+##
+# @brief Colors first-fit the vertices vert_todo[first::step] among the
+#        numb_todo first ones (see Graph.ColorVertBySpeculation).
+# @param args = (first, step, numb_todo)
+#
+def ColorVertWorker ( args ) :
+
+  (first, step, numb_todo) = args
+  vert2vert = color_worker_data["vert2vert"]
+  p_vert2vert = color_worker_data["p_vert2vert"]
+  vert_color = color_worker_data["vert_color"]
+
+  # forbidden[c] == vert iff color c is used by a neighbor of vert, the last
+  # mark receives the colorless neighbors; sized from the largest degree, as
+  # neighbors colored by other workers or in earlier rounds may hold any
+  # color, and reset since a vertex may be colored again in a later round
+  forbidden = color_worker_data["forbidden"]
+  forbidden[:] = -1
+  for vert in color_worker_data["vert_todo"][first:numb_todo:step] :
+    numb_adj = p_vert2vert[vert + 1] - p_vert2vert[vert]
+    forbidden[vert_color[vert2vert[p_vert2vert[vert]:
+                                   p_vert2vert[vert + 1]]]] = vert
+    vert_color[vert] = numpy.argmin(forbidden[0:numb_adj + 1] == vert)
+
+  return
+
+# END def ColorVertWorker ( args ) :
 # ------------------------------------------------------------------------------
\ No newline at end of file
@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+
+##
+# @author Pr Magoules HPC Research Group, CentraleSupelec, France
+# @date 2026-10-16, 2026-10-16
+# @version 1.0
+#
+# Index dtype policy of the CSR arrays of Mesh, Graph and NetSim: int32 when
+# the values fit, int64 otherwise.
+#
+
+# -- Third-party modules
+import numpy
+
+# -- Constants
+
+# Largest value stored in int32
+INDEX32_MAX = numpy.iinfo(numpy.int32).max
+
+##
+# @brief Returns the index dtype of an array.
+# @param max_value = largest value of the array
+# @return numpy.int32 if max_value fits, numpy.int64 otherwise
+#
+def IndexDtype ( max_value ) :
+
+  if (max_value <= INDEX32_MAX) :
+    return numpy.int32
+
+  return numpy.int64
+
+##
+# @brief Converts an index array to its index dtype.
+# @param array_val = index array (numpy.ndarray or list)
+# @param max_value = largest value of the array, or an upper bound
+#             [default: None, computed from the array]
+# @return index array (numpy.ndarray), without copy if already of the index
+#          dtype
+#
+def AsIndex ( array_val, max_value = None ) :
+
+  array_val = numpy.asarray(array_val)
+  if (max_value is None) :
+    max_value = 0
+    if (array_val.size > 0) :
+      max_value = max(array_val.max(), -array_val.min())
+
+  return array_val.astype(IndexDtype(max_value), copy=False)
+
+##
+# @brief Returns the memory size of arrays.
+# @param array_list = arrays (list of numpy.ndarray)
+# @param index_dtype = dtype of the integer arrays
+#             [default: None, actual dtypes]
+# @return size in bytes
+# @remarks With index_dtype, the size is the one the integer arrays would have
+#          in this dtype, e.g. numpy.int64 for the former default.
+#
+def GetArraySize ( array_list, index_dtype = None ) :
+
+  size = 0
+  for array_val in array_list :
+    if (not isinstance(array_val, numpy.ndarray)) :
+      continue
+    if ((index_dtype is not None)
+        and (array_val.dtype.kind in "iuf") and (array_val.ndim == 1)) :
+      size += array_val.size * numpy.dtype(index_dtype).itemsize
+    else :
+      size += array_val.nbytes
+
+  return size
@@ -9,9 +9,20 @@
 # @class Mesh
 #
 
+# -- Standard modules
+import io
+import os
+import gzip
+import re
+import json
+import mmap
+
 # -- Third-party modules
 import numpy
 
+# -- MRG modules
+from indexdtype import IndexDtype, AsIndex
+
 ##
 # @brief A set of operations for handling mesh datasets.
 #
@@ -32,6 +43,25 @@ class Mesh ( object ) :
   # VTK version
   VTK_VERSION = "4.2"
 
+  # VTK data types of BINARY files (big-endian)
+  VTK_BINARY_DTYPE = {"unsigned_char" : ">u1", "char" : ">i1",
+                      "unsigned_short" : ">u2", "short" : ">i2",
+                      "unsigned_int" : ">u4", "int" : ">i4",
+                      "unsigned_long" : ">u8", "long" : ">i8",
+                      "float" : ">f4", "double" : ">f8",
+                      "vtkidtype" : ">i4"}
+
+  # VTK section index (sidecar file)
+  VTK_INDEX_EXT = ".idx"
+  VTK_INDEX_VERSION = 1
+
+  # Number of values formatted at once by the VTK ASCII writer
+  WRITE_CHUNK_SIZE = 1 << 16
+
+  # Compression level of gzip-compressed files, first bytes of these files
+  GZIP_COMPRESS_LEVEL = 6
+  GZIP_MAGIC = b"\x1f\x8b"
+
   # Class description
   CLASS_NAME = "Mesh"
   CLASS_AUTHOR = "G. G.-Benissan, MRG, CentraleSupelec, France"
@@ -39,6 +69,10 @@ class Mesh ( object ) :
   __init__ ( self )
 
   ReadFromFileVtk (
+        self,
+        file_name,
+        read_mode = "BULK" )
+  ReadAllFromFileVtk (
         self,
         file_name )
   ReadHeaderFromFileVtk (
@@ -47,26 +81,94 @@ class Mesh ( object ) :
   ReadUnstructGridFromFileVtkAscii (
         self,
         file_name )
+  ReadUnstructGridFromFileVtkBulk (
+        self,
+        file_name,
+        file_type = "ASCII" )
+  ReadUnstructGridFromOpenFileVtk (
+        self,
+        p_file,
+        file_type = "ASCII" )
+  ReadAllFieldFromOpenFileVtk (
+        self,
+        p_file,
+        file_type = "ASCII" )
+  ReadKeywordFromFileVtk (
+        self,
+        p_file,
+        keyword )
+  ReadArrayFromFileVtk (
+        self,
+        p_file,
+        numb_val,
+        data_type,
+        file_type = "ASCII" )
+  BuildElem2NodeFromCellList (
+        self,
+        cell_list )
+  BuildCellList ( self )
 
   ReadFieldFromFileVtk (
         self,
         file_name,
-        array_name )
+        array_name,
+        read_mode = "INDEX" )
   ReadFieldFromFileVtkAscii (
         self,
         file_name,
         array_name )
+  ReadFieldFromFileVtkBinary (
+        self,
+        file_name,
+        array_name )
+  ReadSectionFromFileVtk (
+        self,
+        file_name,
+        section_name )
+  ReadIndexFromFileVtk (
+        self,
+        file_name )
+  BuildIndexFromFileVtk (
+        self,
+        file_name )
+  ParseSectionHeaderVtk (
+        self,
+        buf )
+  OpenFileVtk (
+        self,
+        file_name,
+        mode = "rb" )
 
   WriteToFileVtk (
         self,
         file_name,
         file_type = "ASCII",
         dataset_type = "UNSTRUCTURED_GRID",
-        title = "Generated by " + CLASS_AUTHOR + ".")
+        title = "Generated by " + CLASS_AUTHOR + ".",
+        precision = None,
+        compress = False )
   WriteUnstructGridToFileVtkAscii (
         self,
         file_name,
-        title = "Generated by " + CLASS_AUTHOR + ".")
+        title = "Generated by " + CLASS_AUTHOR + ".",
+        precision = None,
+        compress = False )
+  WriteArrayToFileVtkAscii (
+        self,
+        p_file,
+        array_val,
+        val_fmt,
+        numb_column = 1,
+        line_end = None )
+  FormatIntVtkAscii (
+        self,
+        array_val,
+        line_end )
+  WriteUnstructGridToFileVtkBinary (
+        self,
+        file_name,
+        title = "Generated by " + CLASS_AUTHOR + ".",
+        compress = False )
 
   AllocPointData (
         self,
@@ -84,6 +186,12 @@ class Mesh ( object ) :
         array_name,
         numb_column,
         array_val )
+  GetPointData (
+        self,
+        array_name )
+  GetCellData (
+        self,
+        array_name )
   """
 
   # Data fields
@@ -154,10 +262,16 @@ class Mesh ( object ) :
   ##
   # @brief Reads mesh dataset from a VTK file.
   # @param file_name = full name of the file (str)
+  # @param read_mode = parsing strategy for ASCII files ("BULK", "CHAR")
+  #             [default: "BULK"]
+  # @remarks "BULK" parses each numerical section in one shot,
+  #          "CHAR" reads the file character by character. BINARY files are
+  #          always read in "BULK" mode.
   #
   def ReadFromFileVtk (
         self,
-        file_name ) :
+        file_name,
+        read_mode = "BULK" ) :
 
     # -- init
 
@@ -174,12 +288,18 @@ class Mesh ( object ) :
 
     # -- read dataset
     if (dataset_type == "UNSTRUCTURED_GRID") :
-      if (file_type == "ASCII") :
+      if ((file_type == "ASCII") and (read_mode == "CHAR")) :
 
         self.ReadUnstructGridFromFileVtkAscii(file_name)
         if (self.err_code == Mesh.FAILURE) :
           self.err_msg = err_header + "\n" + self.err_msg
 
+      elif (file_type in {"ASCII", "BINARY"}) :
+
+        self.ReadUnstructGridFromFileVtkBulk(file_name, file_type)
+        if (self.err_code == Mesh.FAILURE) :
+          self.err_msg = err_header + "\n" + self.err_msg
+
       else :
         self.err_code = Mesh.FAILURE
         self.err_msg = err_header + " Error: " + file_type
@@ -195,6 +315,71 @@ class Mesh ( object ) :
 
   # END def ReadFromFileVtk (
 #        self,
+#        file_name,
+#        read_mode = "BULK" ) :
+  # ----------------------------------------------------------------------------
+
+  ##
+  # @brief Reads mesh dataset and all its data fields from a VTK file in a
+  #        single pass.
+  # @param file_name = full name of the file (str)
+  # @remarks The header, the dataset and every POINT_DATA and CELL_DATA
+  #          field array are read in one traversal of the file, opened once.
+  #          Field arrays are stored in pdata_* and cdata_* (see
+  #          GetPointData and GetCellData), so that one Mesh object can be
+  #          shared by the simulation and the visualization.
+  #
+  def ReadAllFromFileVtk (
+        self,
+        file_name ) :
+
+    # -- init
+
+    # error handling
+    self.err_code = Mesh.SUCCESS
+    self.err_msg = ""
+    err_header = "*** [" + Mesh.CLASS_NAME + ".ReadAllFromFileVtk]"
+
+    # -- open file
+    try :
+      p_file = self.OpenFileVtk(file_name)
+    except :
+      self.err_code = Mesh.FAILURE
+      self.err_msg = err_header + " Error: cannot open " + file_name
+      return
+
+    # -- skip version (# vtk DataFile Version x.y) and title
+    p_file.readline()
+    p_file.readline()
+
+    # -- read file type (ASCII|BINARY) and dataset type (DATASET type)
+    file_type = p_file.readline().decode("ascii", "replace").strip().upper()
+    buf = p_file.readline().decode("ascii", "replace").split()
+    dataset_type = buf[1].upper() if (len(buf) > 1) else ""
+
+    # -- read dataset
+    if (dataset_type != "UNSTRUCTURED_GRID") :
+      self.err_code = Mesh.FAILURE
+      self.err_msg = err_header + " Error: " + dataset_type
+      self.err_msg += " dataset not supported"
+    elif (file_type not in {"ASCII", "BINARY"}) :
+      self.err_code = Mesh.FAILURE
+      self.err_msg = err_header + " Error: " + file_type
+      self.err_msg += " file not supported for " + dataset_type + " dataset"
+    else :
+      self.ReadUnstructGridFromOpenFileVtk(p_file, file_type)
+      if (self.err_code == Mesh.SUCCESS) :
+        self.ReadAllFieldFromOpenFileVtk(p_file, file_type)
+      if (self.err_code == Mesh.FAILURE) :
+        self.err_msg = err_header + "\n" + self.err_msg
+
+    # -- close file
+    p_file.close()
+
+    return
+
+  # END def ReadAllFromFileVtk (
+#        self,
 #        file_name ) :
   # ----------------------------------------------------------------------------
 
@@ -222,7 +407,7 @@ class Mesh ( object ) :
 
     # -- open file
     try :
-      p_file = open(file_name, "r")
+      p_file = self.OpenFileVtk(file_name, "r")
     except :
       self.err_code = Mesh.FAILURE
       self.err_msg = err_header + " Error: cannot open " + file_name
@@ -320,7 +505,7 @@ class Mesh ( object ) :
 
     # -- open file
     try :
-      p_file = open(file_name, "r")
+      p_file = self.OpenFileVtk(file_name, "r")
     except :
       self.err_code = Mesh.FAILURE
       self.err_msg = err_header + " Error: cannot open " + file_name
@@ -494,8 +679,8 @@ class Mesh ( object ) :
       self.p_elem2node.append(self.p_elem2node[i] + elem_numb_node)
 
     # -- convert to numpy.ndarray
-    self.elem2node = numpy.array(self.elem2node)
-    self.p_elem2node = numpy.array(self.p_elem2node)
+    self.elem2node = AsIndex(self.elem2node, self.numb_node)
+    self.p_elem2node = AsIndex(self.p_elem2node, len(self.elem2node))
 
     # -- skip CELL_TYPES keyword (CELL_TYPES numb_elem)
 
@@ -559,58 +744,67 @@ class Mesh ( object ) :
   # ----------------------------------------------------------------------------
 
   ##
-  # @brief Reads a field array from a VTK file.
+  # @brief Reads mesh dataset from a VTK "unstructured grid" file, reading
+  #        each numerical section (POINTS, CELLS, CELL_TYPES) in one shot.
   # @param file_name = full name of the file (str)
-  # @param array_name = name of the array in the file (str)
-  # @return array_data = tuples in the array (2D numpy.ndarray)
+  # @param file_type = numerical data format ("ASCII", "BINARY")
+  #             [default: "ASCII"]
+  # @remarks See ReadFromFileVtk
   #
-  def ReadFieldFromFileVtk (
+  def ReadUnstructGridFromFileVtkBulk (
         self,
         file_name,
-        array_name ) :
+        file_type = "ASCII" ) :
 
     # -- init
 
     # error handling
     self.err_code = Mesh.SUCCESS
     self.err_msg = ""
-    err_header = "*** [" + Mesh.CLASS_NAME + ".ReadFieldFromFileVtk]"
+    err_header = "*** [" + Mesh.CLASS_NAME
+    err_header += ".ReadUnstructGridFromFileVtkBulk]"
 
-    # -- read file header
-    (file_type, dataset_type) = self.ReadHeaderFromFileVtk(file_name)
-    if (self.err_code == Mesh.FAILURE) :
-      self.err_msg = err_header + "\n" + self.err_msg
+    # -- open file
+    try :
+      p_file = self.OpenFileVtk(file_name)
+    except :
+      self.err_code = Mesh.FAILURE
+      self.err_msg = err_header + " Error: cannot open " + file_name
       return
 
-    # -- read field
-    if (file_type == "ASCII") :
-
-      array_data = self.ReadFieldFromFileVtkAscii(file_name, array_name)
-      if (self.err_code == Mesh.FAILURE) :
-        self.err_msg = err_header + "\n" + self.err_msg
+    # -- skip version (# vtk DataFile Version x.y) and title
+    p_file.readline()
+    p_file.readline()
 
-    else :
-      self.err_code = Mesh.FAILURE
-      self.err_msg = err_header + " Error: " + file_type
-      self.err_msg += " file not supported for FIELD data"
+    # -- read dataset
+    self.ReadUnstructGridFromOpenFileVtk(p_file, file_type)
+    if (self.err_code == Mesh.FAILURE) :
+      self.err_msg = err_header + "\n" + self.err_msg
 
+    # -- close file
+    p_file.close()
 
-    return array_data
+    return
 
-  # END def ReadFieldFromFileVtk (
+  # END def ReadUnstructGridFromFileVtkBulk (
 #        self,
 #        file_name,
-#        array_name ) :
+#        file_type = "ASCII" ) :
   # ----------------------------------------------------------------------------
 
   ##
-  # @brief Reads a field array from a VTK ASCII file.
-  # @remarks See ReadFieldFromFileVtk
+  # @brief Reads the POINTS, CELLS and CELL_TYPES sections of an opened VTK
+  #        "unstructured grid" file.
+  # @param p_file = opened file ("rb" mode), positioned before POINTS
+  # @param file_type = numerical data format ("ASCII", "BINARY")
+  #             [default: "ASCII"]
+  # @remarks See ReadUnstructGridFromFileVtkBulk. The file is left positioned
+  #          after the CELL_TYPES section.
   #
-  def ReadFieldFromFileVtkAscii (
+  def ReadUnstructGridFromOpenFileVtk (
         self,
-        file_name,
-        array_name ) :
+        p_file,
+        file_type = "ASCII" ) :
 
     # -- init
 
@@ -618,98 +812,518 @@ class Mesh ( object ) :
     self.err_code = Mesh.SUCCESS
     self.err_msg = ""
     err_header = "*** [" + Mesh.CLASS_NAME
-    err_header += ".ReadFieldFromFileVtkAscii]"
+    err_header += ".ReadUnstructGridFromOpenFileVtk]"
 
     # output
-    array_data = numpy.array([])
+    self.space_dim = 3
+    self.numb_node = 0
+    self.node_coord = numpy.array([])
+    self.numb_elem = 0
+    self.elem2node = numpy.array([])
+    self.p_elem2node = numpy.array([0])
+    self.elem_type = numpy.array([])
 
-    # -- open file
-    try :
-      p_file = open(file_name, "r")
-    except :
+    # -- read number of nodes (POINTS numb_node data_type)
+    buf = self.ReadKeywordFromFileVtk(p_file, "POINTS")
+    if (len(buf) < 3) :
       self.err_code = Mesh.FAILURE
-      self.err_msg = err_header + " Error: cannot open " + file_name
-      return array_data
+      self.err_msg = err_header + " Error: POINTS section not found"
+      return
+    self.numb_node = int(buf[1])
 
-    # -- skip version (# vtk DataFile Version x.y)
-    buf = p_file.read(1)
-    while (buf not in {'', '#'}) :
-      buf = p_file.read(1)
-    p_file.readline()
+    # -- read nodes coordinates
+    self.node_coord = self.ReadArrayFromFileVtk(p_file,
+                                          self.numb_node * self.space_dim,
+                                          buf[2].lower(), file_type)
+    if (self.err_code == Mesh.FAILURE) :
+      self.err_msg = err_header + "\n" + self.err_msg
+      return
+    self.node_coord = self.node_coord.astype(numpy.float64, copy=False)
+    self.node_coord = self.node_coord.reshape((self.numb_node, self.space_dim))
 
-    # -- skip title
-    p_file.readline()
+    # -- read number of elements and list size (CELLS numb_elem size)
+    buf = self.ReadKeywordFromFileVtk(p_file, "CELLS")
+    if (len(buf) < 3) :
+      self.err_code = Mesh.FAILURE
+      self.err_msg = err_header + " Error: CELLS section not found"
+      return
+    self.numb_elem = int(buf[1])
+    cell_list_size = int(buf[2])
 
-    # -- read array name (arrayName numComponents numTuples dataType)
+    # -- read elements nodes
+    cell_list = self.ReadArrayFromFileVtk(p_file, cell_list_size, "int",
+                                          file_type)
+    if (self.err_code == Mesh.FAILURE) :
+      self.err_msg = err_header + "\n" + self.err_msg
+      return
+    self.BuildElem2NodeFromCellList(cell_list.astype(int, copy=False))
+    if (self.err_code == Mesh.FAILURE) :
+      self.err_msg = err_header + "\n" + self.err_msg
+      return
 
-    buf2 = "#" + array_name
-    while (buf2 not in {"", array_name}) :
+    # -- read elements types (CELL_TYPES numb_elem)
+    buf = self.ReadKeywordFromFileVtk(p_file, "CELL_TYPES")
+    if (len(buf) < 2) :
+      self.err_code = Mesh.FAILURE
+      self.err_msg = err_header + " Error: CELL_TYPES section not found"
+      return
+    self.elem_type = self.ReadArrayFromFileVtk(p_file, self.numb_elem, "int",
+                                               file_type)
+    if (self.err_code == Mesh.FAILURE) :
+      self.err_msg = err_header + "\n" + self.err_msg
+      return
+    self.elem_type = self.elem_type.astype(int, copy=False)
 
-      # read first letter of the array name
-      buf1 = p_file.read(1)
-      while (buf1 not in {'', array_name[0]}) :
-        buf1 = p_file.read(1)
-      buf2 = buf1
+    return
 
-      # read remaining letters
-      buf1 = p_file.read(1)
-      while (buf1 not in {'', ' ', '\n', '\r'}) :
-        buf2 += buf1
-        buf1 = p_file.read(1)
+  # END def ReadUnstructGridFromOpenFileVtk (
+#        self,
+#        p_file,
+#        file_type = "ASCII" ) :
+  # ----------------------------------------------------------------------------
 
-    # -- read number of components (arrayName numComponents numTuples dataType)
+  ##
+  # @brief Reads every POINT_DATA and CELL_DATA field array of an opened VTK
+  #        file into the point and cell data fields of the mesh.
+  # @param p_file = opened file ("rb" mode), positioned after the dataset
+  # @param file_type = numerical data format ("ASCII", "BINARY")
+  #             [default: "ASCII"]
+  # @remarks Arrays are read in one shot each and stored as 2D numpy.ndarray
+  #          (numb_tuple, numb_component) of their file data type.
+  #
+  def ReadAllFieldFromOpenFileVtk (
+        self,
+        p_file,
+        file_type = "ASCII" ) :
 
-    # read first numeral symbol
-    buf = p_file.read(1)
-    while (buf in {' ', '\n', '\r'}) :
-      buf = p_file.read(1)
-    numb_component = buf
+    # -- init
 
-    # read remaining numeral symbols
-    buf = p_file.read(1)
-    while (buf not in {'', ' ', '\n', '\r'}) :
-      numb_component += buf
-      buf = p_file.read(1)
+    # error handling
+    self.err_code = Mesh.SUCCESS
+    self.err_msg = ""
+    err_header = "*** [" + Mesh.CLASS_NAME
+    err_header += ".ReadAllFieldFromOpenFileVtk]"
+
+    # arrays found, per data location
+    field = {"POINT_DATA" : [], "CELL_DATA" : []}
+    location = ""
+
+    # -- read section headers and arrays
+    line = p_file.readline()
+    while (line) :
+      buf = line.decode("ascii", "replace").split()
+      keyword = buf[0].upper() if (len(buf) > 0) else ""
+
+      # POINT_DATA numb_node, CELL_DATA numb_elem
+      if ((keyword in field) and (len(buf) == 2)) :
+        location = keyword
+
+      # arrayName numComponents numTuples dataType
+      elif ((location != "") and (len(buf) == 4)
+            and (buf[3].lower() in Mesh.VTK_BINARY_DTYPE)) :
+        numb_component = int(buf[1])
+        numb_tuple = int(buf[2])
+        array_data = self.ReadArrayFromFileVtk(p_file,
+                                               numb_tuple * numb_component,
+                                               buf[3].lower(), file_type)
+        if (self.err_code == Mesh.FAILURE) :
+          self.err_msg = err_header + " " + buf[0] + "\n" + self.err_msg
+          return
+        field[location].append((str(buf[0]), numb_component,
+                          array_data.reshape((numb_tuple, numb_component))))
+
+      line = p_file.readline()
+
+    # -- store arrays
+    self.AllocPointData(max(len(field["POINT_DATA"]),
+                            Mesh.DEFAULT_MAX_NUMB_FIELD))
+    for (array_name, numb_column, array_val) in field["POINT_DATA"] :
+      self.AddPointData(array_name, numb_column, array_val)
+    self.AllocCellData(max(len(field["CELL_DATA"]),
+                           Mesh.DEFAULT_MAX_NUMB_FIELD))
+    for (array_name, numb_column, array_val) in field["CELL_DATA"] :
+      self.AddCellData(array_name, numb_column, array_val)
 
-    # convert to number
-    numb_component = int(numb_component)
+    return
 
-    # -- read number of tuples (arrayName numComponents numTuples dataType)
+  # END def ReadAllFieldFromOpenFileVtk (
+#        self,
+#        p_file,
+#        file_type = "ASCII" ) :
+  # ----------------------------------------------------------------------------
 
-    # read first numeral symbol
-    buf = p_file.read(1)
-    while (buf in {' ', '\n', '\r'}) :
-      buf = p_file.read(1)
-    numb_tuple = buf
+  ##
+  # @brief Skips lines of an opened VTK file until a given keyword line.
+  # @param p_file = opened file, positioned at the beginning of a line
+  # @param keyword = section keyword, e.g. "POINTS" (str)
+  # @return buf = words of the keyword line, [] if not found (list of str)
+  #
+  def ReadKeywordFromFileVtk (
+        self,
+        p_file,
+        keyword ) :
 
-    # read remaining numeral symbols
-    buf = p_file.read(1)
-    while (buf not in {'', ' ', '\n', '\r'}) :
-      numb_tuple += buf
-      buf = p_file.read(1)
+    # -- read lines
+    line = p_file.readline()
+    while (line) :
+      buf = line.decode("ascii", "replace").split()
+      if ((len(buf) > 0) and (buf[0].upper() == keyword)) :
+        return buf
+      line = p_file.readline()
 
-    # convert to number
-    numb_tuple = int(numb_tuple)
+    return []
 
-    # -- read data type (arrayName numComponents numTuples dataType)
+  # END def ReadKeywordFromFileVtk (
+#        self,
+#        p_file,
+#        keyword ) :
+  # ----------------------------------------------------------------------------
 
-    # read first letter
-    buf = p_file.read(1)
-    while (buf in {' ', '\n', '\r'}) :
-      buf = p_file.read(1)
-    data_type = buf
+  ##
+  # @brief Reads a block of values from an opened VTK file in one shot.
+  # @param p_file = opened file, positioned at the beginning of the block
+  # @param numb_val = number of values to read
+  # @param data_type = VTK data type of the values ("double", "int", ...)
+  # @param file_type = numerical data format ("ASCII", "BINARY")
+  #             [default: "ASCII"]
+  # @return array_data = values in native byte order (1D numpy.ndarray)
+  # @remarks BINARY values are big-endian: they are byte-swapped in one
+  #          operation over the whole block. ASCII floating-point values are
+  #          always parsed in double precision.
+  #
+  def ReadArrayFromFileVtk (
+        self,
+        p_file,
+        numb_val,
+        data_type,
+        file_type = "ASCII" ) :
 
-    # read remaining letters
-    buf = p_file.read(1)
-    while (buf not in {'', ' ', '\n', '\r'}) :
-      data_type += buf
-      buf = p_file.read(1)
+    # -- init
 
-    # -- map VTK data type to Numpy data type
-    data_type = data_type.lower()
-    if (data_type in {"bit", "unsigned_short"}) :
-      data_type = "short"
-    elif (data_type in {"unsigned_char", "char"}) :
+    # error handling
+    self.err_code = Mesh.SUCCESS
+    self.err_msg = ""
+    err_header = "*** [" + Mesh.CLASS_NAME + ".ReadArrayFromFileVtk]"
+
+    # output
+    array_data = numpy.array([])
+
+    # -- map VTK data type to Numpy data type
+    if (data_type not in Mesh.VTK_BINARY_DTYPE) :
+      self.err_code = Mesh.FAILURE
+      self.err_msg = err_header + " Error: " + data_type
+      self.err_msg += " data type not supported"
+      return array_data
+    file_dtype = numpy.dtype(Mesh.VTK_BINARY_DTYPE[data_type])
+
+    # -- read values
+    if (file_type == "ASCII") :
+      if (file_dtype.kind == "f") :
+        file_dtype = numpy.dtype(numpy.float64)
+      if (isinstance(p_file, gzip.GzipFile)) :
+        # compressed file: whole lines up to the last value (numpy.fromfile
+        # needs an uncompressed file), sections end with their last line
+        buf = []
+        numb_read = 0
+        while (numb_read < numb_val) :
+          line = p_file.readline()
+          if (not line) :
+            break
+          buf.append(line)
+          numb_read += len(line.split())
+        array_data = numpy.fromstring(b" ".join(buf),
+                                      dtype=file_dtype.newbyteorder("="),
+                                      sep=" ")[0:numb_val]
+      else :
+        array_data = numpy.fromfile(p_file,
+                                    dtype=file_dtype.newbyteorder("="),
+                                    count=numb_val, sep=" ")
+    else :
+      array_data = numpy.frombuffer(p_file.read(numb_val * file_dtype.itemsize),
+                                    dtype=file_dtype)
+      array_data = array_data.astype(file_dtype.newbyteorder("="))
+
+    # -- check number of values
+    if (len(array_data) != numb_val) :
+      self.err_code = Mesh.FAILURE
+      self.err_msg = err_header + " Error: " + str(numb_val)
+      self.err_msg += " values expected, " + str(len(array_data)) + " read"
+
+    return array_data
+
+  # END def ReadArrayFromFileVtk (
+#        self,
+#        p_file,
+#        numb_val,
+#        data_type,
+#        file_type = "ASCII" ) :
+  # ----------------------------------------------------------------------------
+
+  ##
+  # @brief Builds elem2node and p_elem2node from a VTK cell list
+  #        (n0 node ... node n1 node ... node ...).
+  # @param cell_list = VTK cell list of numb_elem elements (1D numpy.ndarray)
+  # @remarks The positions of the element sizes in the list are found by
+  #          pointer doubling, i.e. in log2(numb_elem) vectorized rounds,
+  #          unless all elements have the same number of nodes.
+  #
+  def BuildElem2NodeFromCellList (
+        self,
+        cell_list ) :
+
+    # -- init
+
+    # error handling
+    self.err_code = Mesh.SUCCESS
+    self.err_msg = ""
+    err_header = "*** [" + Mesh.CLASS_NAME + ".BuildElem2NodeFromCellList]"
+
+    # output
+    self.elem2node = numpy.array([])
+    self.p_elem2node = numpy.array([0])
+
+    # -- find position of the size of each element
+    list_size = len(cell_list)
+    pos = numpy.array([], dtype=int)
+    if (self.numb_elem > 0) and (list_size % self.numb_elem == 0) :
+      width = list_size // self.numb_elem
+      if (numpy.all(cell_list[::width] == width - 1)) :
+        pos = numpy.arange(0, list_size, width)
+
+    if (len(pos) == 0) and (list_size > 0) :
+
+      # jump[i] = position of the next element if an element starts at i
+      jump = numpy.arange(1, list_size + 1) + cell_list
+      numpy.minimum(jump, list_size, out=jump)
+      jump = numpy.append(jump, list_size)
+
+      # pos = {jump^k(0), k < 2^r} after r rounds
+      pos = numpy.array([0])
+      while (len(pos) < self.numb_elem) :
+        buf = jump[pos]
+        buf = numpy.union1d(pos, buf[buf < list_size])
+        if (len(buf) == len(pos)) :
+          break
+        pos = buf
+        jump = jump[jump]
+
+    # -- check consistency with the number of elements
+    if ((len(pos) != self.numb_elem)
+        or ((self.numb_elem > 0)
+            and (pos[-1] + cell_list[pos[-1]] + 1 != list_size))) :
+      self.err_code = Mesh.FAILURE
+      self.err_msg = err_header + " Error: cell list is not consistent with "
+      self.err_msg += str(self.numb_elem) + " elements"
+      return
+
+    # -- split sizes and nodes
+    self.p_elem2node = numpy.zeros(self.numb_elem + 1,
+                                   dtype=IndexDtype(list_size))
+    numpy.cumsum(cell_list[pos], out=self.p_elem2node[1:])
+    self.elem2node = AsIndex(numpy.delete(cell_list, pos), self.numb_node)
+
+    return
+
+  # END def BuildElem2NodeFromCellList (
+#        self,
+#        cell_list ) :
+  # ----------------------------------------------------------------------------
+
+  ##
+  # @brief Builds the VTK cell list (n0 node ... node n1 node ... node ...)
+  #        from elem2node and p_elem2node.
+  # @return cell_list = VTK cell list (1D numpy.ndarray)
+  #
+  def BuildCellList ( self ) :
+
+    # -- position of the size of each element
+    pos = self.p_elem2node[0:self.numb_elem] + numpy.arange(self.numb_elem)
+
+    # -- interleave sizes and nodes
+    cell_list = numpy.empty(self.numb_elem + self.p_elem2node[self.numb_elem],
+                            dtype=self.elem2node.dtype)
+    is_node = numpy.ones(len(cell_list), dtype=bool)
+    is_node[pos] = False
+    cell_list[pos] = numpy.diff(self.p_elem2node[0:self.numb_elem + 1])
+    cell_list[is_node] = self.elem2node[0:self.p_elem2node[self.numb_elem]]
+
+    return cell_list
+
+  # END def BuildCellList ( self ) :
+  # ----------------------------------------------------------------------------
+
+  ##
+  # @brief Reads a field array from a VTK file.
+  # @param file_name = full name of the file (str)
+  # @param array_name = name of the array in the file (str)
+  # @param read_mode = search strategy ("INDEX", "SCAN")
+  #             [default: "INDEX"]
+  # @return array_data = tuples in the array (2D numpy.ndarray)
+  # @remarks "INDEX" seeks directly to the array using the section index of
+  #          the file (see ReadIndexFromFileVtk), "SCAN" searches the array
+  #          from the top of the file.
+  #
+  def ReadFieldFromFileVtk (
+        self,
+        file_name,
+        array_name,
+        read_mode = "INDEX" ) :
+
+    # -- init
+
+    # error handling
+    self.err_code = Mesh.SUCCESS
+    self.err_msg = ""
+    err_header = "*** [" + Mesh.CLASS_NAME + ".ReadFieldFromFileVtk]"
+
+    # -- read indexed array
+    if (read_mode == "INDEX") :
+      array_data = self.ReadSectionFromFileVtk(file_name, array_name)
+      if (self.err_code == Mesh.FAILURE) :
+        self.err_msg = err_header + "\n" + self.err_msg
+      return array_data
+
+    # -- read file header
+    (file_type, dataset_type) = self.ReadHeaderFromFileVtk(file_name)
+    if (self.err_code == Mesh.FAILURE) :
+      self.err_msg = err_header + "\n" + self.err_msg
+      return
+
+    # -- read field
+    if (file_type == "ASCII") :
+
+      array_data = self.ReadFieldFromFileVtkAscii(file_name, array_name)
+      if (self.err_code == Mesh.FAILURE) :
+        self.err_msg = err_header + "\n" + self.err_msg
+
+    elif (file_type == "BINARY") :
+
+      array_data = self.ReadFieldFromFileVtkBinary(file_name, array_name)
+      if (self.err_code == Mesh.FAILURE) :
+        self.err_msg = err_header + "\n" + self.err_msg
+
+    else :
+      self.err_code = Mesh.FAILURE
+      self.err_msg = err_header + " Error: " + file_type
+      self.err_msg += " file not supported for FIELD data"
+
+
+    return array_data
+
+  # END def ReadFieldFromFileVtk (
+#        self,
+#        file_name,
+#        array_name,
+#        read_mode = "INDEX" ) :
+  # ----------------------------------------------------------------------------
+
+  ##
+  # @brief Reads a field array from a VTK ASCII file.
+  # @remarks See ReadFieldFromFileVtk
+  #
+  def ReadFieldFromFileVtkAscii (
+        self,
+        file_name,
+        array_name ) :
+
+    # -- init
+
+    # error handling
+    self.err_code = Mesh.SUCCESS
+    self.err_msg = ""
+    err_header = "*** [" + Mesh.CLASS_NAME
+    err_header += ".ReadFieldFromFileVtkAscii]"
+
+    # output
+    array_data = numpy.array([])
+
+    # -- open file
+    try :
+      p_file = self.OpenFileVtk(file_name, "r")
+    except :
+      self.err_code = Mesh.FAILURE
+      self.err_msg = err_header + " Error: cannot open " + file_name
+      return array_data
+
+    # -- skip version (# vtk DataFile Version x.y)
+    buf = p_file.read(1)
+    while (buf not in {'', '#'}) :
+      buf = p_file.read(1)
+    p_file.readline()
+
+    # -- skip title
+    p_file.readline()
+
+    # -- read array name (arrayName numComponents numTuples dataType)
+
+    buf2 = "#" + array_name
+    while (buf2 not in {"", array_name}) :
+
+      # read first letter of the array name
+      buf1 = p_file.read(1)
+      while (buf1 not in {'', array_name[0]}) :
+        buf1 = p_file.read(1)
+      buf2 = buf1
+
+      # read remaining letters
+      buf1 = p_file.read(1)
+      while (buf1 not in {'', ' ', '\n', '\r'}) :
+        buf2 += buf1
+        buf1 = p_file.read(1)
+
+    # -- read number of components (arrayName numComponents numTuples dataType)
+
+    # read first numeral symbol
+    buf = p_file.read(1)
+    while (buf in {' ', '\n', '\r'}) :
+      buf = p_file.read(1)
+    numb_component = buf
+
+    # read remaining numeral symbols
+    buf = p_file.read(1)
+    while (buf not in {'', ' ', '\n', '\r'}) :
+      numb_component += buf
+      buf = p_file.read(1)
+
+    # convert to number
+    numb_component = int(numb_component)
+
+    # -- read number of tuples (arrayName numComponents numTuples dataType)
+
+    # read first numeral symbol
+    buf = p_file.read(1)
+    while (buf in {' ', '\n', '\r'}) :
+      buf = p_file.read(1)
+    numb_tuple = buf
+
+    # read remaining numeral symbols
+    buf = p_file.read(1)
+    while (buf not in {'', ' ', '\n', '\r'}) :
+      numb_tuple += buf
+      buf = p_file.read(1)
+
+    # convert to number
+    numb_tuple = int(numb_tuple)
+
+    # -- read data type (arrayName numComponents numTuples dataType)
+
+    # read first letter
+    buf = p_file.read(1)
+    while (buf in {' ', '\n', '\r'}) :
+      buf = p_file.read(1)
+    data_type = buf
+
+    # read remaining letters
+    buf = p_file.read(1)
+    while (buf not in {'', ' ', '\n', '\r'}) :
+      data_type += buf
+      buf = p_file.read(1)
+
+    # -- map VTK data type to Numpy data type
+    data_type = data_type.lower()
+    if (data_type in {"bit", "unsigned_short"}) :
+      data_type = "short"
+    elif (data_type in {"unsigned_char", "char"}) :
       data_type = "<U4"
     elif (data_type in {"unsigned_int", "vtkidtype"}) :
       data_type = "int"
@@ -750,6 +1364,402 @@ class Mesh ( object ) :
 #        array_name ) :
   # ----------------------------------------------------------------------------
 
+  ##
+  # @brief Reads a field array from a VTK BINARY file.
+  # @remarks See ReadFieldFromFileVtk. The sections preceding the array are
+  #          skipped according to their sizes, never parsed.
+  #
+  def ReadFieldFromFileVtkBinary (
+        self,
+        file_name,
+        array_name ) :
+
+    # -- init
+
+    # error handling
+    self.err_code = Mesh.SUCCESS
+    self.err_msg = ""
+    err_header = "*** [" + Mesh.CLASS_NAME
+    err_header += ".ReadFieldFromFileVtkBinary]"
+
+    # output
+    array_data = numpy.array([])
+
+    # -- open file
+    try :
+      p_file = self.OpenFileVtk(file_name)
+    except :
+      self.err_code = Mesh.FAILURE
+      self.err_msg = err_header + " Error: cannot open " + file_name
+      return array_data
+
+    # -- skip version (# vtk DataFile Version x.y) and title
+    p_file.readline()
+    p_file.readline()
+
+    # -- read section headers, skip section data
+    line = p_file.readline()
+    while (line) :
+      buf = line.decode("ascii", "replace").split()
+      keyword = buf[0].upper() if (len(buf) > 0) else ""
+      numb_byte = 0
+
+      # POINTS numb_node data_type
+      if ((keyword == "POINTS") and (len(buf) == 3)) :
+        numb_byte = 3 * int(buf[1])
+        numb_byte *= numpy.dtype(Mesh.VTK_BINARY_DTYPE[buf[2].lower()]).itemsize
+
+      # CELLS numb_elem size
+      elif ((keyword == "CELLS") and (len(buf) == 3)) :
+        numb_byte = 4 * int(buf[2])
+
+      # CELL_TYPES numb_elem
+      elif ((keyword == "CELL_TYPES") and (len(buf) == 2)) :
+        numb_byte = 4 * int(buf[1])
+
+      # arrayName numComponents numTuples dataType
+      elif ((len(buf) == 4) and (buf[3].lower() in Mesh.VTK_BINARY_DTYPE)) :
+        numb_component = int(buf[1])
+        numb_tuple = int(buf[2])
+        if (buf[0] == array_name) :
+          array_data = self.ReadArrayFromFileVtk(p_file,
+                                                 numb_tuple * numb_component,
+                                                 buf[3].lower(), "BINARY")
+          p_file.close()
+          if (self.err_code == Mesh.FAILURE) :
+            self.err_msg = err_header + "\n" + self.err_msg
+            return array_data
+          return array_data.reshape((numb_tuple, numb_component))
+        numb_byte = numb_tuple * numb_component
+        numb_byte *= numpy.dtype(Mesh.VTK_BINARY_DTYPE[buf[3].lower()]).itemsize
+
+      p_file.seek(numb_byte, 1)
+      line = p_file.readline()
+
+    # -- close file
+    p_file.close()
+
+    # -- array not found
+    self.err_code = Mesh.FAILURE
+    self.err_msg = err_header + " Error: " + array_name + " array not found"
+
+    return array_data
+
+  # END def ReadFieldFromFileVtkBinary (
+#        self,
+#        file_name,
+#        array_name ) :
+  # ----------------------------------------------------------------------------
+
+  ##
+  # @brief Reads one section of a VTK file by seeking directly to it.
+  # @param file_name = full name of the file (str)
+  # @param section_name = "POINTS", "CELLS", "CELL_TYPES" or the name of a
+  #             POINT_DATA or CELL_DATA field array (str)
+  # @return array_data = section values (numpy.ndarray): (numb_node, 3) for
+  #          POINTS, cell list for CELLS, numb_elem types for CELL_TYPES,
+  #          (numb_tuple, numb_component) for field arrays
+  # @remarks The read time depends on the size of the section only, once the
+  #          index of the file is built (see ReadIndexFromFileVtk).
+  #
+  def ReadSectionFromFileVtk (
+        self,
+        file_name,
+        section_name ) :
+
+    # -- init
+
+    # error handling
+    self.err_code = Mesh.SUCCESS
+    self.err_msg = ""
+    err_header = "*** [" + Mesh.CLASS_NAME + ".ReadSectionFromFileVtk]"
+
+    # output
+    array_data = numpy.array([])
+
+    # -- get section offset
+    index = self.ReadIndexFromFileVtk(file_name)
+    if (self.err_code == Mesh.FAILURE) :
+      self.err_msg = err_header + "\n" + self.err_msg
+      return array_data
+    if (section_name not in index["section"]) :
+      self.err_code = Mesh.FAILURE
+      self.err_msg = err_header + " Error: " + section_name + " not found"
+      return array_data
+    section = index["section"][section_name]
+
+    # -- open file
+    try :
+      p_file = self.OpenFileVtk(file_name)
+    except :
+      self.err_code = Mesh.FAILURE
+      self.err_msg = err_header + " Error: cannot open " + file_name
+      return array_data
+
+    # -- read section
+    p_file.seek(section["offset"])
+    array_data = self.ReadArrayFromFileVtk(p_file,
+                                  int(numpy.prod(section["shape"])),
+                                  str(section["data_type"]), index["file_type"])
+    p_file.close()
+    if (self.err_code == Mesh.FAILURE) :
+      self.err_msg = err_header + " " + section_name + "\n" + self.err_msg
+      return array_data
+
+    return array_data.reshape(section["shape"])
+
+  # END def ReadSectionFromFileVtk (
+#        self,
+#        file_name,
+#        section_name ) :
+  # ----------------------------------------------------------------------------
+
+  ##
+  # @brief Reads the section index of a VTK file from its sidecar file
+  #        (file_name + VTK_INDEX_EXT), building it if needed.
+  # @param file_name = full name of the file (str)
+  # @return index = section index (dict), see BuildIndexFromFileVtk
+  # @remarks The sidecar file is valid as long as the size and modification
+  #          time of the VTK file are unchanged. It is rebuilt otherwise. If
+  #          it cannot be written, the index is rebuilt at every call.
+  #
+  def ReadIndexFromFileVtk (
+        self,
+        file_name ) :
+
+    # -- init
+
+    # error handling
+    self.err_code = Mesh.SUCCESS
+    self.err_msg = ""
+    err_header = "*** [" + Mesh.CLASS_NAME + ".ReadIndexFromFileVtk]"
+
+    # -- get file key
+    try :
+      stat = os.stat(file_name)
+    except :
+      self.err_code = Mesh.FAILURE
+      self.err_msg = err_header + " Error: cannot open " + file_name
+      return {}
+    file_key = [Mesh.VTK_INDEX_VERSION, stat.st_size, stat.st_mtime]
+
+    # -- read sidecar file
+    try :
+      p_file = open(file_name + Mesh.VTK_INDEX_EXT, "r")
+      index = json.load(p_file)
+      p_file.close()
+      if (index["file_key"] == file_key) :
+        return index
+    except :
+      pass
+
+    # -- build index
+    index = self.BuildIndexFromFileVtk(file_name)
+    if (self.err_code == Mesh.FAILURE) :
+      self.err_msg = err_header + "\n" + self.err_msg
+      return index
+    index["file_key"] = file_key
+
+    # -- write sidecar file
+    try :
+      p_file = open(file_name + Mesh.VTK_INDEX_EXT, "w")
+      json.dump(index, p_file)
+      p_file.close()
+    except :
+      pass
+
+    return index
+
+  # END def ReadIndexFromFileVtk (
+#        self,
+#        file_name ) :
+  # ----------------------------------------------------------------------------
+
+  ##
+  # @brief Builds the section index of a VTK file, i.e. the byte offsets of
+  #        POINTS, CELLS, CELL_TYPES and each POINT_DATA and CELL_DATA field
+  #        array.
+  # @param file_name = full name of the file (str)
+  # @return index = {"file_type" : "ASCII"|"BINARY",
+  #          "section" : {name : {"offset" : o, "shape" : s, "data_type" : t}}}
+  # @remarks ASCII files are scanned once with a regular expression matching
+  #          the lines starting with a letter, BINARY files by skipping the
+  #          sections according to their sizes. If an array name occurs
+  #          twice, the first array is indexed.
+  #
+  def BuildIndexFromFileVtk (
+        self,
+        file_name ) :
+
+    # -- init
+
+    # error handling
+    self.err_code = Mesh.SUCCESS
+    self.err_msg = ""
+    err_header = "*** [" + Mesh.CLASS_NAME + ".BuildIndexFromFileVtk]"
+
+    # output
+    index = {"file_type" : "", "section" : {}}
+
+    # -- open file
+    try :
+      p_file = self.OpenFileVtk(file_name)
+    except :
+      self.err_code = Mesh.FAILURE
+      self.err_msg = err_header + " Error: cannot open " + file_name
+      return index
+
+    # -- read version, title, file type and dataset type
+    p_file.readline()
+    p_file.readline()
+    index["file_type"] = p_file.readline().decode("ascii", "replace")
+    index["file_type"] = index["file_type"].strip().upper()
+    p_file.readline()
+    if (index["file_type"] not in {"ASCII", "BINARY"}) :
+      p_file.close()
+      self.err_code = Mesh.FAILURE
+      self.err_msg = err_header + " Error: " + index["file_type"]
+      self.err_msg += " file not supported"
+      return index
+
+    # -- list section headers (line, offset of the data)
+    header_list = []
+    if (index["file_type"] == "ASCII") :
+      data_offset = p_file.tell()
+      if (isinstance(p_file, gzip.GzipFile)) :
+        # compressed file: scanned in memory, offsets in the uncompressed data
+        p_file.seek(0)
+        p_map = p_file.read()
+      else :
+        p_map = mmap.mmap(p_file.fileno(), 0, access=mmap.ACCESS_READ)
+      pattern = re.compile(b"^[A-Za-z_][^\n]*", re.M)
+      for match in pattern.finditer(p_map, data_offset) :
+        header_list.append((match.group(), match.end() + 1))
+      if (not isinstance(p_map, bytes)) :
+        p_map.close()
+    else :
+      line = p_file.readline()
+      while (line) :
+        header_list.append((line, p_file.tell()))
+        buf = line.decode("ascii", "replace").split()
+        (section_name, section) = self.ParseSectionHeaderVtk(buf)
+        if (section_name != "") :
+          numb_byte = int(numpy.prod(section["shape"]))
+          numb_byte *= numpy.dtype(
+                        Mesh.VTK_BINARY_DTYPE[section["data_type"]]).itemsize
+          p_file.seek(numb_byte, 1)
+        line = p_file.readline()
+
+    # -- close file
+    p_file.close()
+
+    # -- index sections
+    location = ""
+    for (line, offset) in header_list :
+      buf = line.decode("ascii", "replace").split()
+      if ((len(buf) == 2) and (buf[0].upper() in {"POINT_DATA", "CELL_DATA"})) :
+        location = buf[0].upper()
+        continue
+      (section_name, section) = self.ParseSectionHeaderVtk(buf)
+      if ((section_name == "")
+          or ((section_name not in {"POINTS", "CELLS", "CELL_TYPES"})
+              and (location == ""))
+          or (section_name in index["section"])) :
+        continue
+      section["offset"] = offset
+      index["section"][section_name] = section
+
+    return index
+
+  # END def BuildIndexFromFileVtk (
+#        self,
+#        file_name ) :
+  # ----------------------------------------------------------------------------
+
+  ##
+  # @brief Parses a section header line of a VTK file.
+  # @param buf = words of the line (list of str)
+  # @return section_name = "POINTS", "CELLS", "CELL_TYPES", the array name,
+  #          or "" if the line is not a section header (str)
+  # @return section = {"shape" : s, "data_type" : t} (dict)
+  # @return (section_name, section)
+  #
+  def ParseSectionHeaderVtk (
+        self,
+        buf ) :
+
+    keyword = buf[0].upper() if (len(buf) > 0) else ""
+
+    try :
+
+      # POINTS numb_node data_type
+      if ((keyword == "POINTS") and (len(buf) == 3)) :
+        return ("POINTS", {"shape" : [int(buf[1]), 3],
+                           "data_type" : buf[2].lower()})
+
+      # CELLS numb_elem size
+      if ((keyword == "CELLS") and (len(buf) == 3)) :
+        return ("CELLS", {"shape" : [int(buf[2])], "data_type" : "int"})
+
+      # CELL_TYPES numb_elem
+      if ((keyword == "CELL_TYPES") and (len(buf) == 2)) :
+        return ("CELL_TYPES", {"shape" : [int(buf[1])], "data_type" : "int"})
+
+      # arrayName numComponents numTuples dataType
+      if ((len(buf) == 4) and (buf[3].lower() in Mesh.VTK_BINARY_DTYPE)) :
+        return (str(buf[0]), {"shape" : [int(buf[2]), int(buf[1])],
+                              "data_type" : buf[3].lower()})
+
+    except ValueError :
+      pass
+
+    return ("", {})
+
+  # END def ParseSectionHeaderVtk (
+#        self,
+#        buf ) :
+  # ----------------------------------------------------------------------------
+
+  ##
+  # @brief Opens a VTK file for reading, gzip-compressed or not.
+  # @param file_name = full name of the file (str)
+  # @param mode = "rb" (bytes) or "r" (text, Latin-1)
+  #             [default: "rb"]
+  # @return p_file = opened file
+  # @remarks Compressed files (see WriteToFileVtk) are recognized by their
+  #          first bytes, whatever their name, and decompressed on the fly,
+  #          so that all readers accept them. Raises IOError if the file
+  #          cannot be opened.
+  #
+  def OpenFileVtk (
+        self,
+        file_name,
+        mode = "rb" ) :
+
+    # -- check compression
+    p_file = open(file_name, "rb")
+    flag_gzip = (p_file.read(len(Mesh.GZIP_MAGIC)) == Mesh.GZIP_MAGIC)
+    p_file.close()
+
+    # -- open file
+    if (flag_gzip) :
+      p_file = gzip.open(file_name, "rb")
+      if (mode == "r") :
+        p_file = io.TextIOWrapper(io.BufferedReader(p_file),
+                                  encoding="latin-1")
+    elif (mode == "r") :
+      p_file = io.open(file_name, "r", encoding="latin-1")
+    else :
+      p_file = open(file_name, "rb")
+
+    return p_file
+
+  # END def OpenFileVtk (
+#        self,
+#        file_name,
+#        mode = "rb" ) :
+  # ----------------------------------------------------------------------------
+
   ##
   # @brief Writes mesh dataset to a VTK file.
   # @param file_name = full name of the file (str)
@@ -759,13 +1769,21 @@ class Mesh ( object ) :
   #             [default: "UNSTRUCTURED_GRID"]
   # @param title = short description (255 char. max.)
   #             [default: "Generated by " + Mesh.CLASS_AUTHOR + "."]
+  # @param precision = number of significant digits of floating-point values
+  #             in ASCII files, None for the shortest exact representation
+  #             [default: None]
+  # @param compress = whether to write a gzip-compressed file
+  #             [default: False]
+  # @remarks Compressed files are read back by all readers (see OpenFileVtk).
   #
   def WriteToFileVtk (
         self,
         file_name,
         file_type = "ASCII",
         dataset_type = "UNSTRUCTURED_GRID",
-        title = "Generated by " + CLASS_AUTHOR + "." ) :
+        title = "Generated by " + CLASS_AUTHOR + ".",
+        precision = None,
+        compress = False ) :
 
     # -- init
 
@@ -779,7 +1797,12 @@ class Mesh ( object ) :
     dataset_type = dataset_type.upper()
     if (dataset_type == "UNSTRUCTURED_GRID") :
       if (file_type == "ASCII") :
-        self.WriteUnstructGridToFileVtkAscii(file_name, title)
+        self.WriteUnstructGridToFileVtkAscii(file_name, title, precision,
+                                             compress)
+        if (self.err_code == Mesh.FAILURE) :
+          self.err_msg = err_header + "\n" + self.err_msg
+      elif (file_type == "BINARY") :
+        self.WriteUnstructGridToFileVtkBinary(file_name, title, compress)
         if (self.err_code == Mesh.FAILURE) :
           self.err_msg = err_header + "\n" + self.err_msg
       else :
@@ -798,17 +1821,23 @@ class Mesh ( object ) :
 #        file_name,
 #        file_type = "ASCII",
 #        dataset_type = "UNSTRUCTURED_GRID",
-#        title = "Generated by " + Mesh.CLASS_AUTHOR + ".") :
+#        title = "Generated by " + Mesh.CLASS_AUTHOR + ".",
+#        precision = None,
+#        compress = False ) :
   # ----------------------------------------------------------------------------
 
   ##
   # @brief Writes mesh dataset to a VTK unstructured grid ASCII file.
-  # @remarks See WriteToFileVtk
+  # @remarks See WriteToFileVtk. Each section is formatted as a whole with
+  #          Numpy, by blocks of WRITE_CHUNK_SIZE values (see
+  #          WriteArrayToFileVtkAscii).
   #
   def WriteUnstructGridToFileVtkAscii (
         self,
         file_name,
-        title = "Generated by " + CLASS_AUTHOR + "." ) :
+        title = "Generated by " + CLASS_AUTHOR + ".",
+        precision = None,
+        compress = False ) :
 
     # -- init
 
@@ -817,90 +1846,267 @@ class Mesh ( object ) :
     self.err_msg = ""
     err_header = "*** [" + Mesh.CLASS_NAME + ".WriteUnstructGridToFileVtkAscii]"
 
+    # -- set floating-point format
+    if (precision is None) :
+      float_fmt = "%r"
+    else :
+      float_fmt = "%." + str(int(precision)) + "g"
+
     # -- open file
     try :
-      p_file = open(file_name, "w")
+      if (compress) :
+        p_file = gzip.open(file_name, "wb", Mesh.GZIP_COMPRESS_LEVEL)
+      else :
+        p_file = open(file_name, "wb")
     except :
       self.err_code = Mesh.FAILURE
       self.err_msg = err_header + " Error: cannot open " + file_name
       return
 
-    # -- write version (# vtk DataFile Version x.y)
-    p_file.write("# vtk DataFile Version " + Mesh.VTK_VERSION)
+    # -- write version, title, file type and dataset type
+    buf = "# vtk DataFile Version " + Mesh.VTK_VERSION + "\n" + title + "\n"
+    buf += "ASCII\nDATASET UNSTRUCTURED_GRID\n"
+    p_file.write(buf.encode("ascii"))
+
+    # -- write nodes coordinates
+    buf = "POINTS " + str(self.numb_node) + " double\n"
+    p_file.write(buf.encode("ascii"))
+    self.WriteArrayToFileVtkAscii(p_file, numpy.asarray(self.node_coord,
+                                  dtype=numpy.float64).ravel(), float_fmt,
+                                  self.space_dim)
+
+    # -- write elements nodes (one element per line)
+    buf = "CELLS " + str(self.numb_elem) + " "
+    buf += str(self.numb_elem + self.p_elem2node[self.numb_elem]) + "\n"
+    p_file.write(buf.encode("ascii"))
+    line_end = numpy.zeros(self.numb_elem + self.p_elem2node[self.numb_elem],
+                           dtype=bool)
+    line_end[self.p_elem2node[1:self.numb_elem + 1]
+             + numpy.arange(self.numb_elem)] = True
+    self.WriteArrayToFileVtkAscii(p_file, self.BuildCellList(), "%d",
+                                  line_end=line_end)
+
+    # -- write elements types
+    buf = "CELL_TYPES " + str(self.numb_elem) + "\n"
+    p_file.write(buf.encode("ascii"))
+    self.WriteArrayToFileVtkAscii(p_file, numpy.asarray(self.elem_type,
+                                  dtype=int), "%d", 1)
+
+    # -- write point data fields
+    buf = "POINT_DATA " + str(self.numb_node)
+    buf += "\nFIELD AllPointData " + str(self.numb_pdata) + "\n"
+    p_file.write(buf.encode("ascii"))
+    for i in range(self.numb_pdata) :
+      buf = self.pdata_name[i] + " " + str(self.pdata_dim[i])
+      buf += " " + str(self.numb_node) + " double\n"
+      p_file.write(buf.encode("ascii"))
+      self.WriteArrayToFileVtkAscii(p_file, numpy.asarray(self.pdata_val[i],
+                                    dtype=numpy.float64).ravel(), float_fmt,
+                                    self.pdata_dim[i])
 
-    # -- write title
-    p_file.write("\n" + title + "\n")
+    # -- write cell data fields
+    buf = "CELL_DATA " + str(self.numb_elem)
+    buf += "\nFIELD AllCellData " + str(self.numb_cdata) + "\n"
+    p_file.write(buf.encode("ascii"))
+    for i in range(self.numb_cdata) :
+      buf = self.cdata_name[i] + " " + str(self.cdata_dim[i])
+      buf += " " + str(self.numb_elem) + " double\n"
+      p_file.write(buf.encode("ascii"))
+      self.WriteArrayToFileVtkAscii(p_file, numpy.asarray(self.cdata_val[i],
+                                    dtype=numpy.float64).ravel(), float_fmt,
+                                    self.cdata_dim[i])
 
-    # -- write file type
-    p_file.write("ASCII")
+    # -- close file
+    p_file.close()
 
-    # -- write dataset type
-    p_file.write("\nDATASET UNSTRUCTURED_GRID")
+    return
 
-    # -- write number of nodes
-    p_file.write("\nPOINTS " + str(self.numb_node) + " double")
+  # END def WriteUnstructGridToFileVtkAscii (
+#        self,
+#        file_name,
+#        title = "Generated by " + CLASS_AUTHOR + ".",
+#        precision = None,
+#        compress = False ) :
+  # ----------------------------------------------------------------------------
 
-    # -- write nodes coordinates
-    for i in range(0, self.numb_node) :
-      p_file.write("\n" + str(self.node_coord[i][0]))
-      p_file.write(" " + str(self.node_coord[i][1]))
-      p_file.write(" " + str(self.node_coord[i][2]))
+  ##
+  # @brief Writes a block of values to an opened VTK ASCII file.
+  # @param p_file = opened file ("wb" mode)
+  # @param array_val = values (1D numpy.ndarray)
+  # @param val_fmt = printf-style format of one value, e.g. "%d" (str)
+  # @param numb_column = number of values per line
+  #             [default: 1]
+  # @param line_end = True for the values ending a line (1D numpy.ndarray of
+  #             bool), overrides numb_column
+  #             [default: None]
+  # @remarks Values are formatted WRITE_CHUNK_SIZE at a time by a single
+  #          string formatting operation, one per line, then the line breaks
+  #          not ending a line are replaced with spaces in the formatted
+  #          buffer.
+  #
+  def WriteArrayToFileVtkAscii (
+        self,
+        p_file,
+        array_val,
+        val_fmt,
+        numb_column = 1,
+        line_end = None ) :
+
+    # -- line ends
+    numb_val = len(array_val)
+    if (line_end is None) :
+      line_end = numpy.zeros(numb_val, dtype=bool)
+      line_end[numb_column - 1::max(numb_column, 1)] = True
+
+    # -- write by chunks
+    for i in range(0, numb_val, Mesh.WRITE_CHUNK_SIZE) :
+      j = min(i + Mesh.WRITE_CHUNK_SIZE, numb_val)
+      if (val_fmt == "%d") :
+        buf = self.FormatIntVtkAscii(array_val[i:j], line_end[i:j])
+      else :
+        buf = ((val_fmt + "\n") * (j - i)) % tuple(array_val[i:j].tolist())
+        buf = numpy.frombuffer(buf.encode("ascii"), dtype=numpy.uint8).copy()
+        pos = numpy.flatnonzero(buf == ord("\n"))
+        buf[pos[~line_end[i:j]]] = ord(" ")
+      p_file.write(buf.tobytes())
 
-    # -- write number of elements
-    p_file.write("\nCELLS " + str(self.numb_elem))
+    return
 
-    # -- write elements list size
-    p_file.write(" " + str(self.numb_elem + self.p_elem2node[self.numb_elem]))
+  # END def WriteArrayToFileVtkAscii (
+#        self,
+#        p_file,
+#        array_val,
+#        val_fmt,
+#        numb_column = 1,
+#        line_end = None ) :
+  # ----------------------------------------------------------------------------
 
-    # -- write elements nodes
-    # for each element
-    for i in range(0, self.numb_elem) :
+  ##
+  # @brief Formats integers in decimal notation, each followed by a space or
+  #        a line break.
+  # @param array_val = integer values (1D numpy.ndarray)
+  # @param line_end = True for the values followed by a line break (1D
+  #             numpy.ndarray of bool)
+  # @return buf = ASCII characters (1D numpy.ndarray of uint8)
+  # @remarks The digits of all values are written at once, one decimal
+  #          position per vectorized round.
+  #
+  def FormatIntVtkAscii (
+        self,
+        array_val,
+        line_end ) :
+
+    # -- count characters (sign, digits, separator)
+    val = numpy.abs(array_val.astype(numpy.int64))
+    is_neg = (array_val < 0)
+    numb_digit = numpy.ones(len(val), dtype=numpy.int64)
+    buf = val // 10
+    while (numpy.any(buf > 0)) :
+      numb_digit += (buf > 0)
+      buf //= 10
+
+    # -- position of the separator ending each value
+    end = numpy.cumsum(numb_digit + is_neg + 1) - 1
+
+    # -- write separators, signs and digits (from the last one)
+    buf = numpy.empty(end[-1] + 1 if (len(end) > 0) else 0, dtype=numpy.uint8)
+    buf[end] = numpy.where(line_end, ord("\n"), ord(" "))
+    buf[(end - numb_digit - 1)[is_neg]] = ord("-")
+    for k in range(0, numb_digit.max() if (len(val) > 0) else 0) :
+      has_digit = (numb_digit > k)
+      buf[(end - k - 1)[has_digit]] = ord("0") + (val[has_digit] % 10)
+      val //= 10
+
+    return buf
+
+  # END def FormatIntVtkAscii (
+#        self,
+#        array_val,
+#        line_end ) :
+  # ----------------------------------------------------------------------------
+
+  ##
+  # @brief Writes mesh dataset to a VTK unstructured grid BINARY file.
+  # @remarks See WriteToFileVtk. Values are written big-endian, cells as
+  #          4-byte integers, data fields in double precision.
+  #
+  def WriteUnstructGridToFileVtkBinary (
+        self,
+        file_name,
+        title = "Generated by " + CLASS_AUTHOR + ".",
+        compress = False ) :
+
+    # -- init
+
+    # error handling
+    self.err_code = Mesh.SUCCESS
+    self.err_msg = ""
+    err_header = "*** [" + Mesh.CLASS_NAME
+    err_header += ".WriteUnstructGridToFileVtkBinary]"
+
+    # -- open file
+    try :
+      if (compress) :
+        p_file = gzip.open(file_name, "wb", Mesh.GZIP_COMPRESS_LEVEL)
+      else :
+        p_file = open(file_name, "wb")
+    except :
+      self.err_code = Mesh.FAILURE
+      self.err_msg = err_header + " Error: cannot open " + file_name
+      return
 
-      # -- write number of nodes
-      p_file.write("\n" + str(self.p_elem2node[i+1] - self.p_elem2node[i]))
+    # -- write version, title, file type and dataset type
+    buf = "# vtk DataFile Version " + Mesh.VTK_VERSION + "\n" + title + "\n"
+    buf += "BINARY\nDATASET UNSTRUCTURED_GRID\n"
+    p_file.write(buf.encode("ascii"))
 
-      # -- write nodes
-      for j in range(self.p_elem2node[i], self.p_elem2node[i+1]) :
-        p_file.write(" " + str(self.elem2node[j]))
+    # -- write nodes coordinates
+    buf = "POINTS " + str(self.numb_node) + " double\n"
+    p_file.write(buf.encode("ascii"))
+    p_file.write(numpy.asarray(self.node_coord, dtype=">f8").tobytes())
 
-    # -- write number of elements
-    p_file.write("\nCELL_TYPES " + str(self.numb_elem))
+    # -- write elements nodes
+    buf = "\nCELLS " + str(self.numb_elem) + " "
+    buf += str(self.numb_elem + self.p_elem2node[self.numb_elem]) + "\n"
+    p_file.write(buf.encode("ascii"))
+    p_file.write(self.BuildCellList().astype(">i4").tobytes())
 
     # -- write elements types
-    for i in range(self.numb_elem) :
-      p_file.write("\n" + str(self.elem_type[i]))
+    buf = "\nCELL_TYPES " + str(self.numb_elem) + "\n"
+    p_file.write(buf.encode("ascii"))
+    p_file.write(numpy.asarray(self.elem_type, dtype=">i4").tobytes())
 
     # -- write point data fields
-    p_file.write("\nPOINT_DATA " + str(self.numb_node))
-    p_file.write("\nFIELD AllPointData " + str(self.numb_pdata))
+    buf = "\nPOINT_DATA " + str(self.numb_node)
+    buf += "\nFIELD AllPointData " + str(self.numb_pdata)
+    p_file.write(buf.encode("ascii"))
     for i in range(self.numb_pdata) :
-      p_file.write("\n" + self.pdata_name[i] + " " + str(self.pdata_dim[i])
-                   + " " + str(self.numb_node) + " double")
-      for j in range(self.numb_node) :
-        p_file.write("\n")
-        for k in range(self.pdata_dim[i]) :
-          p_file.write(str(self.pdata_val[i][j,k]) + " ")
+      buf = "\n" + self.pdata_name[i] + " " + str(self.pdata_dim[i])
+      buf += " " + str(self.numb_node) + " double\n"
+      p_file.write(buf.encode("ascii"))
+      p_file.write(numpy.asarray(self.pdata_val[i], dtype=">f8").tobytes())
 
     # -- write cell data fields
-    p_file.write("\nCELL_DATA " + str(self.numb_elem))
-    p_file.write("\nFIELD AllCellData " + str(self.numb_cdata))
+    buf = "\nCELL_DATA " + str(self.numb_elem)
+    buf += "\nFIELD AllCellData " + str(self.numb_cdata)
+    p_file.write(buf.encode("ascii"))
     for i in range(self.numb_cdata) :
-      p_file.write("\n" + self.cdata_name[i] + " " + str(self.cdata_dim[i])
-                   + " " + str(self.numb_elem) + " double")
-      for j in range(self.numb_elem) :
-        p_file.write("\n")
-        for k in range(self.cdata_dim[i]) :
-          p_file.write(str(self.cdata_val[i][j,k]) + " ")
+      buf = "\n" + self.cdata_name[i] + " " + str(self.cdata_dim[i])
+      buf += " " + str(self.numb_elem) + " double\n"
+      p_file.write(buf.encode("ascii"))
+      p_file.write(numpy.asarray(self.cdata_val[i], dtype=">f8").tobytes())
+    p_file.write(b"\n")
 
     # -- close file
     p_file.close()
 
     return
 
-  # END def WriteUnstructGridToFileVtkAscii (
+  # END def WriteUnstructGridToFileVtkBinary (
 #        self,
 #        file_name,
-#        title = "Generated by " + CLASS_AUTHOR + ".") :
+#        title = "Generated by " + CLASS_AUTHOR + ".",
+#        compress = False ) :
   # ----------------------------------------------------------------------------
 
   # ----------------------------------------------------------------------------
@@ -1063,5 +2269,67 @@ class Mesh ( object ) :
 #        array_val ) :
   # ----------------------------------------------------------------------------
 
+  ##
+  # @brief Gets a point data array by name.
+  # @param array_name = name of the array (str)
+  # @return array_val = array contents (2D numpy.ndarray)
+  #
+  def GetPointData (
+        self,
+        array_name ) :
+
+    # -- init
+
+    # error handling
+    self.err_code = Mesh.SUCCESS
+    self.err_msg = ""
+    err_header = "*** [" + Mesh.CLASS_NAME
+    err_header += ".GetPointData]"
+
+    # -- find array
+    if (array_name not in self.pdata_name[0:self.numb_pdata]) :
+      self.err_code = Mesh.FAILURE
+      self.err_msg = err_header + " Error: " + str(array_name)
+      self.err_msg += " array not found."
+      return numpy.array([])
+
+    return self.pdata_val[self.pdata_name.index(array_name)]
+
+  # END def GetPointData (
+#        self,
+#        array_name ) :
+  # ----------------------------------------------------------------------------
+
+  ##
+  # @brief Gets a cell data array by name.
+  # @param array_name = name of the array (str)
+  # @return array_val = array contents (2D numpy.ndarray)
+  #
+  def GetCellData (
+        self,
+        array_name ) :
+
+    # -- init
+
+    # error handling
+    self.err_code = Mesh.SUCCESS
+    self.err_msg = ""
+    err_header = "*** [" + Mesh.CLASS_NAME
+    err_header += ".GetCellData]"
+
+    # -- find array
+    if (array_name not in self.cdata_name[0:self.numb_cdata]) :
+      self.err_code = Mesh.FAILURE
+      self.err_msg = err_header + " Error: " + str(array_name)
+      self.err_msg += " array not found."
+      return numpy.array([])
+
+    return self.cdata_val[self.cdata_name.index(array_name)]
+
+  # END def GetCellData (
+#        self,
+#        array_name ) :
+  # ----------------------------------------------------------------------------
+
 # END class Mesh ( object ) :
 # ------------------------------------------------------------------------------
\ No newline at end of file
@@ -8,7 +8,17 @@
 # @class MeshViz
 #
 
+# -- Standard modules
+import time
+import threading
+try :
+  import queue
+except ImportError :
+  import Queue as queue
+
 # -- Third-party modules
+import numpy
+import vtk
 from vtk import vtkDataSetMapper
 from vtk import vtkActor
 from vtk import vtkRenderer
@@ -25,6 +35,17 @@ from vtk import vtkRenderWindowInteractor
 from vtk import vtkWindowToImageFilter
 from vtk import vtkJPEGWriter
 from vtk import vtkPNGWriter
+from vtk import vtkUnstructuredGrid
+from vtk import vtkPoints
+from vtk import vtkCellArray
+from vtk import vtkImageData
+from vtk.util.numpy_support import numpy_to_vtk
+from vtk.util.numpy_support import vtk_to_numpy
+from vtk.util.numpy_support import numpy_to_vtkIdTypeArray
+from vtk.util.numpy_support import ID_TYPE_CODE
+
+# -- MRG modules
+from aviwriter import AviWriter
 
 ##
 # @brief A VTK-based interactive tool for mesh visualization.
@@ -39,11 +60,17 @@ class MeshViz ( object ) :
   SUCCESS = 0
   FAILURE = 1
 
+  # Offscreen render windows, by order of preference (headless VTK builds)
+  OFFSCREEN_WINDOW = ["vtkEGLRenderWindow", "vtkOSOpenGLRenderWindow"]
+
   # Class description
   CLASS_NAME = "MeshViz"
   CLASS_AUTHOR = "G. G.-Benissan, MRG, CentraleSupelec, France."
   METHODS = """
-  __init__ ( self )
+  __init__ (
+        self,
+        offscreen = False )
+
   Config (
         self,
         bg_color = (0,0,0),
@@ -56,10 +83,26 @@ class MeshViz ( object ) :
   ReadMeshFromFile (
         self,
         file_name )
+  ReadMeshFromMesh (
+        self,
+        mesh )
   WriteScreenshotToFile (
         self,
         file_name,
         file_format = "jpg" )
+  StartFrameWriter (
+        self,
+        numb_thread = 2 )
+  StopFrameWriter ( self )
+  WriteFrameWorker ( self )
+  StartVideo (
+        self,
+        file_name,
+        frame_rate = 25.0,
+        frame_stride = 1,
+        flag_skip = True )
+  WriteVideoFrame ( self )
+  StopVideo ( self )
 
   SelectPointData (
         self,
@@ -82,10 +125,23 @@ class MeshViz ( object ) :
         self,
         sphere_radius )
 
+  ShareData (
+        self,
+        data_val,
+        data_loc )
   Render (
         self,
         point_data,
         cell_data )
+  RenderChange (
+        self,
+        point_index,
+        point_val,
+        cell_index,
+        cell_val )
+  RenderScene (
+        self,
+        flag_glyph = True )
   IRender (
         self,
         point_data,
@@ -97,7 +153,16 @@ class MeshViz ( object ) :
   # -- INITIALIZATION
   # ----------------------------------------------------------------------------
 
-  def __init__ ( self ) :
+  ##
+  # @param offscreen = renders without any display (default: False).
+  # @remarks The offscreen window is the first one of OFFSCREEN_WINDOW
+  #          provided by VTK (EGL, then OSMesa), else a vtkRenderWindow with
+  #          offscreen rendering on (headless VTK builds select the offscreen
+  #          backend themselves).
+  #
+  def __init__ (
+        self,
+        offscreen = False ) :
 
     # -- Dataset
     self.mesh = vtkDataObject()
@@ -113,19 +178,42 @@ class MeshViz ( object ) :
     self.cell_cscale = vtkColorTransferFunction()
     self.glyph = vtkGlyph3D()
 
+    # NumPy arrays shared by point_data and cell_data (see ShareData), NumPy
+    # views of point_data and cell_data (see RenderChange)
+    self.point_ref = None
+    self.cell_ref = None
+    self.point_val = numpy.array([])
+    self.cell_val = numpy.array([])
+
     # -- Display
 
     # 3D scene
     self.renderer = vtkRenderer()
-    self.window = vtkRenderWindow()
+    self.offscreen = offscreen
+    self.window = None
+    if (offscreen) :
+      for class_name in MeshViz.OFFSCREEN_WINDOW :
+        if (hasattr(vtk, class_name)) :
+          self.window = getattr(vtk, class_name)()
+          break
+    if (self.window is None) :
+      self.window = vtkRenderWindow()
+    if (offscreen) :
+      self.window.OffScreenRenderingOn()
     self.window.AddRenderer(self.renderer)
 
     # Mesh
+    self.mesh_mapper = vtkDataSetMapper()
+    self.mesh_mapper.UseLookupTableScalarRangeOn()
     self.mesh_actor = vtkActor()
+    self.mesh_actor.SetMapper(self.mesh_mapper)
     self.renderer.AddActor(self.mesh_actor)
 
     # Glyph
+    self.glyph_mapper = vtkPolyDataMapper()
+    self.glyph_mapper.UseLookupTableScalarRangeOn()
     self.glyph_actor = vtkActor()
+    self.glyph_actor.SetMapper(self.glyph_mapper)
     self.renderer.AddActor(self.glyph_actor)
 
     # Light (paraview)
@@ -155,12 +243,44 @@ class MeshViz ( object ) :
     self.jpg_writer = vtkJPEGWriter()
     self.png_writer = vtkPNGWriter()
 
+    # Image filter (one for all screenshots)
+    self.img_filter = vtkWindowToImageFilter()
+    self.img_filter.SetInput(self.window)
+    if (offscreen) :
+      self.img_filter.ReadFrontBufferOff()
+
+    # Frame writer threads, their last error, number of frames written and
+    # frames per second (see StartFrameWriter)
+    self.frame_queue = None
+    self.frame_thread = []
+    self.frame_lock = threading.Lock()
+    self.frame_err_msg = ""
+    self.frame_btime = 0.0
+    self.numb_frame = 0
+    self.frame_rate = 0.0
+
+    # Video: file and its writer (None: not open yet), frame rate, one frame
+    # kept out of video_stride, unchanged frames skipped, number of calls,
+    # pixels of the last frame, JPEG encoder (see StartVideo)
+    self.video_file = ""
+    self.video = None
+    self.video_rate = 25.0
+    self.video_stride = 1
+    self.video_skip = True
+    self.numb_video_call = 0
+    self.video_pixel = numpy.array([])
+    self.video_writer = vtkJPEGWriter()
+    self.video_writer.WriteToMemoryOn()
+    self.video_writer.SetInputConnection(self.img_filter.GetOutputPort())
+
     # -- Error handling
     self.err_code = MeshViz.SUCCESS
     self.err_msg = ""
 
 
-  #enddef __init__ ( self )
+  #enddef __init__ (
+#        self,
+#        offscreen = False )
   # ----------------------------------------------------------------------------
 
   ##
@@ -268,12 +388,66 @@ class MeshViz ( object ) :
 #        file_name )
   # ----------------------------------------------------------------------------
 
+  ##
+  # @brief Builds mesh dataset from a Mesh object.
+  # @param mesh = mesh dataset with its data fields (Mesh).
+  # @remarks Avoids reading the file again when the Mesh object was loaded
+  #          by Mesh.ReadAllFromFileVtk. Data fields are converted to double
+  #          precision arrays.
+  #
+  def ReadMeshFromMesh (
+        self,
+        mesh ) :
+
+    # -- init
+
+    # error handling
+    self.err_code = MeshViz.SUCCESS
+    self.err_msg = ""
+
+    # output
+    self.mesh = vtkUnstructuredGrid()
+    self.numb_point = mesh.numb_node
+    self.numb_cell = mesh.numb_elem
+
+    # -- build points
+    points = vtkPoints()
+    points.SetData(numpy_to_vtk(mesh.node_coord.astype(numpy.float64),
+                                deep=1))
+    self.mesh.SetPoints(points)
+
+    # -- build cells
+    cells = vtkCellArray()
+    cells.SetCells(mesh.numb_elem, numpy_to_vtkIdTypeArray(
+                   mesh.BuildCellList().astype(ID_TYPE_CODE), deep=1))
+    self.mesh.SetCells(numpy_to_vtk(mesh.elem_type.astype(numpy.uint8),
+                                    deep=1), cells)
+
+    # -- add data fields
+    for i in range(0, mesh.numb_pdata) :
+      array = numpy_to_vtk(mesh.pdata_val[i].astype(numpy.float64), deep=1)
+      array.SetName(mesh.pdata_name[i])
+      self.mesh.GetPointData().AddArray(array)
+    for i in range(0, mesh.numb_cdata) :
+      array = numpy_to_vtk(mesh.cdata_val[i].astype(numpy.float64), deep=1)
+      array.SetName(mesh.cdata_name[i])
+      self.mesh.GetCellData().AddArray(array)
+
+    return
+
+  #enddef ReadMeshFromMesh (
+#        self,
+#        mesh )
+  # ----------------------------------------------------------------------------
+
   ##
   # @brief Writes the 3D scene screenshot to file.
   # @param file_name = full name to the file.
   # @param file_format = image file format (default: "jpg").
   #                    {"jpg"|"png"}
   # @param img_zoom = screenshot zoom factor (default: 1).
+  # @remarks Once StartFrameWriter is called, the screenshot is copied and
+  #          written by a writer thread, and the call returns at once.
   #
   def WriteScreenshotToFile (
         self,
@@ -291,12 +465,6 @@ class MeshViz ( object ) :
     # args
     file_format = file_format.lower().strip()
 
-    # -- build screenshot
-    img_filter = vtkWindowToImageFilter()
-    img_filter.SetInput(self.window)
-    img_filter.SetMagnification(img_zoom)
-    img_filter.Update()
-
     # -- select image writer
     if (file_format == "jpg") :
       img_writer = self.jpg_writer
@@ -304,14 +472,31 @@ class MeshViz ( object ) :
       img_writer = self.png_writer
     else :
       self.err_code = MeshViz.FAILURE
-      self.err_msg = err_header + "*** Error: " + file_format
+      self.err_msg = err_header + " Error: " + file_format
       self.err_msg += " image format not supported."
       return
 
+    # -- build screenshot
+    self.img_filter.SetMagnification(img_zoom)
+    self.img_filter.Modified()
+    self.img_filter.Update()
+
+    # -- hand over to the writer threads
+    if (self.frame_queue is not None) :
+      if (self.frame_err_msg != "") :
+        self.err_code = MeshViz.FAILURE
+        self.err_msg = err_header + " Error: " + self.frame_err_msg
+        return
+      image = vtkImageData()
+      image.DeepCopy(self.img_filter.GetOutput())
+      self.frame_queue.put((file_name, file_format, image))
+      return
+
     # -- write to file
     img_writer.SetFileName(file_name)
-    img_writer.SetInputData(img_filter.GetOutput())
+    img_writer.SetInputData(self.img_filter.GetOutput())
     img_writer.Write()
+    self.numb_frame += 1
 
     return
 
@@ -321,6 +506,262 @@ class MeshViz ( object ) :
 #        file_format = "jpg" )
   # ----------------------------------------------------------------------------
 
+  ##
+  # @brief Starts the threads writing the screenshots to file.
+  # @param numb_thread = number of writer threads (default: 2).
+  # @remarks The queue of screenshots waiting to be written holds at most
+  #          two screenshots per thread; rendering waits when it is full. The
+  #          image writers run while the next frame is rendered, as far as
+  #          VTK releases the Python lock during their calls.
+  #
+  def StartFrameWriter (
+        self,
+        numb_thread = 2 ) :
+
+    # -- init
+
+    # error handling
+    self.err_code = MeshViz.SUCCESS
+    self.err_msg = ""
+    err_header = "*** [" + MeshViz.CLASS_NAME + ".StartFrameWriter]"
+
+    # -- stop the previous threads
+    self.StopFrameWriter()
+    if (self.err_code == MeshViz.FAILURE) :
+      self.err_msg = err_header + "\n" + self.err_msg
+      return
+
+    # -- start threads
+    self.frame_queue = queue.Queue(2 * numb_thread)
+    self.frame_thread = [threading.Thread(target=self.WriteFrameWorker)
+                         for i in range(0, numb_thread)]
+    for thread in self.frame_thread :
+      thread.daemon = True
+      thread.start()
+    self.numb_frame = 0
+    self.frame_rate = 0.0
+    self.frame_btime = time.time()
+
+    return
+
+  #enddef StartFrameWriter (
+#        self,
+#        numb_thread = 2 )
+  # ----------------------------------------------------------------------------
+
+  ##
+  # @brief Waits for the screenshots being written, then stops the writer
+  #        threads.
+  # @remarks The frame export throughput since StartFrameWriter is stored
+  #          in frame_rate (frames per second).
+  #
+  def StopFrameWriter ( self ) :
+
+    # -- init
+
+    # error handling
+    self.err_code = MeshViz.SUCCESS
+    self.err_msg = ""
+    err_header = "*** [" + MeshViz.CLASS_NAME + ".StopFrameWriter]"
+
+    if (self.frame_queue is None) :
+      return
+
+    # -- stop threads
+    for thread in self.frame_thread :
+      self.frame_queue.put(None)
+    for thread in self.frame_thread :
+      thread.join()
+    self.frame_queue = None
+    self.frame_thread = []
+
+    # -- frames per second
+    wclock_time = time.time() - self.frame_btime
+    if (wclock_time > 0) :
+      self.frame_rate = self.numb_frame / wclock_time
+
+    # -- check error
+    if (self.frame_err_msg != "") :
+      self.err_code = MeshViz.FAILURE
+      self.err_msg = err_header + " Error: " + self.frame_err_msg
+      self.frame_err_msg = ""
+
+    return
+
+  #enddef StopFrameWriter ( self )
+  # ----------------------------------------------------------------------------
+
+  ##
+  # @brief Writes the screenshots of the queue to file, until a None item
+  #        (writer thread of StartFrameWriter).
+  # @remarks Each thread has its own image writers.
+  #
+  def WriteFrameWorker ( self ) :
+
+    img_writer = {"jpg" : vtkJPEGWriter(), "png" : vtkPNGWriter()}
+    frame = self.frame_queue.get()
+    while (frame is not None) :
+      (file_name, file_format, image) = frame
+      img_writer[file_format].SetFileName(file_name)
+      img_writer[file_format].SetInputData(image)
+      img_writer[file_format].Write()
+      with self.frame_lock :
+        if (img_writer[file_format].GetErrorCode() != 0) :
+          self.frame_err_msg = "cannot write " + file_name
+        else :
+          self.numb_frame += 1
+      frame = self.frame_queue.get()
+
+    return
+
+  #enddef WriteFrameWorker ( self )
+  # ----------------------------------------------------------------------------
+
+  ##
+  # @brief Starts writing the 3D scene to a Motion-JPEG AVI video, instead of
+  #        one screenshot file per frame (see WriteVideoFrame).
+  # @param file_name = full name to the file.
+  # @param frame_rate = frames per second of the video (default: 25.0).
+  # @param frame_stride = one frame kept out of frame_stride calls of
+  #                     WriteVideoFrame (default: 1).
+  # @param flag_skip = the frames with the same pixels as the previous one are
+  #                  not encoded, but written as repeats (default: True).
+  # @remarks The video is opened at the first frame (frame size), and is
+  #          split into several files beyond AviWriter.AVI_MAX_SIZE.
+  #
+  def StartVideo (
+        self,
+        file_name,
+        frame_rate = 25.0,
+        frame_stride = 1,
+        flag_skip = True ) :
+
+    # -- init
+
+    # error handling
+    self.err_code = MeshViz.SUCCESS
+    self.err_msg = ""
+    err_header = "*** [" + MeshViz.CLASS_NAME + ".StartVideo]"
+
+    # -- check video
+    if (self.video_file != "") :
+      self.err_code = MeshViz.FAILURE
+      self.err_msg = err_header + " Error: " + self.video_file + " started."
+      return
+    if ((frame_rate <= 0) or (frame_stride < 1)) :
+      self.err_code = MeshViz.FAILURE
+      self.err_msg = err_header + " Error: invalid frame rate or stride."
+      return
+
+    # -- start video
+    self.video_file = file_name
+    self.video = None
+    self.video_rate = frame_rate
+    self.video_stride = int(frame_stride)
+    self.video_skip = flag_skip
+    self.numb_video_call = 0
+    self.video_pixel = numpy.array([])
+
+    return
+
+  #enddef StartVideo (
+#        self,
+#        file_name,
+#        frame_rate = 25.0,
+#        frame_stride = 1,
+#        flag_skip = True )
+  # ----------------------------------------------------------------------------
+
+  ##
+  # @brief Appends the 3D scene to the video (see StartVideo).
+  # @remarks The frame is encoded in memory and appended to the video file,
+  #          unless it is dropped (frame_stride) or skipped (same pixels).
+  #
+  def WriteVideoFrame ( self ) :
+
+    # -- init
+
+    # error handling
+    self.err_code = MeshViz.SUCCESS
+    self.err_msg = ""
+    err_header = "*** [" + MeshViz.CLASS_NAME + ".WriteVideoFrame]"
+
+    # -- check video
+    if (self.video_file == "") :
+      self.err_code = MeshViz.FAILURE
+      self.err_msg = err_header + " Error: no video started."
+      return
+
+    # -- frame stride
+    self.numb_video_call += 1
+    if ((self.numb_video_call - 1) % self.video_stride != 0) :
+      return
+
+    # -- capture screenshot
+    self.img_filter.SetMagnification(1)
+    self.img_filter.Modified()
+    self.img_filter.Update()
+    img = self.img_filter.GetOutput()
+    pixel = vtk_to_numpy(img.GetPointData().GetScalars())
+
+    # -- open video (frame size)
+    if (self.video is None) :
+      self.video = AviWriter()
+      (width, height) = img.GetDimensions()[0:2]
+      self.video.Open(self.video_file, width, height, self.video_rate)
+      if (self.video.err_code == AviWriter.FAILURE) :
+        self.err_code = MeshViz.FAILURE
+        self.err_msg = err_header + "\n" + self.video.err_msg
+        self.video = None
+        return
+
+    # -- write frame: repeat, or encoded screenshot
+    if (self.video_skip and numpy.array_equal(pixel, self.video_pixel)) :
+      self.video.WriteFrame()
+    else :
+      self.video_writer.Modified()
+      self.video_writer.Write()
+      self.video.WriteFrame(vtk_to_numpy(
+                            self.video_writer.GetResult()).tostring())
+      self.video_pixel = pixel.copy()
+    if (self.video.err_code == AviWriter.FAILURE) :
+      self.err_code = MeshViz.FAILURE
+      self.err_msg = err_header + "\n" + self.video.err_msg
+      return
+
+    return
+
+  #enddef WriteVideoFrame ( self )
+  # ----------------------------------------------------------------------------
+
+  ##
+  # @brief Stops writing the video and closes its file.
+  # @remarks The numbers of frames are then in video.numb_frame and
+  #          video.numb_repeat (None if no frame was written).
+  #
+  def StopVideo ( self ) :
+
+    # -- init
+
+    # error handling
+    self.err_code = MeshViz.SUCCESS
+    self.err_msg = ""
+    err_header = "*** [" + MeshViz.CLASS_NAME + ".StopVideo]"
+
+    # -- close video
+    self.video_file = ""
+    if (self.video is not None) :
+      self.video.Close()
+      if (self.video.err_code == AviWriter.FAILURE) :
+        self.err_code = MeshViz.FAILURE
+        self.err_msg = err_header + "\n" + self.video.err_msg
+        return
+
+    return
+
+  #enddef StopVideo ( self )
+  # ----------------------------------------------------------------------------
+
   # ----------------------------------------------------------------------------
   # -- VISUALIZATION
   # ----------------------------------------------------------------------------
@@ -347,6 +788,8 @@ class MeshViz ( object ) :
 
     # -- get array
     self.point_data = self.mesh.GetPointData().GetArray(self.point_dname)
+    self.point_ref = None
+    self.point_val = vtk_to_numpy(self.point_data)
 
     return
 
@@ -377,6 +820,8 @@ class MeshViz ( object ) :
 
     # -- get array
     self.cell_data = self.mesh.GetCellData().GetArray(self.cell_dname)
+    self.cell_ref = None
+    self.cell_val = vtk_to_numpy(self.cell_data)
 
     return
 
@@ -499,7 +944,7 @@ class MeshViz ( object ) :
     # -- handle scale type error
     else :
       self.err_code = MeshViz.FAILURE
-      self.err_msg = err_header + "*** Error: " + scale_type
+      self.err_msg = err_header + " Error: " + scale_type
       self.err_msg += " scaling not supported."
 
 
@@ -609,10 +1054,85 @@ class MeshViz ( object ) :
 #        sphere_radius )
   # ----------------------------------------------------------------------------
 
+  ##
+  # @brief Replaces the selected point or cell data array by a VTK array
+  #        sharing the memory of a NumPy array.
+  # @param data_val = values of the data array (NumPy array or iterable
+  #                 object).
+  # @param data_loc = location of the data array.
+  #                 {"point"|"cell"}
+  # @remarks The NumPy array is shared (no copy) when it is contiguous with an
+  #          integer or floating point type, as node_step and link_step of
+  #          NetSim, and is referenced until the next call. Its later updates
+  #          in place are rendered once the VTK array is marked modified (see
+  #          Render). Other values are copied to a new double precision array.
+  #
+  def ShareData (
+        self,
+        data_val,
+        data_loc ) :
+
+    # -- init
+
+    # error handling
+    self.err_code = MeshViz.SUCCESS
+    self.err_msg = ""
+    err_header = "*** [" + MeshViz.CLASS_NAME + ".ShareData]"
+
+    # -- select array
+    if (data_loc == "point") :
+      (numb_val, array_name) = (self.numb_point, self.point_dname)
+      data_set = self.mesh.GetPointData()
+    elif (data_loc == "cell") :
+      (numb_val, array_name) = (self.numb_cell, self.cell_dname)
+      data_set = self.mesh.GetCellData()
+    else :
+      self.err_code = MeshViz.FAILURE
+      self.err_msg = err_header + " Error: " + str(data_loc)
+      self.err_msg += " data location not supported."
+      return
+
+    # -- get NumPy array (copy only if needed)
+    data_ref = data_val
+    data_val = numpy.ascontiguousarray(data_val)
+    if (data_val.dtype.kind not in "iuf") :
+      data_val = data_val.astype(numpy.float64)
+    if (data_val.shape != (numb_val,)) :
+      self.err_code = MeshViz.FAILURE
+      self.err_msg = err_header + " Error: " + str(data_val.size)
+      self.err_msg += " values for " + str(numb_val) + " " + data_loc + "s."
+      return
+    if (data_val is not data_ref) :
+      data_ref = None
+
+    # -- share memory (the VTK array holds a reference to data_val)
+    array = numpy_to_vtk(data_val, deep=0)
+    array.SetName(array_name)
+    data_set.AddArray(array)
+    if (data_loc == "point") :
+      (self.point_data, self.point_ref) = (array, data_ref)
+      self.point_val = data_val
+    else :
+      data_set.SetActiveScalars(array_name)
+      (self.cell_data, self.cell_ref) = (array, data_ref)
+      self.cell_val = data_val
+
+    return
+
+  #enddef ShareData (
+#        self,
+#        data_val,
+#        data_loc )
+  # ----------------------------------------------------------------------------
+
   ##
   # @brief Renders 3D scene including data visualization.
   # @param point_data = new values for point data array (iterable object).
   # @param cell_data = new values for cell data array (iterable object).
+  # @remarks The data arrays passed at the previous call are shared, not
+  #          copied (see ShareData): passing the same NumPy arrays again,
+  #          updated in place, only marks the VTK arrays as modified. The
+  #          mappers are kept from one call to the next.
   #
   def Render (
         self,
@@ -624,37 +1144,133 @@ class MeshViz ( object ) :
     # error handling
     self.err_code = MeshViz.SUCCESS
     self.err_msg = ""
+    err_header = "*** [" + MeshViz.CLASS_NAME + ".Render]"
 
     # -- update
 
     # point data
-    for i in range(0, self.numb_point) :
-      self.point_data.SetTuple1(i, point_data[i])
+    if (point_data is self.point_ref) :
+      self.point_data.Modified()
+    else :
+      self.ShareData(point_data, "point")
+      if (self.err_code == MeshViz.FAILURE) :
+        self.err_msg = err_header + "\n" + self.err_msg
+        return
 
     # cell data
-    for i in range(0, self.numb_cell) :
-      self.cell_data.SetTuple1(i, cell_data[i])
+    if (cell_data is self.cell_ref) :
+      self.cell_data.Modified()
+    else :
+      self.ShareData(cell_data, "cell")
+      if (self.err_code == MeshViz.FAILURE) :
+        self.err_msg = err_header + "\n" + self.err_msg
+        return
 
-    # glyph
-    self.mesh.GetPointData().SetActiveScalars(self.point_dname)
-    self.glyph.Update()
-    self.mesh.GetPointData().SetActiveScalars(None)
+    # -- render
+    self.RenderScene()
+
+    return
+
+  #enddef Render (
+#        self,
+#        point_data,
+#        cell_data )
+  # ----------------------------------------------------------------------------
+
+  ##
+  # @brief Renders 3D scene after updating some values of the data arrays.
+  # @param point_index = indices of the updated point values (NumPy array).
+  # @param point_val = new point values (NumPy array or scalar).
+  # @param cell_index = indices of the updated cell values (NumPy array).
+  # @param cell_val = new cell values (NumPy array or scalar).
+  # @remarks Only the given values are written, and the glyphs are rebuilt
+  #          only if some point values are updated, so that the cost of the
+  #          update depends on the number of changes, not on the mesh size.
+  #          The change sets are given by NetSim.GetChange, e.g.
+  #          (node, link) = sim.GetChange()
+  #          viz.RenderChange(node, sim.node_step[node], link,
+  #                           sim.link_step[link])
+  #
+  def RenderChange (
+        self,
+        point_index,
+        point_val,
+        cell_index,
+        cell_val ) :
+
+    # -- init
+
+    # error handling
+    self.err_code = MeshViz.SUCCESS
+    self.err_msg = ""
+    err_header = "*** [" + MeshViz.CLASS_NAME + ".RenderChange]"
+
+    # -- update
+
+    # point data
+    flag_glyph = (len(point_index) > 0)
+    if (flag_glyph) :
+      try :
+        self.point_val[point_index] = point_val
+      except (IndexError, ValueError) :
+        self.err_code = MeshViz.FAILURE
+        self.err_msg = err_header + " Error: invalid point indices or values."
+        return
+      self.point_data.Modified()
+
+    # cell data
+    if (len(cell_index) > 0) :
+      try :
+        self.cell_val[cell_index] = cell_val
+      except (IndexError, ValueError) :
+        self.err_code = MeshViz.FAILURE
+        self.err_msg = err_header + " Error: invalid cell indices or values."
+        return
+      self.cell_data.Modified()
+
+    # -- render
+    self.RenderScene(flag_glyph)
+
+    return
+
+  #enddef RenderChange (
+#        self,
+#        point_index,
+#        point_val,
+#        cell_index,
+#        cell_val )
+  # ----------------------------------------------------------------------------
+
+  ##
+  # @brief Renders 3D scene from the current data arrays.
+  # @param flag_glyph = rebuilds the glyphs from the point data (default:
+  #                   True).
+  #
+  def RenderScene (
+        self,
+        flag_glyph = True ) :
+
+    # -- init
+
+    # error handling
+    self.err_code = MeshViz.SUCCESS
+    self.err_msg = ""
+
+    # -- update glyph
+    if (flag_glyph) :
+      self.mesh.GetPointData().SetActiveScalars(self.point_dname)
+      self.glyph.Update()
+      self.mesh.GetPointData().SetActiveScalars(None)
 
     # -- render
 
     # mesh
-    mesh_mapper = vtkDataSetMapper()
-    mesh_mapper.SetInputData(self.mesh)
-    mesh_mapper.SetLookupTable(self.cell_cscale)
-    mesh_mapper.UseLookupTableScalarRangeOn()
-    self.mesh_actor.SetMapper(mesh_mapper)
+    self.mesh_mapper.SetInputData(self.mesh)
+    self.mesh_mapper.SetLookupTable(self.cell_cscale)
 
     # glyph
-    glyph_mapper = vtkPolyDataMapper()
-    glyph_mapper.SetInputData(self.glyph.GetOutput())
-    glyph_mapper.SetLookupTable(self.point_cscale)
-    glyph_mapper.UseLookupTableScalarRangeOn()
-    self.glyph_actor.SetMapper(glyph_mapper)
+    self.glyph_mapper.SetInputData(self.glyph.GetOutput())
+    self.glyph_mapper.SetLookupTable(self.point_cscale)
 
     # 3D scene
     self.window.Render()
@@ -665,10 +1281,9 @@ class MeshViz ( object ) :
 
     return
 
-  #enddef Render (
+  #enddef RenderScene (
 #        self,
-#        point_data,
-#        cell_data )
+#        flag_glyph = True )
   # ----------------------------------------------------------------------------
 
   ##
@@ -709,7 +1324,8 @@ class MeshViz ( object ) :
   # ----------------------------------------------------------------------------
 
   ##
-  # @brief Closes the display window.
+  # @brief Closes the display window, once the screenshots and the video are
+  #        written.
   #
   def Close ( self ) :
 
@@ -718,6 +1334,16 @@ class MeshViz ( object ) :
     # error handling
     self.err_code = MeshViz.SUCCESS
     self.err_msg = ""
+    err_header = "*** [" + MeshViz.CLASS_NAME + ".Close]"
+
+    # -- write screenshots and video
+    self.StopFrameWriter()
+    err_msg = [self.err_msg]
+    self.StopVideo()
+    err_msg = [msg for msg in err_msg + [self.err_msg] if (msg != "")]
+    if (len(err_msg) > 0) :
+      self.err_code = MeshViz.FAILURE
+      self.err_msg = err_header + "\n" + "\n".join(err_msg)
 
     # -- close
     self.window.Finalize()
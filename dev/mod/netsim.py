@@ -8,9 +8,18 @@
 # @class NetSim
 #
 
+# -- Standard modules
+import os
+import heapq
+import bisect
+import threading
+
 # -- Third-party modules
 import numpy
 
+# -- MRG modules
+from indexdtype import IndexDtype, AsIndex
+
 ##
 # @brief An interactive tool for network simulation.
 #
@@ -28,6 +37,34 @@ class NetSim ( object ) :
   ST_WORK = 0
   ST_COMM = 1
 
+  # Network node action at next step (engines "VECTOR" and "EVENT")
+  ACT_LOCAL = 0
+  ACT_CONNECT = 1
+  ACT_TRANSFER = 2
+
+  # Simulation engines
+  ENGINE = ["LOOP", "VECTOR", "EVENT"]
+
+  # Logged events: a node waits for its targeted neighbor, is connected to it,
+  # ends an iteration
+  LOG_WAIT = 0
+  LOG_CONNECT = 1
+  LOG_ITER = 2
+  LOG_EVENT = [LOG_WAIT, LOG_CONNECT, LOG_ITER]
+  LOG_NAME = ["WAIT", "CONNECT", "ITER"]
+
+  # Initial number of records of the event log
+  LOG_SIZE = 1 << 12
+
+  # Event log file formats
+  LOG_FORMAT = ["BIN", "CSV"]
+
+  # Attributes saved in checkpoints, besides the event log
+  CKPT_STATE = ["node_size", "link_size", "numb_iter", "glob_iter",
+                "node_iter", "node_conn", "node_state", "node_action",
+                "node_step", "link_step", "flag_end", "numb_step",
+                "glob_step"]
+
   # Class description
   CLASS_NAME = "NetSim"
   CLASS_AUTHOR = "G. G.-Benissan, MRG, CentraleSupelec, France"
@@ -41,9 +78,76 @@ class NetSim ( object ) :
         p_node2node,
         node_size = numpy.array([]),
         link_size = numpy.array([]),
-        numb_iter = 1 )
+        numb_iter = 1,
+        engine = "LOOP",
+        log_event = [] )
 
   Step ( self )
+  StepVector ( self )
+  StepTo (
+        self,
+        glob_step = None )
+
+  StepToEvent (
+        self,
+        glob_step )
+
+  InitEvent ( self )
+  PushEvent (
+        self,
+        step,
+        node )
+
+  WakeEvent (
+        self,
+        step,
+        node )
+
+  SettleEvent (
+        self,
+        step )
+
+  GetLinkStepEvent (
+        self,
+        link,
+        step,
+        node )
+
+  ScheduleLinkEvent (
+        self,
+        link )
+
+  GetChange ( self )
+  LogEvent (
+        self,
+        event,
+        node_iter,
+        node,
+        neighb )
+
+  GetLog (
+        self,
+        log_event = None )
+
+  WriteLog (
+        self,
+        file_name,
+        file_format = "BIN",
+        log_event = None )
+
+  WriteCheckpoint (
+        self,
+        file_name = None )
+
+  WriteCheckpointFile (
+        self,
+        file_name,
+        state )
+
+  WaitCheckpoint ( self )
+  ReadCheckpoint (
+        self,
+        file_name = None )
   """
 
   # ----------------------------------------------------------------------------
@@ -65,7 +169,15 @@ class NetSim ( object ) :
   #             [default: numpy.array([20]*numb_link, dtype=int)]
   # @param numb_iter = number of iterations
   #             [default: 1]
-  # @remarks There is not any copy of the input arrays.
+  # @param engine = simulation engine, either "LOOP" (one Python call per
+  #             node), "VECTOR" (all nodes at once) or "EVENT" (jumps from
+  #             one state change to the next, see StepTo), same outputs
+  #             [default: "LOOP"]
+  # @param log_event = types of the events recorded in the event log, among
+  #             NetSim.LOG_EVENT; none turns the log off (see LogEvent)
+  #             [default: []]
+  # @remarks There is not any copy of the input arrays, unless they are
+  #          converted to their index dtype (see indexdtype).
   #
   def __init__ (
         self,
@@ -76,14 +188,16 @@ class NetSim ( object ) :
         p_node2node,
         node_size = numpy.array([]),
         link_size = numpy.array([]),
-        numb_iter = 1 ) :
+        numb_iter = 1,
+        engine = "LOOP",
+        log_event = [] ) :
 
     # -- Topology
     self.numb_node = numb_node
     self.numb_link = numb_link
-    self.node2link = node2link
-    self.node2node = node2node
-    self.p_node2node = p_node2node
+    self.node2link = AsIndex(node2link, numb_link)
+    self.node2node = AsIndex(node2node, numb_node)
+    self.p_node2node = AsIndex(p_node2node, len(node2node))
 
     # -- Features
 
@@ -111,11 +225,50 @@ class NetSim ( object ) :
     self.node_state = NetSim.ST_WORK + numpy.zeros(self.numb_node, dtype=int)
     self.__Step = [self.StepNodeLocal] * self.numb_node
 
+    # Engine, action of each node
+    self.engine = engine
+    self.node_action = NetSim.ACT_LOCAL + numpy.zeros(self.numb_node,
+                                                      dtype=numpy.int8)
+
+    # Each link joins two nodes (engine "VECTOR")
+    self.flag_link_pair = (numpy.bincount(self.node2link[0:self.p_node2node[
+                             self.numb_node]], minlength=1).max() <= 2)
+
+    # Number of nodes at each iteration (engine "VECTOR")
+    self.iter_count = numpy.zeros(max(self.numb_iter.max(), 0) + 2
+                                  if (self.numb_node > 0) else 2, dtype=int)
+    self.iter_count[0] = self.numb_node
+
+    # Event queue (engine "EVENT", built at the first step, see InitEvent)
+    self.event_queue = None
+
     # Output
     self.node_step = numpy.zeros(self.numb_node, dtype=int)
     self.link_step = numpy.zeros(self.numb_link, dtype=int)
     self.flag_end = False
     self.numb_step = numpy.zeros(min(self.numb_iter), dtype=int)
+    self.glob_step = 0
+
+    # Output at the last call of GetChange (None: not called yet)
+    self.change_node_step = None
+    self.change_link_step = None
+
+    # Event log: recorded event types, records (see LogEvent)
+    self.log_flag = [(event in log_event) for event in NetSim.LOG_EVENT]
+    index_dtype = IndexDtype(self.numb_node)
+    self.log = numpy.zeros(NetSim.LOG_SIZE if (True in self.log_flag) else 0,
+                           dtype=[("step", numpy.int64), ("iter", numpy.int32),
+                                  ("node", index_dtype),
+                                  ("neighb", index_dtype),
+                                  ("event", numpy.int8)])
+    self.numb_log = 0
+
+    # Checkpoints: file, number of steps between two checkpoints (0: none),
+    # writer thread and its last error (see WriteCheckpoint)
+    self.ckpt_file = None
+    self.ckpt_step = 0
+    self.ckpt_thread = None
+    self.ckpt_err_msg = ""
 
     # -- Error handling
 
@@ -134,7 +287,9 @@ class NetSim ( object ) :
 #        p_node2node,
 #        node_size = numpy.array([]),
 #        link_size = numpy.array([]),
-#        numb_iter = 1 ) :
+#        numb_iter = 1,
+#        engine = "LOOP",
+#        log_event = [] ) :
   # ----------------------------------------------------------------------------
 
   # ----------------------------------------------------------------------------
@@ -153,23 +308,945 @@ class NetSim ( object ) :
     self.err_msg = ""
     err_header = "*** [" + NetSim.CLASS_NAME + ".Step]"
 
-    # -- step
-    for i in range(0, self.numb_node) :
-      if (self.node_iter[i] < self.numb_iter[i]) :
-        self.__Step[i](i)
+    # -- check engine
+    if (self.engine not in NetSim.ENGINE) :
+      self.err_code = NetSim.FAILURE
+      self.err_msg = err_header + " Error: unknown engine " + str(self.engine)
+      return
+    if (self.engine == "EVENT") :
+      self.StepTo(self.glob_step + 1)
+      return
+
+    if (self.engine == "VECTOR") :
+      self.StepVector()
+
+    else :
+
+      # -- step
+      for i in range(0, self.numb_node) :
+        if (self.node_iter[i] < self.numb_iter[i]) :
+          self.__Step[i](i)
+          if (self.err_code == NetSim.FAILURE) :
+            self.err_msg = err_header + "\n" + self.err_msg
+            return
+
+      # -- update output
+      self.numb_step[self.glob_iter] += 1
+      self.glob_step += 1
+      if (self.glob_iter not in self.node_iter) :
+        self.glob_iter += 1
+      self.flag_end = (False not in (self.node_iter == self.numb_iter))
+
+    # -- checkpoint
+    if ((self.ckpt_step > 0) and (self.glob_step % self.ckpt_step == 0)) :
+      self.WriteCheckpoint()
+      if (self.err_code == NetSim.FAILURE) :
+        self.err_msg = err_header + "\n" + self.err_msg
+
+    return
+
+  # END def Step ( self ) :
+  # ----------------------------------------------------------------------------
+
+  ##
+  # @brief Performs one atomic simulation step, all nodes at once (engine
+  #        "VECTOR").
+  # @remarks Gives the same outputs as the "LOOP" engine, which updates the
+  #          nodes one by one by increasing number: a node sees the new state
+  #          of the nodes of smaller number and the old state of the others.
+  #          Local and transfer steps are applied first, the transfers of a
+  #          link by increasing node number; connection attempts then read the
+  #          new state of the neighbors of smaller number. The events of
+  #          the step are logged by increasing node number, as well.
+  #
+  def StepVector ( self ) :
+
+    # -- init
+
+    # error handling
+    self.err_code = NetSim.SUCCESS
+    self.err_msg = ""
+
+    # first record of the step in the event log
+    numb_log = self.numb_log
+
+    # -- nodes of each action (active nodes only)
+    node_action = self.node_action
+    node_action = numpy.where(self.node_iter < self.numb_iter, node_action, -1)
+    local = numpy.flatnonzero(node_action == NetSim.ACT_LOCAL)
+    connect = numpy.flatnonzero(node_action == NetSim.ACT_CONNECT)
+    transfer = numpy.flatnonzero(node_action == NetSim.ACT_TRANSFER)
+
+    # -- old state of the targeted neighbors
+    neighb = self.node2node[self.node_conn[connect]]
+    neighb_conn = self.node_conn[neighb]
+    neighb_state = self.node_state[neighb]
+
+    # -- local steps
+    self.node_step[local] += 1
+    node = local[self.node_step[local] == self.node_size[local]]
+    self.node_step[node] = 0
+    self.node_state[node] = NetSim.ST_COMM
+    self.node_action[node] = NetSim.ACT_CONNECT
+    if (self.log_flag[NetSim.LOG_WAIT]) :
+      self.LogEvent(NetSim.LOG_WAIT, self.node_iter[node], node,
+                    self.node2node[self.node_conn[node]])
+
+    # -- data transfer steps, by rank of the node among those of its link
+    link = self.node2link[self.node_conn[transfer]]
+    if (self.flag_link_pair) :
+
+      # rank 1 if the other node of the link transfers too, with a smaller
+      # number
+      other = self.node2node[self.node_conn[transfer]]
+      rank = ((other < transfer)
+              & (node_action[other] == NetSim.ACT_TRANSFER)
+              & (self.node2link[self.node_conn[other]] == link)).astype(int)
+
+    else :
+
+      # sort by link, then by node number
+      order = numpy.lexsort((transfer, link))
+      transfer = transfer[order]
+      link = link[order]
+      rank = numpy.arange(len(link))
+      if (len(link) > 0) :
+        first = numpy.concatenate(([True], link[1:] != link[:-1]))
+        rank -= numpy.maximum.accumulate(numpy.where(first, rank, 0))
+    node_end = [numpy.zeros(0, dtype=transfer.dtype)]
+    for cur_rank in range(0, rank.max() + 1 if (len(rank) > 0) else 0) :
+      node = transfer[rank == cur_rank]
+      cur_link = link[rank == cur_rank]
+
+      # link state
+      self.link_step[cur_link] += 1
+      is_end = (self.link_step[cur_link] >= (self.link_size[cur_link]-1))
+      self.link_step[cur_link[is_end & (self.link_step[cur_link]
+                                        == self.link_size[cur_link])]] = 0
+      node_end.append(node[is_end])
+
+    # node state
+    node = numpy.concatenate(node_end)
+    self.node_conn[node] += 1
+    self.node_action[node] = NetSim.ACT_CONNECT
+    is_iter = (self.node_conn[node] == self.p_node2node[node+1])
+    if (self.log_flag[NetSim.LOG_WAIT]) :
+      self.LogEvent(NetSim.LOG_WAIT, self.node_iter[node[~is_iter]],
+                    node[~is_iter],
+                    self.node2node[self.node_conn[node[~is_iter]]])
+    node = node[is_iter]
+    if (self.log_flag[NetSim.LOG_ITER]) :
+      self.LogEvent(NetSim.LOG_ITER, self.node_iter[node], node, -1)
+    self.node_conn[node] = self.p_node2node[node]
+    self.iter_count -= numpy.bincount(self.node_iter[node],
+                                      minlength=len(self.iter_count))
+    self.node_iter[node] += 1
+    self.iter_count += numpy.bincount(self.node_iter[node],
+                                      minlength=len(self.iter_count))
+    self.node_state[node] = NetSim.ST_WORK
+    self.node_action[node] = NetSim.ACT_LOCAL
+
+    # -- connection attempts (new state of the neighbors of smaller number)
+    is_new = (neighb < connect)
+    neighb_conn = numpy.where(is_new, self.node_conn[neighb], neighb_conn)
+    neighb_state = numpy.where(is_new, self.node_state[neighb], neighb_state)
+    node = connect[(self.node2node[neighb_conn] == connect)
+                   & (neighb_state == NetSim.ST_COMM)]
+    self.node_action[node] = NetSim.ACT_TRANSFER
+    if (self.log_flag[NetSim.LOG_CONNECT]) :
+      self.LogEvent(NetSim.LOG_CONNECT, self.node_iter[node], node,
+                    self.node2node[self.node_conn[node]])
+
+    # -- log records of the step by increasing node number
+    if (self.numb_log - numb_log > 1) :
+      log = self.log[numb_log:self.numb_log]
+      log[:] = log[numpy.argsort(log["node"], kind="mergesort")]
+
+    # -- update output
+    self.numb_step[self.glob_iter] += 1
+    self.glob_step += 1
+    if (self.iter_count[self.glob_iter] == 0) :
+      self.glob_iter += 1
+    self.flag_end = (numpy.count_nonzero(self.node_iter != self.numb_iter) == 0)
+
+    return
+
+  # END def StepVector ( self ) :
+  # ----------------------------------------------------------------------------
+
+  ##
+  # @brief Performs simulation steps up to a given total number of steps, or up
+  #        to the end of the simulation.
+  # @param glob_step = total number of steps after the call, None for the end
+  #             of the simulation
+  #             [default: None]
+  # @remarks With the "EVENT" engine, only the steps changing the state of a
+  #          node are processed (see StepToEvent), and the outputs are the
+  #          same as with the "LOOP" engine. The time does not depend on the
+  #          node and link sizes. Steps cannot be undone: a smaller number of
+  #          steps does nothing. Checkpoints are written every ckpt_step
+  #          steps (see WriteCheckpoint).
+  #
+  def StepTo (
+        self,
+        glob_step = None ) :
+
+    # -- init
+
+    # error handling
+    self.err_code = NetSim.SUCCESS
+    self.err_msg = ""
+    err_header = "*** [" + NetSim.CLASS_NAME + ".StepTo]"
+
+    # -- check engine
+    if (self.engine not in NetSim.ENGINE) :
+      self.err_code = NetSim.FAILURE
+      self.err_msg = err_header + " Error: unknown engine " + str(self.engine)
+      return
+
+    # -- step by step engines
+    if (self.engine != "EVENT") :
+      while ((not self.flag_end)
+             and ((glob_step is None) or (self.glob_step < glob_step))) :
+        self.Step()
         if (self.err_code == NetSim.FAILURE) :
           self.err_msg = err_header + "\n" + self.err_msg
           return
+      return
+
+    # -- event engine, up to each checkpoint
+    while ((not self.flag_end)
+           and ((glob_step is None) or (self.glob_step < glob_step))) :
+      cur_step = glob_step
+      if ((self.ckpt_step > 0)
+          and ((self.event_queue is None) or (len(self.event_queue) > 0))) :
+        cur_step = (self.glob_step // self.ckpt_step + 1) * self.ckpt_step
+        if (glob_step is not None) :
+          cur_step = min(cur_step, glob_step)
+      self.StepToEvent(cur_step)
+      if ((self.err_code == NetSim.SUCCESS) and (self.ckpt_step > 0)
+          and (self.glob_step % self.ckpt_step == 0)) :
+        self.WriteCheckpoint()
+      if (self.err_code == NetSim.FAILURE) :
+        self.err_msg = err_header + "\n" + self.err_msg
+        return
+
+    return
+
+  # END def StepTo (
+#        self,
+#        glob_step = None ) :
+  # ----------------------------------------------------------------------------
+
+  ##
+  # @brief Performs simulation steps up to a given total number of steps, or up
+  #        to the end of the simulation (engine "EVENT").
+  # @param glob_step = total number of steps after the call, None for the end
+  #             of the simulation
+  # @remarks Only the steps changing the state of a node are processed (see
+  #          InitEvent); the outputs are then computed for the requested step.
+  #
+  def StepToEvent (
+        self,
+        glob_step ) :
+
+    # -- init
+
+    # error handling
+    self.err_code = NetSim.SUCCESS
+    self.err_msg = ""
+    err_header = "*** [" + NetSim.CLASS_NAME + ".StepToEvent]"
+
+    # -- build event queue
+    if (self.event_queue is None) :
+      self.InitEvent()
+
+    # -- local names
+    queue = self.event_queue
+    event_key = self.event_key
+    numb_node = self.numb_node
+    node_conn = self.event_conn
+    node_state = self.event_state
+    node_iter = self.event_iter
+    node_action = self.event_action
+    node2node = self.event_node2node
+    node2link = self.event_node2link
+    p_node2node = self.event_p_node2node
+
+    # -- process events, by step then by node number
+    max_key = (None if (glob_step is None) else glob_step * numb_node)
+    while ((len(queue) > 0) and ((max_key is None) or (queue[0] < max_key))) :
+      key = heapq.heappop(queue)
+      (step, node) = divmod(key, numb_node)
+      if (event_key[node] != key) :
+        continue
+      event_key[node] = -1
+      if (step > self.glob_step) :
+        self.SettleEvent(step)
+
+      # end of local work
+      if (node_action[node] == NetSim.ACT_LOCAL) :
+        node_state[node] = NetSim.ST_COMM
+        node_action[node] = NetSim.ACT_CONNECT
+        if (self.log_flag[NetSim.LOG_WAIT]) :
+          self.LogEvent(NetSim.LOG_WAIT, node_iter[node], node,
+                        node2node[node_conn[node]])
+        self.PushEvent(step + 1, node)
+        self.WakeEvent(step, node)
+
+      # connection attempt
+      elif (node_action[node] == NetSim.ACT_CONNECT) :
+        neighb = node2node[node_conn[node]]
+        if ((node2node[node_conn[neighb]] == node)
+            and (node_state[neighb] == NetSim.ST_COMM)) :
+          node_action[node] = NetSim.ACT_TRANSFER
+          if (self.log_flag[NetSim.LOG_CONNECT]) :
+            self.LogEvent(NetSim.LOG_CONNECT, node_iter[node], node, neighb)
+          link = node2link[node_conn[node]]
+          self.link_val[link] = self.GetLinkStepEvent(link, step, node)
+          self.link_ref[link] = (step, node)
+          bisect.insort(self.link_node[link], node)
+          self.ScheduleLinkEvent(link)
+        else :
+          self.event_wait[neighb].append(node)
+
+      # end of data transfer
+      else :
+
+        # link state
+        link = node2link[node_conn[node]]
+        link_val = self.GetLinkStepEvent(link, step, node)
+        if (link_val == self.event_link_size[link]) :
+          link_val = 0
+        self.link_val[link] = link_val
+        self.link_ref[link] = (step, node)
+        self.link_node[link].remove(node)
+        self.ScheduleLinkEvent(link)
+
+        # node state
+        node_conn[node] += 1
+        node_action[node] = NetSim.ACT_CONNECT
+        if (node_conn[node] == p_node2node[node+1]) :
+          if (self.log_flag[NetSim.LOG_ITER]) :
+            self.LogEvent(NetSim.LOG_ITER, node_iter[node], node, -1)
+          node_conn[node] = p_node2node[node]
+          self.iter_count[node_iter[node]] -= 1
+          node_iter[node] += 1
+          self.iter_count[node_iter[node]] += 1
+          node_state[node] = NetSim.ST_WORK
+          node_action[node] = NetSim.ACT_LOCAL
+          if (node_iter[node] < self.event_numb_iter[node]) :
+            self.event_start[node] = step + 1
+            self.PushEvent(step + self.event_node_size[node], node)
+          else :
+            self.event_numb_active -= 1
+            if (self.event_numb_active == 0) :
+              self.event_end = step + 1
+        else :
+          if (self.log_flag[NetSim.LOG_WAIT]) :
+            self.LogEvent(NetSim.LOG_WAIT, node_iter[node], node,
+                          node2node[node_conn[node]])
+          self.PushEvent(step + 1, node)
+        self.WakeEvent(step, node)
+
+    # -- count the remaining steps
+    if (self.event_end is not None) :
+      end_step = self.event_end
+    elif (glob_step is not None) :
+      end_step = glob_step
+    else :
+      self.err_code = NetSim.FAILURE
+      self.err_msg = (err_header + " Error: deadlock at step "
+                      + str(self.glob_step))
+      end_step = self.glob_step
+    if (glob_step is not None) :
+      end_step = min(end_step, glob_step)
+    if (end_step > self.glob_step) :
+      self.SettleEvent(end_step)
+    self.flag_end = (self.event_numb_active == 0)
 
     # -- update output
-    self.numb_step[self.glob_iter] += 1
-    if (self.glob_iter not in self.node_iter) :
+    self.node_conn[:] = node_conn
+    self.node_state[:] = node_state
+    self.node_iter[:] = node_iter
+    self.node_action[:] = node_action
+    is_local = ((self.node_action == NetSim.ACT_LOCAL)
+                & (self.node_iter < self.numb_iter))
+    self.node_step[:] = numpy.where(is_local, numpy.maximum(
+      self.glob_step - numpy.array(self.event_start), 0), 0)
+    self.link_step[:] = self.link_val
+    transfer = numpy.flatnonzero(self.node_action == NetSim.ACT_TRANSFER)
+    for link in numpy.unique(self.node2link[self.node_conn[transfer]]) :
+      self.link_step[link] = self.GetLinkStepEvent(link, self.glob_step - 1,
+                                                   self.numb_node)
+
+    return
+
+  # END def StepToEvent (
+#        self,
+#        glob_step ) :
+  # ----------------------------------------------------------------------------
+
+  ##
+  # @brief Builds the event queue of the "EVENT" engine from the current state.
+  # @remarks Each active node has a single pending event, given by its action:
+  #          the end of its local work, its next connection attempt or the end
+  #          of its data transfer. Events are sorted by step, then by node
+  #          number (key step * numb_node + node), which is the update order
+  #          of the "LOOP" engine. A failed
+  #          connection attempt waits for the next state change of the
+  #          targeted neighbor (see WakeEvent). Node steps are given by the
+  #          step at which the local work started, and link steps by their
+  #          value at a given step of a given node (see GetLinkStepEvent).
+  #
+  def InitEvent ( self ) :
+
+    # -- init
+    numb_node = self.numb_node
+    glob_step = self.glob_step
+
+    # -- topology and features (lists: fast access to single items)
+    self.event_node2node = self.node2node.tolist()
+    self.event_node2link = self.node2link.tolist()
+    self.event_p_node2node = self.p_node2node.tolist()
+    self.event_node_size = numpy.asarray(self.node_size).tolist()
+    self.event_link_size = numpy.asarray(self.link_size).tolist()
+    self.event_numb_iter = self.numb_iter.tolist()
+
+    # -- node state
+    self.event_conn = self.node_conn.tolist()
+    self.event_state = self.node_state.tolist()
+    self.event_iter = self.node_iter.tolist()
+    self.event_action = self.node_action.tolist()
+    self.event_start = (glob_step - self.node_step).tolist()
+    self.event_wait = [[] for i in range(0, numb_node)]
+    self.iter_count[:] = numpy.bincount(self.node_iter,
+                                        minlength=len(self.iter_count))
+
+    # -- link state: value after the step of a node (numb_node: after all
+    # nodes) at a given step, and nodes transferring on the link
+    self.link_val = self.link_step.tolist()
+    self.link_ref = [(glob_step - 1, numb_node)] * self.numb_link
+    self.link_node = [[] for i in range(0, self.numb_link)]
+
+    # -- first event of each active node
+    self.event_queue = []
+    self.event_key = [-1] * numb_node
+    active = numpy.flatnonzero(self.node_iter < self.numb_iter).tolist()
+    self.event_numb_active = len(active)
+    self.event_end = (glob_step if (len(active) == 0) else None)
+    for node in active :
+      if (self.event_action[node] == NetSim.ACT_LOCAL) :
+        self.PushEvent(self.event_start[node]
+                       + self.event_node_size[node] - 1, node)
+      elif (self.event_action[node] == NetSim.ACT_CONNECT) :
+        self.PushEvent(glob_step, node)
+      else :
+        self.link_node[self.event_node2link[self.event_conn[node]]].append(
+          node)
+    for link in range(0, self.numb_link) :
+      if (len(self.link_node[link]) > 0) :
+        self.ScheduleLinkEvent(link)
+
+    return
+
+  # END def InitEvent ( self ) :
+  # ----------------------------------------------------------------------------
+
+  ##
+  # @brief Replaces the pending event of a node (engine "EVENT").
+  # @param step = step of the event
+  # @param node = node number
+  # @remarks The replaced event stays in the queue, and is skipped.
+  #
+  def PushEvent (
+        self,
+        step,
+        node ) :
+
+    key = step * self.numb_node + node
+    if (self.event_key[node] == key) :
+      return
+    self.event_key[node] = key
+    heapq.heappush(self.event_queue, key)
+
+    return
+
+  # END def PushEvent (
+#        self,
+#        step,
+#        node ) :
+  # ----------------------------------------------------------------------------
+
+  ##
+  # @brief Schedules a new connection attempt for the nodes waiting for a node
+  #        whose state has just changed (engine "EVENT").
+  # @param step = step of the state change
+  # @param node = node number
+  # @remarks A waiting node of greater number sees the change at the same
+  #          step, the others at the next step.
+  #
+  def WakeEvent (
+        self,
+        step,
+        node ) :
+
+    for neighb in self.event_wait[node] :
+      self.PushEvent(step if (neighb > node) else step + 1, neighb)
+    self.event_wait[node] = []
+
+    return
+
+  # END def WakeEvent (
+#        self,
+#        step,
+#        node ) :
+  # ----------------------------------------------------------------------------
+
+  ##
+  # @brief Counts the steps performed before a given step (engine "EVENT").
+  # @param step = total number of steps after the call
+  # @remarks No node changes iteration during these steps: the global
+  #          iteration moves on at most once per step, as long as it has no
+  #          node left.
+  #
+  def SettleEvent (
+        self,
+        step ) :
+
+    numb_step = step - self.glob_step
+    while ((numb_step > 0) and (self.iter_count[self.glob_iter] == 0)) :
+      self.numb_step[self.glob_iter] += 1
       self.glob_iter += 1
-    self.flag_end = (False not in (self.node_iter == self.numb_iter))
+      numb_step -= 1
+    if (numb_step > 0) :
+      self.numb_step[self.glob_iter] += numb_step
+    self.glob_step = step
 
     return
 
-  # END def Step ( self ) :
+  # END def SettleEvent (
+#        self,
+#        step ) :
+  # ----------------------------------------------------------------------------
+
+  ##
+  # @brief Gets the value of a link after the step of a given node at a given
+  #        step (engine "EVENT").
+  # @param link = link number
+  # @param step = step number
+  # @param node = node number, numb_node for the end of the step
+  # @return link step
+  # @remarks Each transferring node adds one at each of its steps after the
+  #          reference step of the link.
+  #
+  def GetLinkStepEvent (
+        self,
+        link,
+        step,
+        node ) :
+
+    (ref_step, ref_node) = self.link_ref[link]
+    numb_step = 0
+    for cur_node in self.link_node[link] :
+      numb_step += ((step - ref_step + 1) - (cur_node <= ref_node)
+                    - (cur_node > node))
+
+    return self.link_val[link] + numb_step
+
+  # END def GetLinkStepEvent (
+#        self,
+#        link,
+#        step,
+#        node ) :
+  # ----------------------------------------------------------------------------
+
+  ##
+  # @brief Schedules the end of data transfer of the nodes of a link (engine
+  #        "EVENT").
+  # @param link = link number
+  # @remarks A node ends at its first step where the link reaches
+  #          link_size - 1, assuming that the transferring nodes do not
+  #          change; the events are scheduled again when they do.
+  #
+  def ScheduleLinkEvent (
+        self,
+        link ) :
+
+    # -- init
+    link_node = self.link_node[link]
+    numb_node = len(link_node)
+    (ref_step, ref_node) = self.link_ref[link]
+    numb_before = sum([1 for node in link_node if (node <= ref_node)])
+    numb_left = self.event_link_size[link] - 1 - self.link_val[link]
+
+    # -- nodes by increasing number
+    for (rank, node) in enumerate(link_node) :
+      numb_skip = numb_before + numb_node - rank - 1
+      step = ref_step - 1 + (-((-(numb_left + numb_skip)) // numb_node))
+      first_step = (ref_step if (node > ref_node) else ref_step + 1)
+      self.PushEvent(max(step, first_step), node)
+
+    return
+
+  # END def ScheduleLinkEvent (
+#        self,
+#        link ) :
+  # ----------------------------------------------------------------------------
+
+  ##
+  # @brief Gets the nodes and links of which the output (node_step,
+  #        link_step) changed since the previous call.
+  # @return (node, link) = node numbers, link numbers
+  #             (numpy.ndarray, numpy.ndarray)
+  # @remarks The first call gets all the nodes and links. The output is
+  #          compared to a copy kept from the previous call, so that all
+  #          engines are supported, as well as several steps between two
+  #          calls (StepTo) and ReadCheckpoint. Only the changed entries of
+  #          the copy are updated.
+  #
+  def GetChange ( self ) :
+
+    if (self.change_node_step is None) :
+      node = numpy.arange(self.numb_node)
+      link = numpy.arange(self.numb_link)
+      self.change_node_step = self.node_step.copy()
+      self.change_link_step = self.link_step.copy()
+    else :
+      node = numpy.flatnonzero(self.node_step != self.change_node_step)
+      link = numpy.flatnonzero(self.link_step != self.change_link_step)
+      self.change_node_step[node] = self.node_step[node]
+      self.change_link_step[link] = self.link_step[link]
+
+    return (node, link)
+
+  # END def GetChange ( self ) :
+  # ----------------------------------------------------------------------------
+
+  ##
+  # @brief Records events in the event log, at the current step.
+  # @param event = event type (NetSim.LOG_EVENT)
+  # @param node_iter = iteration of each node
+  # @param node = node numbers
+  # @param neighb = targeted neighbor of each node, -1 for none
+  #             (int or numpy.ndarray, all of the same size)
+  # @remarks The log is a buffer of records (step, iter, node, neighb,
+  #          event) of which the numb_log first ones are used; its size is
+  #          doubled when it is full. The callers only record the event types
+  #          of log_flag, so that a log turned off costs nothing.
+  #
+  def LogEvent (
+        self,
+        event,
+        node_iter,
+        node,
+        neighb ) :
+
+    # -- grow buffer
+    numb_log = self.numb_log + numpy.size(node)
+    if (numb_log > len(self.log)) :
+      log = numpy.zeros(max(2 * len(self.log), numb_log, NetSim.LOG_SIZE),
+                        dtype=self.log.dtype)
+      log[0:self.numb_log] = self.log[0:self.numb_log]
+      self.log = log
+
+    # -- record
+    if (numpy.ndim(node) == 0) :
+      self.log[self.numb_log] = (self.glob_step, node_iter, node, neighb,
+                                 event)
+    else :
+      log = self.log[self.numb_log:numb_log]
+      log["step"] = self.glob_step
+      log["iter"] = node_iter
+      log["node"] = node
+      log["neighb"] = neighb
+      log["event"] = event
+    self.numb_log = numb_log
+
+    return
+
+  # END def LogEvent (
+#        self,
+#        event,
+#        node_iter,
+#        node,
+#        neighb ) :
+  # ----------------------------------------------------------------------------
+
+  ##
+  # @brief Gets the records of the event log, by step then by node number.
+  # @param log_event = types of the events to get, None for all
+  #             [default: None]
+  # @return records (numpy.ndarray with fields step, iter, node, neighb and
+  #          event)
+  # @remarks All engines give the same log. There is not any copy of the
+  #          log when log_event is None.
+  #
+  def GetLog (
+        self,
+        log_event = None ) :
+
+    log = self.log[0:self.numb_log]
+    if (log_event is not None) :
+      log = log[numpy.in1d(log["event"], log_event)]
+
+    return log
+
+  # END def GetLog (
+#        self,
+#        log_event = None ) :
+  # ----------------------------------------------------------------------------
+
+  ##
+  # @brief Writes the records of the event log to a trace file.
+  # @param file_name = full name of the file (str)
+  # @param file_format = "BIN" (NumPy .npy file of the records, see GetLog)
+  #             or "CSV" (one line per record, event types by name)
+  #             [default: "BIN"]
+  # @param log_event = types of the events to write, None for all
+  #             [default: None]
+  #
+  def WriteLog (
+        self,
+        file_name,
+        file_format = "BIN",
+        log_event = None ) :
+
+    # -- init
+
+    # error handling
+    self.err_code = NetSim.SUCCESS
+    self.err_msg = ""
+    err_header = "*** [" + NetSim.CLASS_NAME + ".WriteLog]"
+
+    # -- check format
+    if (file_format not in NetSim.LOG_FORMAT) :
+      self.err_code = NetSim.FAILURE
+      self.err_msg = err_header + " Error: unknown format " + str(file_format)
+      return
+
+    # -- open file
+    try :
+      p_file = open(file_name, "wb" if (file_format == "BIN") else "w")
+    except :
+      self.err_code = NetSim.FAILURE
+      self.err_msg = err_header + " Error: cannot open " + file_name
+      return
+
+    # -- write records
+    log = self.GetLog(log_event)
+    if (file_format == "BIN") :
+      numpy.save(p_file, log)
+    else :
+      p_file.write("step,iter,node,neighb,event\n")
+      record = numpy.empty((len(log), 5), dtype=object)
+      for (i, name) in enumerate(["step", "iter", "node", "neighb"]) :
+        record[:,i] = log[name]
+      record[:,4] = numpy.array(NetSim.LOG_NAME)[log["event"]]
+      numpy.savetxt(p_file, record, fmt="%d,%d,%d,%d,%s")
+    p_file.close()
+
+    return
+
+  # END def WriteLog (
+#        self,
+#        file_name,
+#        file_format = "BIN",
+#        log_event = None ) :
+  # ----------------------------------------------------------------------------
+
+  ##
+  # @brief Writes the state of the simulation to a checkpoint file, in a
+  #        background thread.
+  # @param file_name = full name of the file (str), None for ckpt_file
+  #             [default: None]
+  # @remarks The state (CKPT_STATE and the event log) is copied at once, so
+  #          that the simulation goes on while the file is written. It does
+  #          not depend on the engine. A new checkpoint first waits for the
+  #          previous one (see WaitCheckpoint).
+  #
+  def WriteCheckpoint (
+        self,
+        file_name = None ) :
+
+    # -- init
+
+    # error handling
+    self.err_code = NetSim.SUCCESS
+    self.err_msg = ""
+    err_header = "*** [" + NetSim.CLASS_NAME + ".WriteCheckpoint]"
+
+    # file name
+    if (file_name is None) :
+      file_name = self.ckpt_file
+    if (file_name is None) :
+      self.err_code = NetSim.FAILURE
+      self.err_msg = err_header + " Error: no checkpoint file"
+      return
+
+    # -- wait for the previous checkpoint
+    self.WaitCheckpoint()
+    if (self.err_code == NetSim.FAILURE) :
+      self.err_msg = err_header + "\n" + self.err_msg
+      return
+
+    # -- copy state
+    state = {}
+    for name in NetSim.CKPT_STATE :
+      state[name] = numpy.array(getattr(self, name))
+    state["log"] = self.log[0:self.numb_log].copy()
+
+    # -- write file
+    self.ckpt_thread = threading.Thread(target=self.WriteCheckpointFile,
+                                        args=(file_name, state))
+    self.ckpt_thread.start()
+
+    return
+
+  # END def WriteCheckpoint (
+#        self,
+#        file_name = None ) :
+  # ----------------------------------------------------------------------------
+
+  ##
+  # @brief Writes a copy of the state of the simulation to a checkpoint file
+  #        (writer thread of WriteCheckpoint).
+  # @param file_name = full name of the file (str)
+  # @param state = arrays of the state, by name (dict)
+  # @remarks The file (NumPy .npz file) is written under a temporary name,
+  #          then renamed: a checkpoint file is always complete. Errors are
+  #          reported by WaitCheckpoint.
+  #
+  def WriteCheckpointFile (
+        self,
+        file_name,
+        state ) :
+
+    tmp_file_name = file_name + "." + str(os.getpid()) + ".tmp"
+    try :
+      p_file = open(tmp_file_name, "wb")
+      numpy.savez_compressed(p_file, **state)
+      p_file.close()
+      os.rename(tmp_file_name, file_name)
+    except (IOError, OSError) :
+      self.ckpt_err_msg = "cannot write " + file_name
+
+    return
+
+  # END def WriteCheckpointFile (
+#        self,
+#        file_name,
+#        state ) :
+  # ----------------------------------------------------------------------------
+
+  ##
+  # @brief Waits for the checkpoint being written, if any.
+  #
+  def WaitCheckpoint ( self ) :
+
+    # -- init
+
+    # error handling
+    self.err_code = NetSim.SUCCESS
+    self.err_msg = ""
+    err_header = "*** [" + NetSim.CLASS_NAME + ".WaitCheckpoint]"
+
+    # -- wait for writer thread
+    if (self.ckpt_thread is not None) :
+      self.ckpt_thread.join()
+      self.ckpt_thread = None
+
+    # -- check error
+    if (self.ckpt_err_msg != "") :
+      self.err_code = NetSim.FAILURE
+      self.err_msg = err_header + " Error: " + self.ckpt_err_msg
+      self.ckpt_err_msg = ""
+
+    return
+
+  # END def WaitCheckpoint ( self ) :
+  # ----------------------------------------------------------------------------
+
+  ##
+  # @brief Restores the state of the simulation from a checkpoint file.
+  # @param file_name = full name of the file (str), None for ckpt_file
+  #             [default: None]
+  # @remarks The simulation must have the same network. The run then goes on
+  #          exactly as if it had not been stopped, with any engine.
+  #
+  def ReadCheckpoint (
+        self,
+        file_name = None ) :
+
+    # -- init
+
+    # error handling
+    self.err_code = NetSim.SUCCESS
+    self.err_msg = ""
+    err_header = "*** [" + NetSim.CLASS_NAME + ".ReadCheckpoint]"
+
+    # file name
+    if (file_name is None) :
+      file_name = self.ckpt_file
+    if (file_name is None) :
+      self.err_code = NetSim.FAILURE
+      self.err_msg = err_header + " Error: no checkpoint file"
+      return
+
+    # -- wait for the checkpoint being written
+    self.WaitCheckpoint()
+    if (self.err_code == NetSim.FAILURE) :
+      self.err_msg = err_header + "\n" + self.err_msg
+      return
+
+    # -- read file
+    try :
+      p_file = open(file_name, "rb")
+    except :
+      self.err_code = NetSim.FAILURE
+      self.err_msg = err_header + " Error: cannot open " + file_name
+      return
+    try :
+      p_state = numpy.load(p_file)
+      state = dict((name, p_state[name]) for name in p_state.files)
+    except :
+      state = {}
+    p_file.close()
+
+    # -- check state
+    if ((False in [(name in state) for name in NetSim.CKPT_STATE + ["log"]])
+        or (len(state["node_iter"]) != self.numb_node)
+        or (len(state["link_step"]) != self.numb_link)
+        or (state["log"].dtype != self.log.dtype)) :
+      self.err_code = NetSim.FAILURE
+      self.err_msg = (err_header + " Error: " + file_name
+                      + " is not a checkpoint of this network")
+      return
+
+    # -- restore state
+    for name in NetSim.CKPT_STATE :
+      value = state[name]
+      setattr(self, name, value.item() if (value.ndim == 0) else value)
+    step_func = [self.StepNodeLocal, self.StepNodeConnect,
+                 self.StepNodeTransfer]
+    self.__Step = [step_func[action] for action in self.node_action]
+    self.iter_count = numpy.bincount(self.node_iter,
+                                     minlength=max(self.numb_iter.max(), 0)
+                                     + 2)
+    self.event_queue = None
+
+    # -- restore event log
+    self.numb_log = len(state["log"])
+    self.log = numpy.zeros(max(self.numb_log, NetSim.LOG_SIZE
+                               if (True in self.log_flag) else 0),
+                           dtype=self.log.dtype)
+    self.log[0:self.numb_log] = state["log"]
+
+    return
+
+  # END def ReadCheckpoint (
+#        self,
+#        file_name = None ) :
   # ----------------------------------------------------------------------------
 
   ##
@@ -187,9 +1264,11 @@ class NetSim ( object ) :
     if (self.node_step[node] == self.node_size[node]) :
       self.node_step[node] = 0
       self.node_state[node] = NetSim.ST_COMM
+      self.node_action[node] = NetSim.ACT_CONNECT
       self.__Step[node] = self.StepNodeConnect
-      print("[{:s}] [{:d}] {:4d}  -->|  {:d}".format(NetSim.CLASS_NAME,
-              self.node_iter[node], node, self.node2node[self.node_conn[node]]))
+      if (self.log_flag[NetSim.LOG_WAIT]) :
+        self.LogEvent(NetSim.LOG_WAIT, self.node_iter[node], node,
+                      self.node2node[self.node_conn[node]])
 
 
     return
@@ -220,9 +1299,10 @@ class NetSim ( object ) :
     neighb_conn = self.node_conn[neighb]
     if ((node == self.node2node[neighb_conn])
         and (self.node_state[neighb] == NetSim.ST_COMM)) :
+      self.node_action[node] = NetSim.ACT_TRANSFER
       self.__Step[node] = self.StepNodeTransfer
-      print("[{:s}] [{:d}] {:4d}  <-->  {:d}".format(NetSim.CLASS_NAME,
-            self.node_iter[node], node, neighb))
+      if (self.log_flag[NetSim.LOG_CONNECT]) :
+        self.LogEvent(NetSim.LOG_CONNECT, self.node_iter[node], node, neighb)
 
 
     return
@@ -261,15 +1341,20 @@ class NetSim ( object ) :
 
       # node state
       self.node_conn[node] += 1
+      self.node_action[node] = NetSim.ACT_CONNECT
       self.__Step[node] = self.StepNodeConnect
       if (self.node_conn[node] == self.p_node2node[node+1]) :
+        if (self.log_flag[NetSim.LOG_ITER]) :
+          self.LogEvent(NetSim.LOG_ITER, self.node_iter[node], node, -1)
         self.node_conn[node] = self.p_node2node[node]
         self.node_iter[node] += 1
         self.node_state[node] = NetSim.ST_WORK
+        self.node_action[node] = NetSim.ACT_LOCAL
         self.__Step[node] = self.StepNodeLocal
       else :
-        print("[{:s}] [{:d}] {:4d}  -->|  {:d}".format(NetSim.CLASS_NAME,
-              self.node_iter[node], node, self.node2node[self.node_conn[node]]))
+        if (self.log_flag[NetSim.LOG_WAIT]) :
+          self.LogEvent(NetSim.LOG_WAIT, self.node_iter[node], node,
+                        self.node2node[self.node_conn[node]])
 
 
     return
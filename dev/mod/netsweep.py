@@ -0,0 +1,406 @@
+# -*- coding: utf-8 -*-
+
+##
+# @author Pr Magoules HPC Research Group, CentraleSupelec, France
+# @date 2026-10-17, 2026-10-17
+# @version 1.0
+#
+# @class NetSweep
+#
+
+# -- Standard modules
+import time
+import ctypes
+import multiprocessing
+
+# -- Third-party modules
+import numpy
+
+# -- MRG modules
+from netsim import NetSim
+
+##
+# @brief Runs many simulations (class NetSim) of a same network in parallel,
+#        with various numbers of iterations and node and link sizes.
+#
+class NetSweep ( object ) :
+
+  # ----------------------------------------------------------------------------
+  # -- CLASS ATTRIBUTES
+  # ----------------------------------------------------------------------------
+
+  # Error status
+  SUCCESS = 0
+  FAILURE = 1
+
+  # Columns of the results table written to file, besides numb_step
+  RESULT_FIELD = ["numb_iter", "node_scale", "link_scale", "numb_tick",
+                  "flag_end", "wclock_time"]
+
+  # Class description
+  CLASS_NAME = "NetSweep"
+  CLASS_AUTHOR = "Pr Magoules HPC Research Group, CentraleSupelec, France"
+  METHODS = """
+  __init__ (
+        self,
+        numb_node,
+        numb_link,
+        node2link,
+        node2node,
+        p_node2node,
+        node_size = numpy.array([]),
+        link_size = numpy.array([]) )
+
+  AddScenario (
+        self,
+        numb_iter = 1,
+        node_scale = 1.0,
+        link_scale = 1.0 )
+
+  Run (
+        self,
+        numb_proc = None,
+        engine = "EVENT" )
+
+  WriteResult (
+        self,
+        file_name )
+  """
+
+  # ----------------------------------------------------------------------------
+  # -- INITIALIZATION
+  # ----------------------------------------------------------------------------
+
+  ##
+  # @param numb_node = number of network nodes
+  # @param numb_link = number of communication links
+  #
+  # @param node2link = communication links of each node (CSR data)
+  # @param node2node = corresponding neighbor nodes (CSR column indices)
+  # @param p_node2node = index of each node (CSR row pointer)
+  #             (numpy.ndarray, numpy.ndarray, numpy.ndarray)
+  #
+  # @param node_size = workload on each node
+  #             [default: numpy.array([20]*numb_node, dtype=int)]
+  # @param link_size = transfer size on each link (see NetSim)
+  #             [default: numpy.array([10]*numb_link, dtype=int)]
+  # @remarks The defaults are those of NetSim.
+  #
+  def __init__ (
+        self,
+        numb_node,
+        numb_link,
+        node2link,
+        node2node,
+        p_node2node,
+        node_size = numpy.array([]),
+        link_size = numpy.array([]) ) :
+
+    # -- Topology
+    self.numb_node = numb_node
+    self.numb_link = numb_link
+    self.node2link = node2link
+    self.node2node = node2node
+    self.p_node2node = p_node2node
+
+    # -- Features
+
+    # Node size
+    if (len(node_size) > 0) :
+      self.node_size = node_size
+    else :
+      self.node_size = 20 + numpy.zeros(self.numb_node, dtype=int)
+
+    # Link size
+    if (len(link_size) > 0) :
+      self.link_size = link_size
+    else :
+      self.link_size = 10 + numpy.zeros(self.numb_link, dtype=int)
+
+    # -- Sweep
+
+    # Scenarios: (numb_iter, node_scale, link_scale) each
+    self.scenario = []
+
+    # Results table, one record per scenario (see Run)
+    self.result = numpy.zeros(0, dtype=[("numb_iter", int)])
+
+    # -- Error handling
+
+    # Last error code
+    self.err_code = NetSweep.SUCCESS
+
+    # Last error message
+    self.err_msg = ""
+
+  # END def __init__ (
+#        self,
+#        numb_node,
+#        numb_link,
+#        node2link,
+#        node2node,
+#        p_node2node,
+#        node_size = numpy.array([]),
+#        link_size = numpy.array([]) ) :
+  # ----------------------------------------------------------------------------
+
+  # ----------------------------------------------------------------------------
+  # -- PROCESS
+  # ----------------------------------------------------------------------------
+
+  ##
+  # @brief Adds a scenario to the sweep.
+  # @param numb_iter = number of iterations
+  #             [default: 1]
+  # @param node_scale = factor of the node sizes
+  #             [default: 1.0]
+  # @param link_scale = factor of the link sizes
+  #             [default: 1.0]
+  # @remarks Scaled sizes are rounded, and are at least 1. An invalid
+  #          scenario is not added.
+  #
+  def AddScenario (
+        self,
+        numb_iter = 1,
+        node_scale = 1.0,
+        link_scale = 1.0 ) :
+
+    # -- init
+
+    # error handling
+    self.err_code = NetSweep.SUCCESS
+    self.err_msg = ""
+    err_header = "*** [" + NetSweep.CLASS_NAME + ".AddScenario]"
+
+    # -- check number of iterations
+    try :
+      flag_valid = ((int(numb_iter) == numb_iter) and (numb_iter >= 1))
+    except (TypeError, ValueError) :
+      flag_valid = False
+    if (not flag_valid) :
+      self.err_code = NetSweep.FAILURE
+      self.err_msg = (err_header + " Error: invalid number of iterations "
+                      + str(numb_iter) + " (positive integer expected)")
+      return
+
+    # -- check size factors
+    try :
+      flag_valid = (numpy.isfinite([node_scale, link_scale]).all()
+                    and (float(node_scale) > 0) and (float(link_scale) > 0))
+    except (TypeError, ValueError) :
+      flag_valid = False
+    if (not flag_valid) :
+      self.err_code = NetSweep.FAILURE
+      self.err_msg = (err_header + " Error: invalid size factors "
+                      + str((node_scale, link_scale))
+                      + " (positive numbers expected)")
+      return
+
+    self.scenario.append((int(numb_iter), float(node_scale),
+                          float(link_scale)))
+
+    return
+
+  # END def AddScenario (
+#        self,
+#        numb_iter = 1,
+#        node_scale = 1.0,
+#        link_scale = 1.0 ) :
+  # ----------------------------------------------------------------------------
+
+  ##
+  # @brief Runs the simulation of every scenario to its end, in parallel.
+  # @param numb_proc = number of worker processes
+  #             [default: None, i.e. number of cores]
+  # @param engine = simulation engine (see NetSim)
+  #             [default: "EVENT"]
+  # @remarks The topology and the sizes are shared by the workers through
+  #          shared memory (one copy), and each worker runs whole scenarios,
+  #          the longest ones (most iterations) first. The results table has
+  #          one record per scenario, in the order of the scenarios: its
+  #          parameters, total number of steps (numb_tick), end flag, run time
+  #          and number of steps of each iteration (numb_step, 0 beyond
+  #          numb_iter).
+  #
+  def Run (
+        self,
+        numb_proc = None,
+        engine = "EVENT" ) :
+
+    # -- init
+
+    # error handling
+    self.err_code = NetSweep.SUCCESS
+    self.err_msg = ""
+    err_header = "*** [" + NetSweep.CLASS_NAME + ".Run]"
+
+    # -- check engine (before any worker is started)
+    if (engine not in NetSim.ENGINE) :
+      self.err_code = NetSweep.FAILURE
+      self.err_msg = err_header + " Error: unknown engine " + str(engine)
+      return
+
+    # output
+    max_iter = max([1] + [numb_iter for (numb_iter, node_scale, link_scale)
+                          in self.scenario])
+    self.result = numpy.zeros(len(self.scenario),
+                              dtype=[("numb_iter", int),
+                                     ("node_scale", float),
+                                     ("link_scale", float),
+                                     ("numb_tick", numpy.int64),
+                                     ("flag_end", bool),
+                                     ("wclock_time", float),
+                                     ("numb_step", numpy.int64, (max_iter,))])
+    if (len(self.scenario) == 0) :
+      return
+    if (numb_proc is None) :
+      numb_proc = multiprocessing.cpu_count()
+    numb_proc = max(1, min(numb_proc, len(self.scenario)))
+
+    # -- share arrays
+    shared = {}
+    for name in ["node2link", "node2node", "p_node2node", "node_size",
+                 "link_size"] :
+      array = numpy.ascontiguousarray(getattr(self, name))
+      raw_array = multiprocessing.RawArray(ctypes.c_char, max(array.nbytes, 1))
+      numpy.frombuffer(raw_array, dtype=array.dtype)[0:len(array)] = array
+      shared[name] = (raw_array, array.dtype.str, len(array))
+
+    # -- run scenarios, longest first
+    order = sorted(range(0, len(self.scenario)),
+                   key=lambda k: -self.scenario[k][0])
+    args = [(k, self.numb_node, self.numb_link) + self.scenario[k] + (engine,)
+            for k in order]
+    if (numb_proc == 1) :
+      InitSweepWorker(shared)
+      output = map(RunSweepWorker, args)
+    else :
+      pool = multiprocessing.Pool(numb_proc, InitSweepWorker, (shared,))
+      output = list(pool.imap_unordered(RunSweepWorker, args))
+      pool.close()
+      pool.join()
+    sweep_worker_data.clear()
+
+    # -- results table
+    for (k, numb_step, numb_tick, flag_end, wclock_time, err_msg) in output :
+      record = self.result[k]
+      (record["numb_iter"], record["node_scale"],
+       record["link_scale"]) = self.scenario[k]
+      record["numb_tick"] = numb_tick
+      record["flag_end"] = flag_end
+      record["wclock_time"] = wclock_time
+      record["numb_step"][0:len(numb_step)] = numb_step
+      if (err_msg != "") :
+        self.err_code = NetSweep.FAILURE
+        self.err_msg += ("\n" + err_header + " Scenario " + str(k) + ":\n"
+                         + err_msg)
+    self.err_msg = self.err_msg[1:]
+
+    return
+
+  # END def Run (
+#        self,
+#        numb_proc = None,
+#        engine = "EVENT" ) :
+  # ----------------------------------------------------------------------------
+
+  ##
+  # @brief Writes the results table to a CSV file.
+  # @param file_name = full name of the file (str)
+  # @remarks One line per scenario: RESULT_FIELD, then the number of steps
+  #          of each iteration.
+  #
+  def WriteResult (
+        self,
+        file_name ) :
+
+    # -- init
+
+    # error handling
+    self.err_code = NetSweep.SUCCESS
+    self.err_msg = ""
+    err_header = "*** [" + NetSweep.CLASS_NAME + ".WriteResult]"
+
+    # -- open file
+    try :
+      p_file = open(file_name, "w")
+    except :
+      self.err_code = NetSweep.FAILURE
+      self.err_msg = err_header + " Error: cannot open " + file_name
+      return
+
+    # -- write table
+    max_iter = (self.result["numb_step"].shape[1] if (len(self.result) > 0)
+                else 0)
+    p_file.write(",".join(NetSweep.RESULT_FIELD + ["numb_step_" + str(i)
+                          for i in range(0, max_iter)]) + "\n")
+    for record in self.result :
+      p_file.write(",".join([str(record[name].item())
+                             for name in NetSweep.RESULT_FIELD]
+                            + [str(numb_step) for numb_step
+                               in record["numb_step"]]) + "\n")
+    p_file.close()
+
+    return
+
+  # END def WriteResult (
+#        self,
+#        file_name ) :
+  # ----------------------------------------------------------------------------
+
+# END class NetSweep ( object ) :
+# ------------------------------------------------------------------------------
+# ------------------------------------------------------------------------------
+# -- SWEEP WORKERS
+# ------------------------------------------------------------------------------
+
+# Shared arrays of the current worker process (see InitSweepWorker)
+sweep_worker_data = {}
+
+##
+# @brief Maps the shared arrays of NetSweep.Run in the current process.
+# @param shared = (multiprocessing.RawArray, dtype str, size) of node2link,
+#             node2node, p_node2node, node_size and link_size, by name (dict)
+#
+def InitSweepWorker ( shared ) :
+
+  for (name, (raw_array, dtype, array_size)) in shared.items() :
+    sweep_worker_data[name] = numpy.frombuffer(raw_array,
+                                  dtype=numpy.dtype(dtype))[0:array_size]
+
+  return
+
+# END def InitSweepWorker ( shared ) :
+# ------------------------------------------------------------------------------
+
+##
+# @brief Runs the simulation of one scenario to its end (see NetSweep.Run).
+# @param args = (scenario number, numb_node, numb_link, numb_iter, node_scale,
+#             link_scale, engine)
+# @return (scenario number, numb_step, total number of steps, end flag, run
+#          time, error message)
+#
+def RunSweepWorker ( args ) :
+
+  (k, numb_node, numb_link, numb_iter, node_scale, link_scale, engine) = args
+
+  # -- scaled sizes
+  node_size = numpy.maximum(1, numpy.rint(node_scale
+                            * sweep_worker_data["node_size"])).astype(int)
+  link_size = numpy.maximum(1, numpy.rint(link_scale
+                            * sweep_worker_data["link_size"])).astype(int)
+
+  # -- run
+  wclock_btime = time.time()
+  sim = NetSim(numb_node, numb_link, sweep_worker_data["node2link"],
+               sweep_worker_data["node2node"],
+               sweep_worker_data["p_node2node"], node_size, link_size,
+               numb_iter=numb_iter, engine=engine)
+  sim.StepTo()
+  wclock_time = time.time() - wclock_btime
+
+  return (k, sim.numb_step, sim.glob_step, sim.flag_end, wclock_time,
+          sim.err_msg)
+
+# END def RunSweepWorker ( args ) :
+# ------------------------------------------------------------------------------
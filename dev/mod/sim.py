@@ -5,6 +5,7 @@ Created on Wed Jan 11 16:30:59 2017
 @author: 19jun
 """
 import sys
+import os
 
 from graph import Graph
 from mesh import Mesh
@@ -18,76 +19,81 @@ def main(argv):
     
     
     path_to_file = "../../data/in/MRG/AP3D-H0750B-SS0-LGM12.vtk"
-	# Create the Mesh object
+    # Graph structures built by previous runs
+    cache_dir = "../../data/cache/graph"
+    # Create the Mesh object
     m = Mesh()
     print('Read VTK file')
-	# Import the file into Mesh object
-    m.ReadFromFileVtk(path_to_file)
+    # Import the file into Mesh object, with all its data fields
+    m.ReadAllFromFileVtk(path_to_file)
     
     if m.err_code == 1:
         print(m.err_msg)
     
     print('Create the graph')
     
-	# Create a Graph object with the attribute read by Mesh
+    # Create a Graph object with the attribute read by Mesh
     g = Graph(m.numb_node,        # numb_vert
                   m.numb_elem,    # numb_edge
                   m.elem2node,    # edge2vert
                   m.p_elem2node)  # p_edge2vert
+    g.cache_dir = cache_dir
     
-	# create line graph, with numb_edge, numb_vert, vert2edge, p_vert2edge
+    # create line graph, with numb_edge, numb_vert, vert2edge, p_vert2edge
 
-	# create vert2edge
+    # create vert2edge
     print('Build edge2edge')
-    g.BuildEdge2Edge()
+    g.Require("edge2edge")
 
-	# build line graph
+    # build line graph
     
-	print('Build line graph')
-	lg = Graph()
+    print('Build line graph')
+    lg = Graph()
+    lg.cache_dir = cache_dir
 
-	lg.numb_vert = g.numb_edge
-	lg.numb_edge = g.numb_vert
-	lg.vert2vert = g.edge2edge
-	lg.p_vert2vert = g.p_edge2edge
+    lg.numb_vert = g.numb_edge
+    lg.numb_edge = g.numb_vert
+    lg.vert2vert = g.edge2edge
+    lg.p_vert2vert = g.p_edge2edge
 
-			  
-	# coloring edges, which are vertex of line graph
-	print('Color edges of line graph')
-	lg.ColorVertByWelshPowell()
 
-	# adding edges colors to the graph
+    # coloring edges, which are vertex of line graph
+    print('Color edges of line graph')
+    lg.Require("vert_color")
 
-	print('Adding edges colors to the graph')
-	g.edge_color = lg.vert_color
+    # adding edges colors to the graph
 
+    print('Adding edges colors to the graph')
+    g.edge_color = lg.vert_color
 
-	# sort edges by color
-	print('Sort edges by color')
-	g.SortVert2EdgeByColor()
-    
-    # build sorted vert2vert
+    # the line graph is no longer needed
+    g.Release("edge2edge")
+    del lg
+
+
+    # build vert2vert sorted by edge color (vert2edge is built and sorted
+    # by edge color first)
     print("Build sorted vert2vert")
-    g.BuildVert2Vert()
+    g.Require("vert2vert")
     
     # Create first simulation
     print("Simulation")
-    s1 = NetSim(g.numb_vert, g.numb_edge, g.vert2edge, g.vert2vert, g.p_vert2vert, numb_iter=3)
-    s1.node_size = m.ReadFieldFromFileVtkAscii(path_to_file, 'subdomain_numb_nodes')[:,0]
-    s1.link_size = m.ReadFieldFromFileVtkAscii(path_to_file, 'subdomain2numb_interface_node')[:,0]
-	# [:, 0] transform a 2D numpy.array into a 1D numpy.array
-	
-	# Prepare the vizualisation
-
-	# Create the MeshViz object
-    viz = MeshViz()
-	# Import the file
-    viz.ReadMeshFromFile(path_to_file)
+    s1 = NetSim(g.numb_vert, g.numb_edge, g.vert2vert_edge, g.vert2vert, g.p_vert2vert, numb_iter=3, log_event=NetSim.LOG_EVENT)
+    s1.node_size = m.GetPointData('subdomain_numb_nodes')[:,0]
+    s1.link_size = m.GetCellData('subdomain2numb_interface_node')[:,0]
+    # [:, 0] transform a 2D numpy.array into a 1D numpy.array
+
+    # Prepare the vizualisation
+
+    # Create the MeshViz object (no display needed)
+    viz = MeshViz(offscreen=True)
+    # Import the mesh already read
+    viz.ReadMeshFromMesh(m)
     viz.SelectCellData('subdomain2numb_interface_node')
     viz.SelectPointData('subdomain_numb_nodes')
-	# Set the background color to white
+    # Set the background color to white
     viz.Config()
-	# Find the extrema for the size of nodes and links
+    # Find the extrema for the size of nodes and links
     point_data, cell_data = s1.node_size, s1.link_size
     min_point, max_point = 0, max(point_data)
     min_cell, max_cell = 0, max(cell_data)
@@ -99,13 +105,26 @@ def main(argv):
     # Set the ColorScale
     viz.BuildCellColorScale(min_cell, max_cell)
     viz.BuildPointColorScale(min_point, max_point)
-	# Select the radius of the sphere for nodes
+    # Select the radius of the sphere for nodes
     viz.BuildGlyph(0.7)
     
     output = '../../data/out/test'
     
+    # Checkpoint every 1000 steps, restart from the last one if any
+    s1.ckpt_file = output + 'ckpt.npz'
+    s1.ckpt_step = 1000
+    if os.path.isfile(s1.ckpt_file):
+        s1.ReadCheckpoint()
+        if s1.err_code == NetSim.FAILURE:
+            print(s1.err_msg)
+            return
+
     #import time
-    i = 0
+    i = s1.glob_step
+
+    # Write the frames to one video (from the restart step, if any), the
+    # unchanged frames are not encoded
+    viz.StartVideo(output + str(i) + '.avi', frame_rate=25, frame_stride=1)
     
     
     while not(s1.flag_end):
@@ -113,22 +132,43 @@ def main(argv):
         if i < first_com:
             for t in range(acc):
                 s1.Step()
-            point_data, cell_data = s1.node_step, s1.link_step
-            viz.Render(point_data, cell_data)
+            # Only the nodes and links changed since the last frame
+            node, link = s1.GetChange()
+            viz.RenderChange(node, s1.node_step[node], link, s1.link_step[link])
             i += acc
         else:
-            point_data, cell_data = s1.node_step, s1.link_step
-            viz.Render(point_data, cell_data)
+            node, link = s1.GetChange()
+            viz.RenderChange(node, s1.node_step[node], link, s1.link_step[link])
             s1.Step()
             i += 1
             
     
-        viz.WriteScreenshotToFile(output + str(i) + '.jpg')
+        viz.WriteVideoFrame()
+        if viz.err_code == MeshViz.FAILURE:
+            print(viz.err_msg)
+            viz.Close()
+            return
         
         
         
         
     viz.Close()
+    if viz.err_code == MeshViz.FAILURE:
+        print(viz.err_msg)
+    if viz.video is not None:
+        print('{:d} frames written to {:s} ({:d} repeated)'.format(
+              viz.video.numb_frame, ', '.join(viz.video.part_file),
+              viz.video.numb_repeat))
+
+    # The run is complete, drop its checkpoint
+    s1.WaitCheckpoint()
+    if os.path.isfile(s1.ckpt_file):
+        os.remove(s1.ckpt_file)
+
+    # Trace of the connections of the simulation
+    s1.WriteLog(output + 'trace.csv', 'CSV')
+    if s1.err_code == NetSim.FAILURE:
+        print(s1.err_msg)
 
 #    while not(s1.flag_end):
 #        s1.Step()